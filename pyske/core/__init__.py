@@ -4,6 +4,7 @@ core: data structures and associated skeletons
 Classes:
     * PList
     * SList
+    * AList
     * Timing
     * Distribution
     * SStream
@@ -14,10 +15,10 @@ Modules:
     * opt
 """
 
-from pyske.core.list import PList, SList, Distribution
+from pyske.core.list import PList, SList, AList, Distribution
 from pyske.core.util.timing import Timing
 from pyske.core.util import par
 from pyske.core.util import fun
 from pyske.core.stream import SStream, PStream
 
-__all__ = ['PList', 'SList', 'Timing', 'Distribution', 'par', 'fun', 'SStream', 'PStream']
+__all__ = ['PList', 'SList', 'AList', 'Timing', 'Distribution', 'par', 'fun', 'SStream', 'PStream']
@@ -4,10 +4,14 @@ pyske.core.list: sequential and parallel lists.
 Classes:
     * SList: sequential list.
     * PList: parallel list.
+    * AList: sequential list of numbers stored in an array.
+    * LazyList: list with deferred, fused, element-wise skeletons.
 """
 
 from .plist import PList
 from .slist import SList
+from .alist import AList
+from .lazy import LazyList
 from .distribution import Distribution
 
-__all__ = ['SList', 'PList', 'Distribution']
+__all__ = ['SList', 'PList', 'AList', 'LazyList', 'Distribution']
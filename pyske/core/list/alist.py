@@ -0,0 +1,416 @@
+"""
+A module of array-backed sequential lists and associated primitives
+
+class AList: sequential lists of numbers stored in a contiguous array.
+"""
+import functools
+import itertools
+from typing import TypeVar, Callable, Sequence, Tuple, Optional, Generic
+
+from pyske.core import interface
+from pyske.core.list.slist import SList
+from pyske.core.list.lazy import LazyList
+from pyske.core.support import operators
+from pyske.core.support.numeric import numeric_kind, EMPTY, INT, FLOAT
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+__all__ = ['AList']
+
+T = TypeVar('T')  # pylint: disable=invalid-name
+R = TypeVar('R')  # pylint: disable=invalid-name
+U = TypeVar('U')  # pylint: disable=invalid-name
+V = TypeVar('V')  # pylint: disable=invalid-name
+
+
+def _as_list(values):
+    if isinstance(values, AList):
+        return values.to_numpy().tolist()
+    return values
+
+
+def _vectorized(function, *args, **kwargs):
+    """
+    Apply a NumPy function, or return None when the element-wise Python calls
+    should be used instead: if the values are not supported, or if the array
+    computation would not give the Python result (a division by zero, a negative
+    integer exponent, ...), so that the Python calls raise the Python error.
+    """
+    with numpy.errstate(divide='raise', invalid='raise'):
+        try:
+            return function(*args, **kwargs)
+        except (TypeError, ValueError, ArithmeticError):
+            return None
+
+
+def _bounds(values: 'numpy.ndarray') -> Tuple[int, int]:
+    return int(values.min()), int(values.max())
+
+
+def _may_overflow(ufunc, *arrays) -> bool:
+    """
+    Tell whether an element-wise call of a universal function on integer arrays
+    may overflow, from the bounds of the arrays: unlike Python integers, the
+    integers of an array wrap around.
+    """
+    dtype = numpy.result_type(*arrays)
+    if dtype.kind not in 'iu' or any(array.size == 0 for array in arrays):
+        return False
+    info = numpy.iinfo(dtype)
+    bounds = [_bounds(array) for array in arrays]
+    if ufunc in (numpy.negative, numpy.absolute):
+        results = [-bound for bound in bounds[0]]
+    elif ufunc is numpy.add:
+        results = [bounds[0][0] + bounds[1][0], bounds[0][1] + bounds[1][1]]
+    elif ufunc is numpy.subtract:
+        results = [bounds[0][0] - bounds[1][1], bounds[0][1] - bounds[1][0]]
+    elif ufunc is numpy.multiply:
+        results = [left * right for left in bounds[0] for right in bounds[1]]
+    elif ufunc is numpy.power:
+        magnitude = max(abs(bound) for bound in bounds[0])
+        exponent = max(bounds[1][1], 0)
+        if magnitude.bit_length() * exponent > info.bits:
+            return True
+        results = [-magnitude ** exponent, magnitude ** exponent]
+    elif ufunc is numpy.floor_divide:
+        # Only the division of the smallest integer by -1 overflows
+        results = [-bound for bound in bounds[0]] if bounds[1][0] <= -1 <= bounds[1][1] else []
+    else:
+        return False
+    return not all(info.min <= result <= info.max for result in results)
+
+
+def _accumulate_may_overflow(ufunc, values: 'numpy.ndarray', initial=None) -> bool:
+    """
+    Tell whether a reduction or an accumulation of an integer array by a universal
+    function may overflow, from the bounds of the array.
+    """
+    if values.dtype.kind not in 'iu' or values.size == 0:
+        return False
+    info = numpy.iinfo(values.dtype)
+    (low, high) = _bounds(values)
+    initial = 0 if initial is None else int(initial)
+    size = values.size
+    magnitude = max(abs(low), abs(high))
+    if ufunc in (numpy.add, numpy.subtract):
+        # The bounds of all the partial sums
+        bound = size * magnitude + abs(initial)
+        results = [-bound, bound]
+    elif ufunc is numpy.multiply:
+        if magnitude.bit_length() * size > info.bits:
+            return True
+        bound = magnitude ** size * max(abs(initial), 1)
+        results = [-bound, bound]
+    elif ufunc is numpy.power:
+        return True
+    elif ufunc is numpy.floor_divide:
+        return info.min in (low, initial) and low <= -1 <= high
+    else:
+        return False
+    return not all(info.min <= result <= info.max for result in results)
+
+
+def _from_results(values) -> 'interface.List':
+    """
+    Build an AList if the values are numbers, an SList otherwise.
+    """
+    if numeric_kind(values) in (INT, FLOAT):
+        return AList(values)
+    return SList(values)
+
+
+def _from_array(values: 'numpy.ndarray') -> 'interface.List':
+    """
+    Build an AList from the result of a vectorized call, or an SList if the
+    result is not made of numbers (for instance of booleans).
+    """
+    if numeric_kind(values) in (EMPTY, INT, FLOAT):
+        return AList(values)
+    return SList(values.tolist())
+
+
+class AList(interface.List, Generic[T]):
+    # pylint: disable=too-many-public-methods
+    """
+    Sequential list of numbers, stored in a NumPy array.
+
+    When a skeleton is called with a NumPy universal function, or with a
+    Python operator registered in ``pyske.core.support.operators``
+    (such as ``operator.add``, ``operator.mul`` or ``max``), a single
+    vectorized call replaces the per-element Python calls. Other functions
+    are applied element by element. When the results are not numbers,
+    an ``SList`` is returned.
+
+    Integer values are stored as 64-bit integers. When a vectorized call on
+    integers may overflow, the Python calls are used instead: the results are
+    the ones of Python integers, in an ``SList`` if they do not fit in 64 bits.
+
+    An AList only holds numbers, either integers fitting in 64 bits or floats:
+    it cannot hold lists, and only an empty AList may be flattened. Building an
+    AList from other values raises a ``TypeError``.
+
+    Static methods from interface IList:
+        init, from_seq.
+
+    Methods from interface IList:
+        length, to_seq,
+        map, mapi, map2, map2i, zip, filter,
+        reduce, map_reduce, scanl, scanl_last, scanr,
+        get_partition, flatten,
+        distribute, balance,
+        gather, scatter, scatter_range,
+        invariant.
+
+    Methods:
+        to_numpy, copy, scanp, lazy.
+    """
+
+    def __init__(self: 'AList[T]', values: Sequence[T] = (), dtype=None):
+        # pylint: disable=super-init-not-called
+        if numpy is None:
+            raise ImportError("AList requires numpy")
+        if isinstance(values, AList):
+            values = values.to_numpy()
+        if numeric_kind(values) not in (EMPTY, INT, FLOAT):
+            raise TypeError("an AList only holds integers fitting in 64 bits or floats")
+        self.__values = numpy.array(values, dtype=dtype)
+        if self.__values.ndim != 1:
+            raise TypeError("an AList holds numbers, not lists")
+
+    def to_numpy(self: 'AList[T]') -> 'numpy.ndarray':
+        """
+        Return the underlying array (not a copy).
+
+        :return: a one-dimensional NumPy array.
+        """
+        return self.__values
+
+    def __array__(self, dtype=None, copy=None):
+        # pylint: disable=unused-argument
+        if dtype is None:
+            return self.__values
+        return self.__values.astype(dtype)
+
+    def __len__(self: 'AList[T]') -> int:
+        return self.__values.size
+
+    def __iter__(self):
+        return iter(self.__values.tolist())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return AList(self.__values[index])
+        return self.__values[index].item()
+
+    def __setitem__(self, index, value):
+        self.__values[index] = value
+
+    def __eq__(self, other) -> bool:
+        try:
+            return len(self) == len(other) and self.__values.tolist() == list(other)
+        except TypeError:
+            return False
+
+    def __ne__(self, other) -> bool:
+        return not self == other
+
+    __hash__ = None
+
+    def __str__(self) -> str:
+        return str(self.__values.tolist())
+
+    def __repr__(self) -> str:
+        return 'AList(' + str(self) + ')'
+
+    def copy(self: 'AList[T]') -> 'AList[T]':
+        """
+        Return a copy of the list.
+
+        :return: a new list
+        """
+        return AList(self.__values.copy())
+
+    @staticmethod
+    def init(value_at: Callable[[int], T], size: int) -> 'AList[T]':
+        assert size >= 0
+        return AList([value_at(i) for i in range(0, size)])
+
+    @staticmethod
+    def from_seq(sequence: Sequence[T]) -> 'AList[T]':
+        return AList(sequence)
+
+    def to_seq(self: 'AList[T]') -> 'AList[T]':
+        return self
+
+    def length(self: 'AList[T]') -> int:
+        return len(self)
+
+    def invariant(self: 'AList[T]') -> bool:
+        return self.__values.ndim == 1
+
+    def map(self: 'AList[T]', unary_op: Callable[[T], R]) -> 'interface.List[R]':
+        ufunc = operators.unary_ufunc(unary_op)
+        if ufunc is not None and not _may_overflow(ufunc, self.__values):
+            res = _vectorized(ufunc, self.__values)
+            if res is not None:
+                return _from_array(res)
+        return _from_results([unary_op(value) for value in self])
+
+    def mapi(self: 'AList[T]', binary_op: Callable[[int, T], R]) -> 'interface.List[R]':
+        return _from_results([binary_op(i, value) for (i, value) in enumerate(self)])
+
+    def map2(self: 'AList[T]', binary_op: Callable[[T, U], R],
+             a_list: 'interface.List[U]') -> 'interface.List[R]':
+        assert len(self) == len(a_list)
+        ufunc = operators.binary_ufunc(binary_op)
+        if ufunc is not None:
+            others = numpy.asarray(_as_list(a_list))
+            res = None if _may_overflow(ufunc, self.__values, others) else \
+                _vectorized(ufunc, self.__values, others)
+            if res is not None:
+                return _from_array(res)
+        return _from_results([binary_op(left, right)
+                              for (left, right) in zip(self, _as_list(a_list))])
+
+    def map2i(self: 'AList[T]', ternary_op: Callable[[int, T, U], R],
+              a_list: 'interface.List[U]') -> 'interface.List[R]':
+        assert len(self) == len(a_list)
+        return _from_results([ternary_op(i, left, right)
+                              for (i, (left, right))
+                              in enumerate(zip(self, _as_list(a_list)))])
+
+    def map3(self: 'AList[T]', ternary_op: Callable[[T, U, V], R],
+             a_list: 'interface.List[U]', b_list: 'interface.List[V]') -> 'interface.List[R]':
+        assert len(self) == len(a_list)
+        assert len(self) == len(b_list)
+        return _from_results([ternary_op(val1, val2, val3)
+                              for (val1, val2, val3)
+                              in zip(self, _as_list(a_list), _as_list(b_list))])
+
+    def zip(self: 'AList[T]', a_list: 'interface.List[U]') -> 'SList[Tuple[T, U]]':
+        assert len(self) == len(a_list)
+        return SList(zip(self, _as_list(a_list)))
+
+    def filter(self: 'AList[T]', predicate: Callable[[T], bool]) -> 'AList[T]':
+        mask = numpy.fromiter((bool(predicate(value)) for value in self),
+                              dtype=bool, count=len(self))
+        return AList(self.__values[mask])
+
+    def reduce(self: 'AList[T]', binary_op: Callable[[T, T], T],
+               neutral: Optional[T] = None) -> T:
+        if not self.__values.size and neutral is not None:
+            return neutral
+        ufunc = operators.binary_ufunc(binary_op)
+        if ufunc is not None and self.__values.size:
+            if neutral is None:
+                values = self.__values
+            else:
+                # The neutral value may need a wider type than the values
+                dtype = _vectorized(numpy.result_type, self.__values, neutral)
+                values = None if dtype is None else self.__values.astype(dtype, copy=False)
+            res = None
+            if values is not None and not _accumulate_may_overflow(ufunc, values, neutral):
+                res = _vectorized(ufunc.reduce, values) if neutral is None else \
+                    _vectorized(ufunc.reduce, values, initial=neutral)
+            if res is not None:
+                return res.item()
+        if neutral is None:
+            return functools.reduce(binary_op, self)
+        return functools.reduce(binary_op, self, neutral)
+
+    def map_reduce(self: 'AList[T]', unary_op: Callable[[T], R],
+                   binary_op: Callable[[R, R], R], neutral: Optional[R] = None) -> R:
+        if not self:
+            return neutral
+        return self.map(unary_op).reduce(binary_op, neutral)
+
+    def __accumulate(self, binary_op, neutral):
+        """
+        Return the vectorized full prefix sum (``len(self) + 1`` values), or None.
+        """
+        ufunc = operators.binary_ufunc(binary_op)
+        if ufunc is None:
+            return None
+        values = _vectorized(numpy.concatenate, ([neutral], self.__values))
+        if values is None or _accumulate_may_overflow(ufunc, values):
+            return None
+        return _vectorized(ufunc.accumulate, values)
+
+    def scanl(self: 'AList[T]', binary_op: Callable[[R, T], R], neutral: R) -> 'AList[R]':
+        res, _ = self.scanl_last(binary_op, neutral)
+        return res
+
+    def scanl_last(self: 'AList[T]', binary_op: Callable[[R, T], R], neutral: R) \
+            -> 'Tuple[AList[R], R]':
+        acc = self.__accumulate(binary_op, neutral)
+        if acc is not None:
+            return _from_array(acc[:-1]), acc[-1].item()
+        res = []
+        for value in self:
+            res.append(neutral)
+            neutral = binary_op(neutral, value)
+        return _from_results(res), neutral
+
+    def scanr(self: 'AList[T]', binary_op: Callable[[R, T], R]) -> 'AList[R]':
+        assert len(self) > 0
+        ufunc = operators.binary_ufunc(binary_op)
+        if ufunc is not None and not _accumulate_may_overflow(ufunc, self.__values):
+            res = _vectorized(ufunc.accumulate, self.__values)
+            if res is not None:
+                return _from_array(res)
+        return _from_results(list(itertools.accumulate(self, binary_op)))
+
+    def scanp(self: 'AList[T]', binary_op, neutral) -> 'AList':
+        """
+        Makes a rightward accumulation of the values from a neutral one.
+
+        See ``SList.scanp``.
+        """
+        return AList(SList(self).scanp(binary_op, neutral))
+
+    def get_partition(self: 'AList[T]') -> 'SList[AList[T]]':
+        return SList([self])
+
+    def flatten(self: 'AList[T]', new_distr: interface.Distribution = None) -> 'AList':
+        if self.__values.size:
+            raise TypeError("an AList holds numbers, not lists: it cannot be flattened")
+        return AList(self.__values)
+
+    def distribute(self: 'AList[T]', _: interface.Distribution) -> 'AList[T]':
+        return self
+
+    def balance(self: 'AList[T]') -> 'AList[T]':
+        return self
+
+    def gather(self: 'AList[T]', pid: int) -> 'AList[T]':
+        assert pid == 0
+        return self
+
+    def scatter(self: 'AList[T]', pid: int) -> 'AList[T]':
+        assert pid == 0
+        return self
+
+    def scatter_range(self: 'AList[T]', rng: range) -> 'AList[T]':
+        return AList(self.__values[rng.start:rng.stop:rng.step])
+
+    def permute(self: 'AList[T]', bij: Callable[[int], int]) -> 'AList[T]':
+        indices = numpy.fromiter((bij(idx) for idx in range(0, len(self))),
+                                 dtype=numpy.int64, count=len(self))
+        res = numpy.empty_like(self.__values)
+        res[indices] = self.__values
+        return AList(res)
+
+    def lazy(self: 'AList[T]') -> 'LazyList[T]':
+        """
+        Return a lazy version of the list.
+
+        Calls to element-wise skeletons (``map``, ``mapi``, ``map2``, ``map2i``,
+        ``map3``, ``zip``, ``filter``) on the returned list are recorded and
+        executed together, in a single pass, when another skeleton is called.
+
+        :return: a lazy list
+        """
+        return LazyList(self)
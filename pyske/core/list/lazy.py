@@ -0,0 +1,305 @@
+"""
+A module of lazy lists: fusion of element-wise skeletons
+
+class LazyList: deferred skeleton calls on a PySke list.
+"""
+import itertools
+from operator import add
+from typing import Callable, Generic, Optional, Tuple, TypeVar
+
+from pyske.core.list.slist import SList
+from pyske.core.support.numeric import numeric_kind, INT, FLOAT
+
+__all__ = ['LazyList']
+
+T = TypeVar('T')  # pylint: disable=invalid-name
+U = TypeVar('U')  # pylint: disable=invalid-name
+V = TypeVar('V')  # pylint: disable=invalid-name
+R = TypeVar('R')  # pylint: disable=invalid-name
+
+_SKIP = object()
+
+# The kinds of the stages of a lazy list
+_MAP, _MAPI, _FILTER = range(3)
+
+
+def _evaluate(head: Optional[Callable], stages: tuple, index: int, values: tuple):
+    """
+    Compute a value of a lazy list from the values of its sources at an index.
+
+    :param head: function from the index and the values of the sources to the
+        value before the stages, or None if the value is the one of the single source
+    :param stages: the ``(kind, function)`` stages applied in turn to the value
+    :return: the value, or ``_SKIP`` if a filter rejected it
+    """
+    value = values[0] if head is None else head(index, values)
+    for (kind, function) in stages:
+        if kind == _MAP:
+            value = function(value)
+        elif kind == _MAPI:
+            value = function(index, value)
+        elif not function(value):
+            return _SKIP
+    return value
+
+
+def _like(source, values: SList):
+    """
+    Build a local list of the kind of a local source: the values computed
+    from an array (an ``AList``) are stored in an array if they are numbers.
+    """
+    if hasattr(source, 'to_numpy') and numeric_kind(values) in (INT, FLOAT):
+        return type(source)(values)
+    return values
+
+
+class LazyList(Generic[T]):
+    """
+    Lazy list
+
+    A lazy list wraps a list (``SList``, ``AList`` or ``PList``) and records
+    the element-wise skeletons applied to it instead of executing them.
+    All the recorded skeletons are executed in a single pass over the local
+    content of the initial list(s), without building intermediate lists,
+    when the list is materialised.
+
+    Lazy methods:
+        map, mapi, map2, map2i, map3, zip, filter.
+
+    Methods:
+        force, lazy.
+
+    Any other method (``reduce``, ``scanl``, ``distribute``, ``to_seq``, ...)
+    materialises the list, then calls the method of the materialised list.
+    Lazy lists are compared by their materialised lists.
+
+    Example::
+
+        >>> from operator import add
+        >>> from pyske.core.list.plist import PList
+        >>> lst = PList.init(lambda x: x, 10).lazy()
+        >>> lst.map(lambda x: x + 1).filter(lambda x: x % 2 == 0).reduce(add, 0)
+        30
+    """
+
+    def __init__(self: 'LazyList[T]', source, head: Optional[Callable] = None,
+                 stages: tuple = (), sources: Optional[list] = None):
+        """
+        Wrap a list.
+
+        :param source: a list on which the recorded skeletons are applied
+        :param head: (internal) function from a global index and the values of
+            the sources at this index to a value, or None for a single source
+        :param stages: (internal) the recorded ``(kind, function)`` stages,
+            applied in turn to the value computed by ``head``
+        :param sources: (internal) all the lists ``head`` reads
+        """
+        self.__sources: list = [source] if sources is None else sources
+        self.__head: Optional[Callable] = head
+        self.__stages: tuple = stages
+        self.__filtered: bool = any(kind == _FILTER for (kind, _) in stages)
+        self.__forced = None
+
+    @staticmethod
+    def __wrap(a_list) -> 'LazyList':
+        if isinstance(a_list, LazyList):
+            return a_list
+        return LazyList(a_list)
+
+    def __is_source(self) -> bool:
+        return self.__head is None and not self.__stages
+
+    def __unfiltered(self) -> 'LazyList[T]':
+        if self.__filtered:
+            return LazyList(self.force())
+        return self
+
+    def lazy(self: 'LazyList[T]') -> 'LazyList[T]':
+        """
+        Return the list itself.
+
+        :return: self
+        """
+        return self
+
+    def force(self):
+        """
+        Execute the recorded skeletons.
+
+        The result is computed once: later calls return the same list.
+
+        :return: a list of the same kind as the wrapped list.
+        """
+        if self.__forced is None:
+            if self.__is_source():
+                self.__forced = self.__sources[0]
+            else:
+                self.__forced = self.__execute()
+        return self.__forced
+
+    def __execute(self):
+        head, stages = self.__head, self.__stages
+        first = self.__sources[0]
+        distribution = getattr(first, 'distribution', None)
+        starts = [0] if distribution is None else SList(distribution).scanl(add, 0)
+
+        def run(pid: int, locals_: list) -> SList:
+            res = SList()
+            for (index, values) in enumerate(zip(*locals_), starts[pid]):
+                value = _evaluate(head, stages, index, values)
+                if value is not _SKIP:
+                    res.append(value)
+            return _like(locals_[0], res)
+
+        partitions = first.get_partition().map(lambda local: [local])
+        for source in self.__sources[1:]:
+            partitions = partitions.map2(lambda locals_, local: locals_ + [local],
+                                         source.get_partition())
+        results = partitions.mapi(run)
+        if distribution is None:
+            # A sequential list is its single part
+            (res,) = results
+            return res
+        if self.__filtered:
+            return results.flatten()
+        return results.flatten(distribution)
+
+    def __with(self, kind: int, function: Callable) -> 'LazyList':
+        return LazyList(None, self.__head, self.__stages + ((kind, function),),
+                        self.__sources)
+
+    def map(self: 'LazyList[T]', unary_op: Callable[[T], V]) -> 'LazyList[V]':
+        """
+        Record the application of a function to all the elements.
+
+        :param unary_op: function to apply to elements
+        :return: a new lazy list
+        """
+        return self.__with(_MAP, unary_op)
+
+    def mapi(self: 'LazyList[T]', binary_op: Callable[[int, T], V]) -> 'LazyList[V]':
+        """
+        Record the application of a function to all the elements and their indices.
+
+        If filters are pending, the list is materialised first.
+
+        :param binary_op: function to apply to each index and element
+        :return: a new lazy list
+        """
+        return self.__unfiltered().__with(_MAPI, binary_op)
+
+    def filter(self: 'LazyList[T]', predicate: Callable[[T], bool]) -> 'LazyList[T]':
+        """
+        Record the selection of the elements satisfying a predicate.
+
+        :param predicate: a function returning a boolean
+        :return: a new lazy list
+        """
+        return self.__with(_FILTER, predicate)
+
+    def __combine(self, others: list, combine: Callable) -> 'LazyList':
+        """
+        Fuse several unfiltered lists of the same shape.
+
+        :param others: the lists, or lazy lists, to fuse with ``self``
+        :param combine: function from the index and the values of the lists
+        :return: a lazy list reading all the sources
+        """
+        lists = [self.__unfiltered()] + [LazyList.__wrap(lst).__unfiltered()
+                                         for lst in others]
+        first = lists[0].__sources[0]
+        for lst in lists[1:]:
+            assert len(lst.__sources[0]) == len(first)
+            assert getattr(lst.__sources[0], 'distribution', None) == \
+                getattr(first, 'distribution', None)
+        sources = list(itertools.chain.from_iterable(lst.__sources for lst in lists))
+        parts = []
+        offset = 0
+        for lst in lists:
+            parts.append((offset, offset + len(lst.__sources), lst.__head, lst.__stages))
+            offset = offset + len(lst.__sources)
+
+        def head(index, values):
+            return combine(index, *(_evaluate(part_head, part_stages, index, values[low:high])
+                                    for (low, high, part_head, part_stages) in parts))
+
+        return LazyList(None, head, (), sources)
+
+    def map2(self: 'LazyList[T]', binary_op: Callable[[T, U], V],
+             a_list) -> 'LazyList[V]':
+        """
+        Record the application of a function to all the elements of ``self``
+        and ``a_list``.
+
+        :param binary_op: function to apply to each pair of elements
+        :param a_list: a list, or a lazy list, of the same shape
+        :return: a new lazy list
+        """
+        return self.__combine([a_list], lambda index, left, right: binary_op(left, right))
+
+    def map2i(self: 'LazyList[T]', ternary_op: Callable[[int, T, U], V],
+              a_list) -> 'LazyList[V]':
+        """
+        Record the application of a function to all the indices and elements
+        of ``self`` and ``a_list``.
+
+        :param ternary_op: function to apply to each index and pair of elements
+        :param a_list: a list, or a lazy list, of the same shape
+        :return: a new lazy list
+        """
+        return self.__combine([a_list], ternary_op)
+
+    def map3(self: 'LazyList[T]', ternary_op: Callable[[T, U, V], R],
+             a_list, b_list) -> 'LazyList[R]':
+        """
+        Record the application of a function to all the elements of ``self``,
+        ``a_list`` and ``b_list``.
+
+        :param ternary_op: function to apply to each triple of elements
+        :param a_list: a list, or a lazy list, of the same shape
+        :param b_list: a list, or a lazy list, of the same shape
+        :return: a new lazy list
+        """
+        return self.__combine([a_list, b_list],
+                              lambda index, first, second, third:
+                              ternary_op(first, second, third))
+
+    def zip(self: 'LazyList[T]', a_list) -> 'LazyList[Tuple[T, U]]':
+        """
+        Record the pairing of the elements of ``self`` and ``a_list``.
+
+        :param a_list: a list, or a lazy list, of the same shape
+        :return: a new lazy list
+        """
+        return self.map2(lambda left, right: (left, right), a_list)
+
+    def __len__(self) -> int:
+        return self.length()
+
+    def length(self: 'LazyList[T]') -> int:
+        """
+        Return the length of the list (materialised if filters are pending).
+
+        :return: the global length of the list.
+        """
+        if self.__filtered:
+            return self.force().length()
+        return self.__sources[0].length()
+
+    def __str__(self) -> str:
+        return str(self.force())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyList):
+            other = other.force()
+        return self.force() == other
+
+    def __ne__(self, other) -> bool:
+        return not self == other
+
+    __hash__ = None
+
+    def __getattr__(self, item):
+        if item.startswith('_'):
+            raise AttributeError(item)
+        return getattr(self.force(), item)
@@ -3,38 +3,45 @@ A module of parallel lists and associated skeletons
 
 class PList: parallel lists.
 """
-import functools
-from collections import defaultdict
-from operator import add, concat
-from typing import Optional, Tuple, Sequence, Generic  # pylint: disable=unused-import
+import csv
+import itertools
+import os
+import struct
+from bisect import bisect_right
+from operator import add
+from typing import Optional, Tuple, Sequence, Generic, List  # pylint: disable=unused-import
 from typing import TypeVar, Callable  # pylint: disable=unused-import
 
 from pyske.core.list.slist import SList
+from pyske.core.list.lazy import LazyList
+from pyske.core.list.alist import AList
 from pyske.core.list.distribution import Distribution
 from pyske.core import interface
-from pyske.core.support import parallel as parimpl, interval
+from pyske.core.support import parallel as parimpl, interval, files
 from pyske.core.support.list import scan
+from pyske.core.support.numeric import numeric_kind, EMPTY, INT, FLOAT
 from pyske.core.util import par
 
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
 __all__ = ['PList']
 
 _PID: int = parimpl.PID
 _NPROCS: int = parimpl.NPROCS
 _COMM = parimpl.COMM
 
+CHUNK_SIZE: int = 1 << 16
+_TAG_CHUNK: int = 18
+
 T = TypeVar('T')  # pylint: disable=invalid-name
 U = TypeVar('U')  # pylint: disable=invalid-name
 V = TypeVar('V')  # pylint: disable=invalid-name
 R = TypeVar('R')  # pylint: disable=invalid-name
 
 
-def _group_by(a_list):
-    dic = defaultdict(list)
-    for key, val in a_list:
-        dic[key].append(val)
-    return dic
-
-
 class PList(interface.List, Generic[T]):
     # pylint: disable=too-many-public-methods
     # pylint: disable=protected-access
@@ -52,6 +59,10 @@ class PList(interface.List, Generic[T]):
         distribute, balance,
         gather, scatter, scatter_range,
         invariant.
+
+    Methods:
+        to_array, lazy, from_iterable, to_sink, collect,
+        from_file, from_csv, from_binary, to_file, to_binary.
     """
     __distribution: Distribution
 
@@ -86,7 +97,7 @@ class PList(interface.List, Generic[T]):
         return self.__distribution
 
     def invariant(self: 'PList[T]') -> None:
-        assert isinstance(self.__content, SList)
+        assert isinstance(self.__content, (SList, AList))
         assert isinstance(self.__distribution, Distribution)
         prefix = scan(self.__distribution, add, 0)
         assert len(self.__content) == self.__local_size
@@ -112,7 +123,6 @@ class PList(interface.List, Generic[T]):
         p_list.__content = SList([value_at(i) for i in
                                   range(p_list.__start_index,
                                         p_list.__start_index + p_list.__local_size)])
-        p_list.__distribution = [parimpl.local_size(i, size) for i in range(0, _NPROCS)]
         return p_list
 
     def map(self: 'PList[T]', unary_op: Callable[[T], V]) -> 'PList[V]':
@@ -153,7 +163,42 @@ class PList(interface.List, Generic[T]):
         return res
 
     def filter(self: 'PList[T]', predicate: Callable[[T], bool]) -> 'PList[T]':
-        return self.get_partition().map(lambda l: l.filter(predicate)).flatten()
+        p_list = PList()
+        p_list.__content = self.__content.filter(predicate)
+        p_list.__local_size = len(p_list.__content)
+        p_list.__distribution = Distribution(_COMM.allgather(p_list.__local_size))
+        p_list.__start_index = SList(p_list.__distribution).scanl(add, 0)[_PID]
+        p_list.__global_size = SList(p_list.__distribution).reduce(add)
+        return p_list
+
+    def to_array(self: 'PList[T]') -> 'PList[T]':
+        """
+        Return a list with the same content, stored locally in arrays.
+
+        The local content of each processor becomes an ``AList``: skeletons
+        called with NumPy universal functions or with registered operators
+        (such as ``operator.add``) are then vectorized.
+        The elements of the list should be integers fitting in 64 bits or floats,
+        otherwise all the processors raise a ``TypeError``.
+
+        Example::
+
+            >>> from operator import add, mul
+            >>> from pyske.core.list.plist import PList
+            >>> vector = PList.init(float, 4).to_array()
+            >>> vector.map2(mul, vector).reduce(add, 0.0)
+            14.0
+
+        :return: a new list
+        """
+        content = list(self.__content)
+        numeric = numeric_kind(content) in (EMPTY, INT, FLOAT)
+        # All the processors fail if one of them has values that are not numbers
+        if not all(_COMM.allgather(numeric)):
+            raise TypeError("to_array cannot be applied to a list of values that are not numbers")
+        p_list = self.__get_shape()
+        p_list.__content = AList(content)
+        return p_list
 
     def get_partition(self: 'PList[T]') -> 'PList[SList[T]]':
         p_list = PList()
@@ -166,7 +211,12 @@ class PList(interface.List, Generic[T]):
 
     def flatten(self: 'PList[SList[T]]', new_distr: Distribution = None) -> 'PList[T]':
         p_list = PList()
-        p_list.__content = self.__content.flatten()
+        parts = self.__content
+        if parts and all(isinstance(part, AList) for part in parts):
+            # Local arrays are flattened into an array
+            p_list.__content = AList(numpy.concatenate([part.to_numpy() for part in parts]))
+        else:
+            p_list.__content = parts.flatten()
         p_list.__local_size = len(p_list.__content)
         if new_distr is None:
             p_list.__distribution = _COMM.allgather(p_list.__local_size)
@@ -180,13 +230,25 @@ class PList(interface.List, Generic[T]):
     def reduce(self: 'PList[T]', binary_op: Callable[[T, T], T], neutral: Optional[T] = None) -> T:
         if neutral is None:
             assert self.__global_size >= 1
-            partial = None if self.__local_size == 0 else SList(self.__content).reduce(binary_op)
-            partials = SList(_COMM.allgather(partial)).filter(lambda x: x is not None)
-        else:
-            # assert: (binary_op, neutral) form a monoid
-            partial = SList(self.__content).reduce(binary_op, neutral)
-            partials = SList(_COMM.allgather(partial))
-        return partials.reduce(binary_op, neutral)
+            partial = None if self.__local_size == 0 else self.__content.reduce(binary_op)
+            return self.__reduce_partials(binary_op, partial)
+        # assert: (binary_op, neutral) form a monoid
+        partial = self.__content.reduce(binary_op, neutral)
+        return parimpl.reduce(binary_op, partial)
+
+    def __reduce_partials(self: 'PList[T]', binary_op: Callable[[T, T], T],
+                          partial: Optional[T]) -> T:
+        if 0 not in self.__distribution:
+            return parimpl.reduce(binary_op, partial)
+
+        def skip_none(left, right):
+            if left is None:
+                return right
+            if right is None:
+                return left
+            return binary_op(left, right)
+
+        return parimpl.reduce(skip_none, partial)
 
     def map_reduce(self: 'PList[T]', unary_op: Callable[[T], V],
                    binary_op: Callable[[V, V], V], neutral: Optional[V] = None) -> V:
@@ -194,12 +256,10 @@ class PList(interface.List, Generic[T]):
             assert self.__global_size >= 1
             partial = None if self.__local_size == 0 \
                 else self.__content.map_reduce(unary_op, binary_op)
-            partials = SList(_COMM.allgather(partial)).filter(lambda x: x is not None)
-            return functools.reduce(binary_op, partials)
+            return self.__reduce_partials(binary_op, partial)
         # assert: (binary_op, neutral) form a monoid
         partial = self.__content.map_reduce(unary_op, binary_op, neutral)
-        partials = _COMM.allgather(partial)
-        return functools.reduce(binary_op, partials, neutral)
+        return parimpl.reduce(binary_op, partial)
 
     def scanr(self: 'PList[T]', binary_op: Callable[[T, T], T]) -> 'PList[T]':
         assert self.__global_size > 0
@@ -237,9 +297,8 @@ class PList(interface.List, Generic[T]):
         bounds_to_send = target_bounds.map(lambda i: interval.intersection(i, local_interval))
         msgs = [interval.to_slice(self.__content, interval.shift(inter, -self.__start_index))
                 for inter in bounds_to_send]
-        slices = _COMM.alltoall(msgs)
         p_list = PList()
-        p_list.__content = SList(slices).flatten()
+        p_list.__content = self.__content.from_seq(parimpl.alltoallv(msgs))
         p_list.__local_size = target_distr[_PID]
         p_list.__global_size = self.__global_size
         p_list.__start_index = SList(target_distr).scanl(add, 0)[_PID]
@@ -297,17 +356,349 @@ class PList(interface.List, Generic[T]):
         p_list.__start_index = SList(p_list.__distribution).scanl(add, 0)[_PID]
         return p_list
 
+    @staticmethod
+    def from_iterable(iterable, size: Optional[int] = None, root: int = 0,
+                      chunk_size: int = CHUNK_SIZE) -> 'PList[T]':
+        """
+        Return a balanced list built from the values of an iterable at a root processor.
+
+        Unlike ``from_seq`` followed by ``balance``, the values are never all
+        stored at the root: it reads them in chunks of at most ``chunk_size``
+        values and sends each chunk to the processor that owns it in the balanced
+        distribution. Each send waits for the matching receive, so the root
+        holds at most one chunk at a time.
+
+        If the number of values is unknown (no ``size`` and no ``len``, as for
+        a generator or a file), the chunks are dealt to the processors in turn
+        until the iterable is exhausted, then put in order and balanced.
+
+        Example::
+
+            >>> from pyske.core.list.plist import PList
+            >>> PList.from_iterable(range(4)).to_seq()
+            [0, 1, 2, 3]
+
+        :param iterable: the values (at the root only), for instance an
+            iterator or an open text file
+        :param size: the number of values of the iterable (at the root only),
+            if it has no length. Otherwise the iterable is read to its end.
+        :param root: the processor reading the iterable
+        :param chunk_size: the maximum number of values in a message
+        :return: a list with the values of the iterable
+        """
+        assert root in par.procs()
+        assert chunk_size > 0
+        if _PID == root and size is None:
+            try:
+                size = len(iterable)
+            except TypeError:
+                # The size stays unknown, on all the processors
+                pass
+        size = _COMM.bcast(size, root)
+        if size is None:
+            return PList.__from_unsized(iterable, root, chunk_size)
+        p_list = PList()
+        p_list.__global_size = size
+        p_list.__distribution = Distribution.balanced(size)
+        p_list.__local_size = p_list.__distribution[_PID]
+        p_list.__start_index = SList(p_list.__distribution).scanl(add, 0)[_PID]
+        complete = True
+        if _PID == root:
+            values = iter(iterable)
+            for (pid, count) in enumerate(p_list.__distribution):
+                for start in range(0, count, chunk_size):
+                    chunk = list(itertools.islice(values, min(chunk_size, count - start)))
+                    if len(chunk) < min(chunk_size, count - start):
+                        complete = False
+                        # The processors waiting for values get None instead of a chunk
+                        for dest in range(pid, _NPROCS):
+                            if dest != root and p_list.__distribution[dest] > 0:
+                                _COMM.ssend(None, dest=dest, tag=_TAG_CHUNK)
+                        break
+                    if pid == root:
+                        p_list.__content.extend(chunk)
+                    else:
+                        _COMM.ssend(chunk, dest=pid, tag=_TAG_CHUNK)
+                if not complete:
+                    break
+        else:
+            for _ in range(0, p_list.__local_size, chunk_size):
+                chunk = _COMM.recv(source=root, tag=_TAG_CHUNK)
+                if chunk is None:
+                    break
+                p_list.__content.extend(chunk)
+        # All the processors fail if the iterable is too short
+        assert _COMM.bcast(complete, root), "the iterable has less values than its size"
+        return p_list
+
+    @staticmethod
+    def __from_unsized(iterable, root: int, chunk_size: int) -> 'PList[T]':
+        """
+        Return a balanced list built from an iterable of unknown length at a root processor.
+
+        The chunk number ``c`` is sent to the processor ``c % nprocs``: only
+        the last chunk may be short, so the position of each value in the
+        iterable follows from its local index.
+        """
+        content = SList()
+        if _PID == root:
+            values = iter(iterable)
+            for chunk_index in itertools.count():
+                chunk = list(itertools.islice(values, chunk_size))
+                if not chunk:
+                    break
+                pid = chunk_index % _NPROCS
+                if pid == root:
+                    content.extend(chunk)
+                else:
+                    _COMM.ssend(chunk, dest=pid, tag=_TAG_CHUNK)
+                if len(chunk) < chunk_size:
+                    break
+            # The other processors get None after their last chunk
+            for dest in par.procs():
+                if dest != root:
+                    _COMM.ssend(None, dest=dest, tag=_TAG_CHUNK)
+        else:
+            chunk = _COMM.recv(source=root, tag=_TAG_CHUNK)
+            while chunk is not None:
+                content.extend(chunk)
+                chunk = _COMM.recv(source=root, tag=_TAG_CHUNK)
+        p_list = PList.__from_content(content)
+        start = p_list.__start_index
+
+        def position(index: int) -> int:
+            offset = index - start
+            chunk_index = (offset // chunk_size) * _NPROCS + _PID
+            return chunk_index * chunk_size + offset % chunk_size
+
+        return p_list.permute(position).balance()
+
+    def to_sink(self: 'PList[T]', sink: Callable[[List[T]], None], root: int = 0,
+                chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        Pass the values of the list, in order and in chunks, to a function at a root processor.
+
+        Each processor sends its values in chunks of at most ``chunk_size``
+        values, and each send waits for the root to receive it: the root holds
+        at most one chunk of another processor at a time.
+
+        Example::
+
+            >>> from pyske.core.list.plist import PList
+            >>> PList.init(str, 4).to_sink(print, chunk_size=3)
+            ['0', '1', '2']
+            ['3']
+
+        :param sink: a function applied to each chunk (a list of values), at the root only
+        :param root: the processor receiving the values
+        :param chunk_size: the maximum number of values in a message
+        """
+        assert root in par.procs()
+        assert chunk_size > 0
+        if _PID == root:
+            for (pid, count) in enumerate(self.__distribution):
+                for start in range(0, count, chunk_size):
+                    if pid == root:
+                        sink(list(self.__content[start:start + chunk_size]))
+                    else:
+                        sink(_COMM.recv(source=pid, tag=_TAG_CHUNK))
+        else:
+            for start in range(0, self.__local_size, chunk_size):
+                _COMM.ssend(list(self.__content[start:start + chunk_size]),
+                            dest=root, tag=_TAG_CHUNK)
+
+    def collect(self: 'PList[T]', root: int = 0,
+                chunk_size: int = CHUNK_SIZE) -> 'Optional[SList[T]]':
+        """
+        Return a sequential list with the same content at a root processor only.
+
+        Unlike ``to_seq``, the values are only sent to the root (see ``to_sink``).
+
+        Example::
+
+            >>> from pyske.core.list.plist import PList
+            >>> from pyske.core.support.parallel import PID
+            >>> PList.init(float, 4).collect() == ([0.0, 1.0, 2.0, 3.0] if PID == 0 else None)
+            True
+
+        :param root: the processor receiving the values
+        :param chunk_size: the maximum number of values in a message
+        :return: a sequential list at the root, None at the other processors
+        """
+        res = SList([]) if _PID == root else None
+        self.to_sink(lambda chunk: res.extend(chunk), root, chunk_size)
+        return res
+
+    @staticmethod
+    def __from_content(content: 'SList[T]') -> 'PList[T]':
+        """
+        Return a list with the given local contents.
+        """
+        p_list = PList()
+        p_list.__content = content
+        p_list.__local_size = len(content)
+        p_list.__distribution = Distribution(_COMM.allgather(p_list.__local_size))
+        p_list.__start_index = SList(p_list.__distribution).scanl(add, 0)[_PID]
+        p_list.__global_size = SList(p_list.__distribution).reduce(add)
+        return p_list
+
+    @staticmethod
+    def from_file(filename: str, parser: Optional[Callable[[str], T]] = None,
+                  encoding: str = 'utf-8') -> 'PList[T]':
+        """
+        Return a list built from the lines of a text file, read in parallel.
+
+        The file is split in byte ranges of the same size: each processor
+        reads and parses the lines that start in its range. The distribution
+        of the list follows the lines, it is only balanced in bytes.
+
+        :param filename: the name of the file (the same on all processors)
+        :param parser: (optional) a function applied to each line, without its
+            end of line characters
+        :param encoding: the encoding of the file
+        :return: a list with a value per line
+        """
+        start, stop = files.byte_range(os.path.getsize(filename), _PID, _NPROCS)
+        lines = files.read_lines(filename, start, stop, encoding)
+        if parser is not None:
+            lines = [parser(line) for line in lines]
+        return PList.__from_content(SList(lines))
+
+    @staticmethod
+    def from_csv(filename: str, parser: Optional[Callable[[List[str]], T]] = None,
+                 delimiter: str = ',', header: bool = False,
+                 encoding: str = 'utf-8') -> 'PList[T]':
+        """
+        Return a list built from the rows of a CSV file, read in parallel.
+
+        The file is split as in ``from_file``: the fields of a row
+        should not contain end of line characters. Empty rows are skipped.
+
+        :param filename: the name of the file (the same on all processors)
+        :param parser: (optional) a function applied to the list of fields of each row
+        :param delimiter: the character separating the fields
+        :param header: True if the first row is a header, to skip
+        :param encoding: the encoding of the file
+        :return: a list with a value per row
+        """
+        start, stop = files.byte_range(os.path.getsize(filename), _PID, _NPROCS)
+        lines = files.read_lines(filename, start, stop, encoding)
+        if header and start == 0:
+            lines = lines[1:]
+        rows = [row for row in csv.reader(lines, delimiter=delimiter) if row]
+        if parser is not None:
+            rows = [parser(row) for row in rows]
+        return PList.__from_content(SList(rows))
+
+    @staticmethod
+    def from_binary(filename: str, fmt: str) -> 'PList[T]':
+        """
+        Return a balanced list built from a binary file of records, read in parallel.
+
+        Example::
+
+            >>> from pyske.core.list.plist import PList
+            >>> PList.init(float, 4).to_binary("values.bin", "<d")
+            >>> PList.from_binary("values.bin", "<d").to_seq()
+            [0.0, 1.0, 2.0, 3.0]
+
+        :param filename: the name of the file (the same on all processors)
+        :param fmt: the format of a record (see the ``struct`` module), for instance ``'<d'``
+        :return: a list with a value per record: the field of the record if it has
+            only one, the tuple of its fields otherwise
+        """
+        p_list = PList()
+        p_list.__global_size = files.count_records(filename, fmt)
+        p_list.__distribution = Distribution.balanced(p_list.__global_size)
+        p_list.__local_size = p_list.__distribution[_PID]
+        p_list.__start_index = SList(p_list.__distribution).scanl(add, 0)[_PID]
+        p_list.__content = SList(files.read_records(filename, fmt, p_list.__start_index,
+                                                    p_list.__local_size))
+        return p_list
+
+    def to_file(self: 'PList[T]', filename: str, formatter: Callable[[T], str] = str,
+                encoding: str = 'utf-8') -> None:
+        """
+        Write the values of the list in a text file, a line per value, in parallel.
+
+        Each processor writes its lines at the position given by the
+        prefix sum of the sizes of the lines of the previous processors.
+
+        :param filename: the name of the file (the same on all processors)
+        :param formatter: a function giving the line of a value (without end of line)
+        :param encoding: the encoding of the file
+        """
+        data = "".join(formatter(value) + "\n" for value in self.__content).encode(encoding)
+        parimpl.write_ordered(filename, data)
+
+    def to_binary(self: 'PList[T]', filename: str, fmt: str) -> None:
+        """
+        Write the values of the list in a binary file of records, in parallel.
+
+        :param filename: the name of the file (the same on all processors)
+        :param fmt: the format of a record (see the ``struct`` module), for instance ``'<d'``.
+            A value is packed as a record if it is a tuple, as the single field of
+            a record otherwise.
+        """
+        record = struct.Struct(fmt)
+        data = b"".join(record.pack(*value) if isinstance(value, tuple) else record.pack(value)
+                        for value in self.__content)
+        parimpl.write_ordered(filename, data)
+
     def to_seq(self: 'PList[T]') -> 'SList[T]':
-        return SList(self.get_partition().reduce(concat, []))
+        # The local content is an AList if the list is stored in arrays
+        return self.__content.from_seq(parimpl.allgatherv(self.__content,
+                                                          list(self.__distribution)))
 
     def permute(self: 'PList[T]', bij: Callable[[int], int]) -> 'PList[T]':
+        # The owner of a global index is found by a binary search in the
+        # prefix sums of the distribution, computed once
+        prefix = scan(self.__distribution, add, 0)
+        if isinstance(self.__content, AList):
+            return self.__permute_array(bij, prefix)
+        start = self.__start_index
+        targets = [bij(index) for index in range(start, start + self.__local_size)]
+        index_msgs = [[] for _ in par.procs()]
+        value_msgs = [[] for _ in par.procs()]
+        for (target, value) in zip(targets, self.__content):
+            owner = bisect_right(prefix, target) - 1
+            index_msgs[owner].append(target)
+            value_msgs[owner].append(value)
+        # Indices and values are received in the same order: the values are
+        # placed directly at their local index, without sorting
+        indices = parimpl.alltoallv(index_msgs)
+        values = parimpl.alltoallv(value_msgs)
+        content = [None] * self.__local_size
+        for (target, value) in zip(indices, values):
+            content[target - start] = value
+        p_list = self.__get_shape()
+        p_list.__content = self.__content.from_seq(content)
+        return p_list
+
+    def __permute_array(self: 'PList[T]', bij: Callable[[int], int], prefix) -> 'PList[T]':
+        # The owners are found, and the values grouped by owner, by NumPy
+        start = self.__start_index
+        targets = numpy.fromiter((bij(index) for index in range(start, start + self.__local_size)),
+                                 dtype=numpy.int64, count=self.__local_size)
+        owners = numpy.searchsorted(prefix, targets, side='right') - 1
+        order = numpy.argsort(owners, kind='stable')
+        bounds = numpy.searchsorted(owners[order], numpy.arange(1, _NPROCS))
+        indices = parimpl.alltoallv(numpy.split(targets[order], bounds))
+        values = parimpl.alltoallv(numpy.split(self.__content.to_numpy()[order], bounds))
+        content = numpy.empty(self.__local_size, dtype=values.dtype)
+        content[indices - start] = values
         p_list = self.__get_shape()
-        distr = Distribution(self.__distribution)
-        new_indices = self.mapi(lambda i, x: distr.to_pid(bij(i), x)).get_partition().map(_group_by)
-        mapping = new_indices.__content[0]
-        keys = mapping.keys()
-        messages = [mapping[pid] if pid in keys else [] for pid in par.procs()]
-        exchanged = SList(parimpl.COMM.alltoall(messages)).flatten()
-        exchanged.sort()
-        p_list.__content = exchanged.map(lambda pair: pair[1])
+        p_list.__content = AList(content)
         return p_list
+
+    def lazy(self: 'PList[T]') -> 'LazyList[T]':
+        """
+        Return a lazy version of the list.
+
+        Calls to element-wise skeletons (``map``, ``mapi``, ``map2``, ``map2i``,
+        ``map3``, ``zip``, ``filter``) on the returned list are recorded and
+        executed together, in a single pass, when another skeleton is called.
+
+        :return: a lazy list
+        """
+        return LazyList(self)
@@ -5,7 +5,7 @@ class SList: sequential lists.
 """
 import builtins
 import functools
-from operator import concat
+import itertools
 from typing import TypeVar, Callable, Sequence, Tuple, Optional, Generic, Iterator
 from pyske.core import interface
 from pyske.core.support.list import scan
@@ -39,7 +39,7 @@ class SList(list, interface.List, Generic[T]):
         from_str.
 
     Methods:
-        scanp.
+        scanp, lazy.
     """
 
     @staticmethod
@@ -167,8 +167,7 @@ class SList(list, interface.List, Generic[T]):
 
     def flatten(self: 'SList[SList[T]]',
                 new_distr: interface.Distribution = None) -> 'SList[T]':
-        a_list = functools.reduce(concat, self, [])
-        return SList(a_list)
+        return SList(itertools.chain.from_iterable(self))
 
     def distribute(self: 'SList[T]', _: interface.Distribution) -> 'SList[T]':
         return self
@@ -202,3 +201,16 @@ class SList(list, interface.List, Generic[T]):
         for (idx, value) in enumerate(self):
             a_list[bij(idx)] = value
         return SList(a_list)
+
+    def lazy(self: 'SList[T]') -> 'LazyList[T]':
+        """
+        Return a lazy version of the list.
+
+        Calls to element-wise skeletons (``map``, ``mapi``, ``map2``, ``map2i``,
+        ``map3``, ``zip``, ``filter``) on the returned list are recorded and
+        executed together, in a single pass, when another skeleton is called.
+
+        :return: a lazy list
+        """
+        from pyske.core.list.lazy import LazyList  # pylint: disable=import-outside-toplevel
+        return LazyList(self)
@@ -126,24 +126,164 @@ def apply_rules(term: Term, rules):
     return functools.reduce(apply_rule, rules, term)
 
 
+def _head(pattern):
+    """Return the function symbol at the root of a pattern (None for a variable)."""
+    if isinstance(pattern, Term):
+        return pattern.function
+    return None
+
+
+_INDEX = {'rules': (), 'heads': {}, 'any': []}
+
+
+def _rules_index(rules):
+    """
+    Index rules by the function symbol at the root of their left-hand side.
+
+    :return: a pair of a dictionary from function symbols to lists of
+        (position, rule), and the list of (position, rule) of the rules
+        whose left-hand side could match any term.
+    """
+    if _INDEX['rules'] != tuple(map(id, rules)):
+        heads = {}
+        anywhere = []
+        for (position, rule) in enumerate(rules):
+            head = _head(rule.left)
+            try:
+                heads.setdefault(head, []).append((position, rule))
+            except TypeError:  # unhashable function symbol
+                anywhere.append((position, rule))
+            if head is None:
+                anywhere.append((position, rule))
+        _INDEX.update({'rules': tuple(map(id, rules)), 'heads': heads, 'any': anywhere})
+    return _INDEX['heads'], _INDEX['any']
+
+
+def _candidates(term, heads, anywhere):
+    try:
+        rules = heads.get(term.function, [])
+    except TypeError:  # unhashable function symbol
+        rules = []
+    if anywhere:
+        rules = sorted(rules + [rule for rule in anywhere if rule not in rules],
+                       key=lambda pair: pair[0])
+    return rules
+
+
+def _apply_indexed_rules(term: Term, heads, anywhere):
+    """
+    Equivalent to ``apply_rules(term, RULES_DB)``, but only tries the rules
+    whose left-hand side has the same root symbol as the current term.
+
+    :return: the new term and True if a rule was applied, term and False otherwise
+    """
+    changed = False
+    position = -1
+    while isinstance(term, Term):
+        rules = [(pos, rule) for (pos, rule) in _candidates(term, heads, anywhere)
+                 if pos > position]
+        for (pos, rule) in rules:
+            new_t = apply_rule(term, rule)
+            position = pos
+            if new_t is not term:
+                term = new_t
+                changed = True
+                break
+        else:
+            break
+    return term, changed
+
+
+class _HashConsing:
+    """
+    Identification of structurally equal terms.
+
+    Each term in normal form receives an integer identifier. Two terms with
+    the same class, function symbol, and arguments (compared with their
+    identifiers for subterms, and by value for other hashable arguments)
+    receive the same identifier.
+    """
+
+    def __init__(self):
+        self.__ids = {}
+        self.__numbers = {}
+        self.__keep = []
+
+    def key(self, value):
+        """Return a hashable key for a term argument."""
+        if isinstance(value, Term):
+            return 'T', self.__ids[id(value)]
+        try:
+            hash(value)
+            return 'V', type(value), value
+        except TypeError:
+            return 'O', id(value)
+
+    def term_key(self, term: Term, arguments):
+        """Return a key identifying a term from its (normalized) arguments."""
+        return (type(term), self.key(term.function), term.static,
+                tuple(self.key(arg) for arg in arguments))
+
+    def is_normal(self, term):
+        """Check whether a term is known to be in normal form."""
+        return id(term) in self.__ids
+
+    def register(self, term, key):
+        """Give the identifier of its key to a term in normal form."""
+        if isinstance(term, Term) and id(term) not in self.__ids:
+            self.__ids[id(term)] = self.__numbers.setdefault(key, len(self.__numbers))
+            self.__keep.append(term)
+
+
 def inner_most_strategy(term: Term):
-    """Apply all available rules on a term (inner most strategy)."""
-    if term.function == "__raw__":
-        return term
-    condition = True
-    prev_args = term.arguments
-    new_args = []
-    while condition:
-        new_args = [inner_most_strategy(e) if isinstance(e, Term) else e for e in prev_args]
-        matches = [new_args[i].match(prev_args[i])
-                   if isinstance(new_args[i], Term) else {} for i in range(0, len(new_args))]
-        changes = functools.reduce(merge, matches, {})
-        condition = changes != {}
-        prev_args = new_args
-    new_t = type(term)(term.function, new_args, term.static)
-    new_t = apply_rules(new_t, RULES_DB)
-    if isinstance(new_t, Term):
-        if new_t.match(term) == {}:
-            return new_t
-        return inner_most_strategy(new_t)
-    return new_t
+    """
+    Apply all available rules on a term (inner most strategy).
+
+    The traversal is iterative: the depth of the term is not limited by
+    the recursion limit of Python. Rules are indexed by their root symbol,
+    and the normal forms of structurally equal subterms are computed once.
+    """
+    heads, anywhere = _rules_index(RULES_DB)
+    consing = _HashConsing()
+    normal_forms = {}
+    results = []
+    # tasks: ('visit', term) or ('build', term) or ('store', key)
+    tasks = [('visit', term)]
+    while tasks:
+        action, value = tasks.pop()
+        if action == 'visit':
+            if not isinstance(value, Term) or value.function == "__raw__":
+                if isinstance(value, Term):
+                    consing.register(value, ('raw', id(value.arguments[0])))
+                results.append(value)
+                continue
+            if consing.is_normal(value):
+                results.append(value)
+                continue
+            tasks.append(('build', value))
+            tasks.extend(('visit', arg) for arg in reversed(value.arguments))
+        elif action == 'build':
+            num = len(value.arguments)
+            arguments = results[len(results) - num:] if num else []
+            del results[len(results) - num:]
+            key = consing.term_key(value, arguments)
+            if key in normal_forms:
+                results.append(normal_forms[key])
+                continue
+            if all(new is old for (new, old) in zip(arguments, value.arguments)):
+                new_t = value
+            else:
+                new_t = type(value)(value.function, arguments, value.static)
+            new_t, changed = _apply_indexed_rules(new_t, heads, anywhere)
+            if changed:
+                tasks.append(('store', key))
+                tasks.append(('visit', new_t))
+            else:
+                consing.register(new_t, key)
+                normal_forms[key] = new_t
+                results.append(new_t)
+        else:
+            normal_form = results[-1]
+            consing.register(normal_form, value)
+            normal_forms[value] = normal_form
+    return results.pop()
@@ -2,11 +2,16 @@
 pyske.core.stream: stream.
 
 Classes:
-    * Sstream: sequential stream.
+    * SStream: sequential stream.
+    * PStream: parallel stream.
+    * KeepAll, KeepNone, KeepLast, SpillToFile: retention policies.
+    * SlidingWindow, TimeWindow: windows with incremental aggregation.
 """
 
 from .sstream import SStream
 from .pstream import PStream
+from .retention import Retention, KeepAll, KeepNone, KeepLast, SpillToFile
+from .window import SlidingWindow, TimeWindow
 
-__all__ = ['SStream']
-__all__ = ['PStream']
+__all__ = ['SStream', 'PStream', 'Retention', 'KeepAll', 'KeepNone', 'KeepLast', 'SpillToFile',
+           'SlidingWindow', 'TimeWindow']
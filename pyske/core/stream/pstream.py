@@ -2,8 +2,10 @@
 class SStream: parallel streams for real time data processing.
 """
 
-from typing import Generic, TypeVar, Callable, Optional
+from operator import add
+from typing import Generic, TypeVar, Callable, Iterable, Optional
 from pyske.core.stream.sstream import SStream
+from pyske.core.stream.retention import Retention, SpillToFile
 from pyske.core.support import parallel as parimpl
 from pyske.core.list.slist import SList
 
@@ -24,36 +26,86 @@ class PStream(list, Generic[T]):
     Is used to automize the process of getting the data from the file in the root proc
     this allows to use the others' proc in the main
 
+    In distributed mode, the root proc reads each window and scatters it in
+    chunks: every proc runs the registered operations on its chunk, the partial
+    reductions are combined with a collective communication, and each proc
+    only keeps its own chunks as processed data. ``run`` should then be called
+    by all the procs.
+
     Methods:
-            getvaluefromsource, stop, mapr, filterr,
+            getvaluefromsource, scatterwindow, stop, mapr, filterr,
             reducer, map, reduce, filter, dooperation,
             bcaststream, getdata, getlastwindowvalue,
             getoperations, getwindow, run
     """
 
-    def __init__(self, source: str, types: T, windowsize: int = 10):
+    def __init__(self, source: str, types: T, windowsize: int = 10,
+                 distributed: bool = False, retention: Optional[Retention] = None):
         """
         Initialise the stream
         @param source: The path to the data file : str
         @param types: The type of the data that will be use in the stream : T
         @param windowsize: The size of the window : int
+        @param distributed: If True, the windows are processed by all the procs : bool
+        @param retention: What is kept of the processed data (default: all the data
+            in memory). In distributed mode, each proc applies it to its own data
+            (a SpillToFile policy should then be per_proc), otherwise only the root
+            proc does : Optional[Retention]
         """
         super().__init__()
-        self.__stream: SStream = SStream(source, types, windowsize)
+        if distributed and isinstance(retention, SpillToFile):
+            paths = _COMM.allgather(retention.path)
+            assert len(set(paths)) == _NPROCS, \
+                "In distributed mode, each proc should spill to its own file (see per_proc)"
+        self.__stream: SStream = SStream(source, types, windowsize, retention=retention)
         self.__stop: bool = False
         self.__operations: list = []
+        self.__distributed: bool = distributed
 
-    def getvaluefromsource(self):
+    def getvaluefromsource(self, windows: Optional[int] = None):
         """
         Get the data from the file while the window hasn't reached
         its maximum size, then run all the operation and broadcast
         the all the value to the other proc
+        @param windows: The number of windows to process, None to process
+            windows until stop is called : Optional[int]
         """
         self.__stop: bool = False
-        while not self.__stop:
+        while not self.__stop and windows != 0:
             self.__stream.getvaluefromsource()
             self.dooperation()
             self.bcaststream()
+            if windows is not None:
+                windows -= 1
+
+    def scatterwindow(self, windows: Optional[int] = None):
+        """
+        Distributed mode: the root proc gets the data from the file while the
+        window hasn't reached its maximum size, then scatters the window,
+        and all the procs run all the operations on their chunk of the window.
+        Should be called by all the procs
+        @param windows: The number of windows to process, None to process
+            windows until stop is called on the root proc : Optional[int]
+        """
+        self.__stop: bool = False
+        while windows != 0:
+            chunks = None
+            if _PID == 0:
+                chunks = [(True, [])] * _NPROCS
+                if not self.__stop:
+                    window = self.__stream.getvaluefromsource()
+                    bounds = SList(parimpl.local_size(pid, len(window))
+                                   for pid in range(0, _NPROCS)).scanl(add, 0)
+                    bounds.append(len(window))
+                    chunks = [(False, window[bounds[pid]:bounds[pid + 1]])
+                              for pid in range(0, _NPROCS)]
+            stop, chunk = _COMM.scatter(chunks, 0)
+            if stop:
+                break
+            self.__stream.setstream(SList(chunk), self.__stream.getlastwindowvalue())
+            self.dooperation()
+            if windows is not None:
+                windows -= 1
 
     def getlastwindow(self) -> T:
         """
@@ -90,7 +142,25 @@ class PStream(list, Generic[T]):
         @param neutral: Item place before the data for the calculation : Optional[T] = None
         @return: The value of the reduce : T
         """
-        return self.__stream.reduce(binary_op, neutral)
+        if not self.__distributed:
+            return self.__stream.reduce(binary_op, neutral)
+
+        def skipnone(left, right):
+            if left is None:
+                return right
+            if right is None:
+                return left
+            return binary_op(left, right)
+
+        window = self.__stream.getwindow()
+        partial = SList(window).reduce(binary_op) if window else None
+        value = SList([parimpl.reduce(skipnone, partial)]).filter(lambda x: x is not None)
+        lastwindowvalue = self.__stream.getlastwindowvalue()
+        if lastwindowvalue is not None:
+            value.append(lastwindowvalue)
+        lastwindowvalue = value.reduce(binary_op, neutral)
+        self.__stream.setstream(window, lastwindowvalue)
+        return lastwindowvalue
 
     def map(self, unary_op: Callable[[T], R]) -> SList:
         """
@@ -144,22 +214,26 @@ class PStream(list, Generic[T]):
         """
         self.__stream = _COMM.bcast(self.__stream, 0)
 
-    def getdata(self) -> SList:
+    def getdata(self) -> Iterable:
         """
         Broadcast the value of the stream from the root to the other proc
-        and then return all the data processed
+        and then return all the data processed.
+        In distributed mode, return the data processed by this proc
         @return: The data processed : SList
         """
-        self.bcaststream()
+        if not self.__distributed:
+            self.bcaststream()
         return self.__stream.getdata()
 
     def getlastwindowvalue(self) -> T:
         """
         Broadcast the value of the stream from the root to the other proc
-        and then return the value of the last reduce
+        and then return the value of the last reduce.
+        In distributed mode, all the procs already have this value
         @return: The data processed : SList
         """
-        self.bcaststream()
+        if not self.__distributed:
+            self.bcaststream()
         return self.__stream.getlastwindowvalue()
 
     def getoperations(self) -> list:
@@ -174,10 +248,19 @@ class PStream(list, Generic[T]):
         """
         return self.__stream.getwindow()
 
-    def run(self):
+    def run(self, windows: Optional[int] = None):
         """
         Run the getter of the data from the file and the execution
-        of the operation once the window is full
-        """
-        if _PID == 0:
-            self.getvaluefromsource()
+        of the operation once the window is full.
+        When a number of windows is given, the other procs receive the
+        stream broadcast by the root proc after each window
+        @param windows: The number of windows to process, None to process
+            windows until stop is called : Optional[int]
+        """
+        if self.__distributed:
+            self.scatterwindow(windows)
+        elif _PID == 0:
+            self.getvaluefromsource(windows)
+        elif windows is not None:
+            for _ in range(0, windows):
+                self.bcaststream()
@@ -0,0 +1,165 @@
+"""
+Retention policies for the data processed by streams
+
+Classes:
+    * Retention: interface of retention policies.
+    * KeepAll: keep all the processed data in memory.
+    * KeepNone: do not keep the processed data.
+    * KeepLast: keep the data of the last windows in memory.
+    * SpillToFile: append the processed data to a file, read back lazily.
+"""
+
+import itertools
+import os
+import pickle
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Iterable, Iterator
+
+from pyske.core.list.slist import SList
+from pyske.core.support import parallel
+
+__all__ = ['Retention', 'KeepAll', 'KeepNone', 'KeepLast', 'SpillToFile']
+
+
+class Retention(ABC):
+    """
+    Retention policy: what a stream keeps of its processed windows.
+
+    Methods:
+        append, clear, getdata
+    """
+
+    @abstractmethod
+    def append(self, window: list):
+        """
+        Record a processed window
+        @param window: The data of the window : list
+        """
+
+    @abstractmethod
+    def clear(self):
+        """
+        Forget all the recorded data
+        """
+
+    @abstractmethod
+    def getdata(self) -> Iterable:
+        """
+        @return: The recorded data, in processing order : Iterable
+        """
+
+
+class KeepAll(Retention):
+    """
+    Keep all the processed data in memory (the memory grows with the stream)
+    """
+
+    def __init__(self):
+        self.__data: SList = SList()
+
+    def append(self, window: list):
+        self.__data.extend(window)
+
+    def clear(self):
+        self.__data = SList()
+
+    def getdata(self) -> SList:
+        return self.__data
+
+
+class KeepNone(Retention):
+    """
+    Do not keep the processed data
+    """
+
+    def append(self, window: list):
+        pass
+
+    def clear(self):
+        pass
+
+    def getdata(self) -> SList:
+        return SList()
+
+
+class KeepLast(Retention):
+    """
+    Keep the data of the last windows in memory, in a ring buffer
+    """
+
+    def __init__(self, windows: int):
+        """
+        @param windows: The number of windows to keep : int
+        """
+        assert windows > 0
+        self.__windows: deque = deque(maxlen=windows)
+
+    def append(self, window: list):
+        self.__windows.append(window)
+
+    def clear(self):
+        self.__windows.clear()
+
+    def getdata(self) -> SList:
+        return SList(itertools.chain.from_iterable(self.__windows))
+
+
+class SpilledData:
+    """
+    Data spilled to a file by a SpillToFile policy, read lazily when iterated
+    """
+
+    def __init__(self, path: str):
+        self.__path: str = path
+
+    def __iter__(self) -> Iterator:
+        if not os.path.exists(self.__path):
+            return
+        with open(self.__path, 'rb') as file:
+            while True:
+                try:
+                    window = pickle.load(file)
+                except EOFError:
+                    return
+                yield from window
+
+
+class SpillToFile(Retention):
+    """
+    Append the processed windows to a file, without keeping them in memory.
+    The data are only read back from the file when the result of getdata
+    is iterated.
+
+    When several procs spill data, each proc should use its own file:
+    with per_proc, the pid of the proc is appended to the path.
+    """
+
+    def __init__(self, path: str, truncate: bool = True, per_proc: bool = False):
+        """
+        @param path: The path of the file : str
+        @param truncate: If True, the content of an existing file is discarded,
+            otherwise the windows are appended to it : bool
+        @param per_proc: If True, each proc uses the file path.pid : bool
+        """
+        self.__path: str = f'{path}.{parallel.PID}' if per_proc else path
+        if truncate:
+            self.clear()
+
+    @property
+    def path(self) -> str:
+        """
+        @return: The path of the file of the current proc : str
+        """
+        return self.__path
+
+    def append(self, window: list):
+        with open(self.__path, 'ab') as file:
+            pickle.dump(list(window), file)
+
+    def clear(self):
+        with open(self.__path, 'wb'):
+            pass
+
+    def getdata(self) -> SpilledData:
+        return SpilledData(self.__path)
@@ -2,8 +2,13 @@
 class SStream: sequential streams for real time data processing
 """
 
-from typing import Generic, TypeVar, Callable, Optional
+import os
+import time
+from collections import deque
+from typing import Generic, TypeVar, Callable, Iterable, Iterator, Optional
 from pyske.core.list.slist import SList
+from pyske.core.stream.retention import Retention, KeepAll
+from pyske.core.stream.window import SlidingWindow, TimeWindow
 
 __all__ = ['SStream']
 
@@ -18,15 +23,23 @@ class SStream(list, Generic[T]):
         Methods:
             getlastwindowvalue, getdata, getvaluefromsource,
             map, filter, reduce, window, getwindow,
-            setstream
+            setstream, slidingreduce, timereduce
         """
 
-    def __init__(self, source: str, types: T, windowsize: int = 10):
+    def __init__(self, source: str, types: T, windowsize: int = 10,
+                 pollinterval: float = 0.001, maxpollinterval: float = 0.1,
+                 chunksize: int = 1 << 16, retention: Optional[Retention] = None):
         """
         Initialise the stream
         @param source: The path to the data file : str
         @param types: The type of the data that will be use in the stream : T
         @param windowsize: The size of the window : int
+        @param pollinterval: The initial waiting time (in seconds) when no new data
+            is available, doubled after each unsuccessful poll : float
+        @param maxpollinterval: The maximum waiting time between two polls : float
+        @param chunksize: The maximum number of bytes read from the file at once : int
+        @param retention: What is kept of the processed data (default: KeepAll(),
+            all the data in memory) : Optional[Retention]
         """
         super().__init__()
         self.__type: T = types
@@ -34,9 +47,14 @@ class SStream(list, Generic[T]):
         self.__window: SList = SList()
         self.__windowsize: int = windowsize
         self.__lastwindowvalue: T = None
-        self.__data: SList = SList()
-        self.__lastsourceline: int = 0
+        self.__data: Retention = KeepAll() if retention is None else retention
         self.__lastwindow: list = []
+        self.__pollinterval: float = pollinterval
+        self.__maxpollinterval: float = maxpollinterval
+        self.__chunksize: int = chunksize
+        self.__offset: int = 0
+        self.__partialline: bytes = b''
+        self.__lines: deque = deque()
 
     def getlastwindowvalue(self) -> T:
         """
@@ -50,35 +68,115 @@ class SStream(list, Generic[T]):
         """
         return self.__lastwindow
 
-    def getdata(self) -> SList:
+    def getdata(self) -> Iterable:
         """
-        @return: The list of all data processed : SList
+        @return: The data processed kept by the retention policy,
+            a list unless data is spilled to a file : Iterable
         """
-        return self.__data
+        return self.__data.getdata()
+
+    def __readsource(self) -> bool:
+        """
+        Read the bytes appended to the file since the last read, and
+        add the complete lines they contain to the lines to process
+        @return: True if new data was read, False otherwise : bool
+        """
+        if os.path.getsize(self.__source) < self.__offset:
+            # the file was truncated or replaced: start again from its beginning
+            self.__offset = 0
+            self.__partialline = b''
+        with open(self.__source, 'rb') as source:
+            source.seek(self.__offset)
+            chunk = source.read(self.__chunksize)
+        if not chunk:
+            return False
+        self.__offset += len(chunk)
+        lines = (self.__partialline + chunk).split(b'\n')
+        self.__partialline = lines.pop()
+        self.__lines.extend(line.decode() for line in lines)
+        return True
 
     def getvaluefromsource(self) -> SList:
         """
         Get the data from the file while the window hasn't reached
-        its maximum size, then return the window
+        its maximum size, then return the window.
+        Only the complete lines appended to the file since the last call
+        are read
         @return: The list of data in the window : SList
         """
-        i = 0
         while len(self.__window) < self.__windowsize:
-            i += 1
-            source = open(self.__source, 'r')
-            file = source.readlines()
-            newdata = []
-            if len(file) > self.__lastsourceline:
-                newdata = file[self.__lastsourceline: -1]
-            for data in newdata:
-                if len(self.__window) >= self.__windowsize:
-                    break
-
-                self.__lastsourceline += 1
-                self.__window.append(self.__type(data))
-            source.close()
+            self.__waitsource()
+            while self.__lines and len(self.__window) < self.__windowsize:
+                self.__window.append(self.__type(self.__lines.popleft()))
         return self.__window
 
+    def __waitsource(self):
+        """
+        Wait until at least one line is available. When no new data is
+        available, wait before polling again, with an exponential backoff
+        """
+        interval = self.__pollinterval
+        while not self.__lines and not self.__readsource():
+            time.sleep(interval)
+            interval = min(2 * interval, self.__maxpollinterval)
+
+    def __values(self, limit: Optional[int]) -> Iterator[T]:
+        """
+        @param limit: The number of values to read, None for no limit : Optional[int]
+        @return: The values read from the source, one by one : Iterator[T]
+        """
+        while limit != 0:
+            self.__waitsource()
+            yield self.__type(self.__lines.popleft())
+            if limit is not None:
+                limit -= 1
+
+    def slidingreduce(self, binary_op: Callable[[T, T], T], size: int, slide: int = 1,
+                      inverse: Optional[Callable[[T, T], T]] = None,
+                      limit: Optional[int] = None) -> Iterator[T]:
+        """
+        Reduce sliding windows of the data read from the source: each
+        reduction combines the last ``size`` values, and a reduction is
+        produced every ``slide`` values. The reduction is incremental:
+        each value costs O(1) amortized applications of the operator(s)
+        @param binary_op: The associative operator to use for the reduce : Callable[[T, T], T]
+        @param size: The number of values in a window : int
+        @param slide: The number of values between two reductions : int
+        @param inverse: (optional) An inverse of binary_op, used to remove
+            the oldest value from the reduction : Callable[[T, T], T]
+        @param limit: The number of values to read, None for no limit : Optional[int]
+        @return: The reductions of the windows : Iterator[T]
+        """
+        window = SlidingWindow(binary_op, size, slide, inverse)
+        for value in self.__values(limit):
+            result = window.push(value)
+            if result is not None:
+                yield result
+
+    def timereduce(self, binary_op: Callable[[T, T], T], duration: float,
+                   slide: Optional[float] = None,
+                   inverse: Optional[Callable[[T, T], T]] = None,
+                   timestamp: Optional[Callable[[T], float]] = None,
+                   limit: Optional[int] = None) -> Iterator[T]:
+        """
+        Reduce time-based windows of the data read from the source: each
+        reduction combines the values of the last ``duration`` seconds, and a
+        reduction is produced every ``slide`` seconds (when a value arrives)
+        @param binary_op: The associative operator to use for the reduce : Callable[[T, T], T]
+        @param duration: The length of a window, in seconds : float
+        @param slide: The time between two reductions (default: duration) : float
+        @param inverse: (optional) An inverse of binary_op : Callable[[T, T], T]
+        @param timestamp: (optional) A function giving the time of a value,
+            by default the time of arrival of the value is used : Callable[[T], float]
+        @param limit: The number of values to read, None for no limit : Optional[int]
+        @return: The reductions of the windows : Iterator[T]
+        """
+        window = TimeWindow(binary_op, duration, slide, inverse)
+        for value in self.__values(limit):
+            result = window.push(value, None if timestamp is None else timestamp(value))
+            if result is not None:
+                yield result
+
     def map(self, unary_op: Callable[[T], R]) -> SList:
         """
         Apply a function on all data of the window then return the window
@@ -112,10 +210,10 @@ class SStream(list, Generic[T]):
 
     def window(self):
         """
-        Reset the window by adding the processed data to the __data list
+        Reset the window by giving the processed data to the retention policy
         and clear the data on the window list
         """
-        self.__data.extend(self.__window)
+        self.__data.append(self.__window)
         self.__lastwindow = self.__window
         self.__window = SList()
 
@@ -125,13 +223,16 @@ class SStream(list, Generic[T]):
         """
         return self.__window
 
-    def setstream(self, window: SList, lastwindowvalue: T, data: SList):
+    def setstream(self, window: SList, lastwindowvalue: T, data: Optional[SList] = None):
         """
         Set the value of the stream with the parameter
         @param window: A list containing the data to process : SList
         @param lastwindowvalue: The value of the last reduce done in the last window : T
-        @param data: The list of all data already process : SList
+        @param data: The list of all data already process, None to keep
+            the current data : Optional[SList]
         """
         self.__window = window
         self.__lastwindowvalue = lastwindowvalue
-        self.__data = data
+        if data is not None:
+            self.__data.clear()
+            self.__data.append(data)
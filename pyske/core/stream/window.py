@@ -0,0 +1,226 @@
+"""
+Sliding windows with incremental aggregation
+
+Classes:
+    * TwoStacks: aggregation of a queue for any associative operator.
+    * Subtracting: aggregation of a queue for an invertible operator.
+    * SlidingWindow: count-based sliding (or tumbling) windows.
+    * TimeWindow: time-based sliding (or tumbling) windows.
+"""
+
+import time
+from collections import deque
+from typing import Callable, Generic, Optional, TypeVar
+
+__all__ = ['TwoStacks', 'Subtracting', 'SlidingWindow', 'TimeWindow']
+
+T = TypeVar('T')  # pylint: disable=invalid-name
+
+
+class TwoStacks(Generic[T]):
+    """
+    Queue maintaining the combination of its elements, from the oldest to
+    the newest, for an associative operator.
+    Each operation costs O(1) amortized applications of the operator.
+
+    Methods:
+        push, pop, query
+    """
+
+    def __init__(self, binary_op: Callable[[T, T], T]):
+        """
+        @param binary_op: An associative operator : Callable[[T, T], T]
+        """
+        self.__op = binary_op
+        # oldest elements, with the combination of the element and the newer ones
+        self.__front: list = []
+        # newest elements, and their combination
+        self.__back: list = []
+        self.__backvalue = None
+
+    def __len__(self) -> int:
+        return len(self.__front) + len(self.__back)
+
+    def push(self, value: T):
+        """
+        Add a value at the end of the queue
+        @param value: The value to add : T
+        """
+        self.__back.append(value)
+        self.__backvalue = value if len(self.__back) == 1 \
+            else self.__op(self.__backvalue, value)
+
+    def pop(self) -> T:
+        """
+        Remove the oldest value of the queue
+        @return: The removed value : T
+        """
+        if not self.__front:
+            acc = None
+            while self.__back:
+                value = self.__back.pop()
+                acc = value if not self.__front else self.__op(value, acc)
+                self.__front.append((value, acc))
+            self.__backvalue = None
+        return self.__front.pop()[0]
+
+    def query(self) -> Optional[T]:
+        """
+        @return: The combination of all the values of the queue,
+            None if the queue is empty : Optional[T]
+        """
+        if not self.__front:
+            return self.__backvalue
+        if not self.__back:
+            return self.__front[-1][1]
+        return self.__op(self.__front[-1][1], self.__backvalue)
+
+
+class Subtracting(Generic[T]):
+    """
+    Queue maintaining the combination of its elements for an operator with an
+    inverse: the oldest value is removed from the combination by applying the
+    inverse. Each operation costs O(1) applications of the operators.
+
+    Methods:
+        push, pop, query
+    """
+
+    def __init__(self, binary_op: Callable[[T, T], T], inverse: Callable[[T, T], T]):
+        """
+        @param binary_op: An associative and commutative operator : Callable[[T, T], T]
+        @param inverse: The operator such that
+            inverse(binary_op(acc, value), value) == acc : Callable[[T, T], T]
+        """
+        self.__op = binary_op
+        self.__inverse = inverse
+        self.__values: deque = deque()
+        self.__value = None
+
+    def __len__(self) -> int:
+        return len(self.__values)
+
+    def push(self, value: T):
+        """
+        Add a value at the end of the queue
+        @param value: The value to add : T
+        """
+        self.__values.append(value)
+        self.__value = value if len(self.__values) == 1 else self.__op(self.__value, value)
+
+    def pop(self) -> T:
+        """
+        Remove the oldest value of the queue
+        @return: The removed value : T
+        """
+        value = self.__values.popleft()
+        self.__value = self.__inverse(self.__value, value) if self.__values else None
+        return value
+
+    def query(self) -> Optional[T]:
+        """
+        @return: The combination of all the values of the queue,
+            None if the queue is empty : Optional[T]
+        """
+        return self.__value
+
+
+def _queue(binary_op, inverse):
+    if inverse is None:
+        return TwoStacks(binary_op)
+    return Subtracting(binary_op, inverse)
+
+
+class SlidingWindow(Generic[T]):
+    """
+    Count-based window of the last ``size`` values, reduced every ``slide``
+    values. With ``slide == size``, the windows are tumbling windows.
+
+    Methods:
+        push
+    """
+
+    def __init__(self, binary_op: Callable[[T, T], T], size: int, slide: int = 1,
+                 inverse: Optional[Callable[[T, T], T]] = None):
+        """
+        @param binary_op: An associative operator : Callable[[T, T], T]
+        @param size: The number of values in a window : int
+        @param slide: The number of values between two reductions : int
+        @param inverse: (optional) The inverse of binary_op : Callable[[T, T], T]
+        """
+        assert size > 0 and slide > 0
+        self.__size: int = size
+        self.__slide: int = slide
+        self.__queue = _queue(binary_op, inverse)
+        self.__count: int = 0
+
+    def push(self, value: T) -> Optional[T]:
+        """
+        Add a value to the window
+        @param value: The new value : T
+        @return: The reduction of the window if the window is full and
+            ``slide`` values arrived since the last reduction, None otherwise
+        """
+        self.__queue.push(value)
+        if len(self.__queue) > self.__size:
+            self.__queue.pop()
+        self.__count += 1
+        if self.__count >= self.__size and (self.__count - self.__size) % self.__slide == 0:
+            return self.__queue.query()
+        return None
+
+
+class TimeWindow(Generic[T]):
+    """
+    Time-based window of the values of the last ``duration`` seconds,
+    reduced every ``slide`` seconds. With ``slide == duration``, the windows
+    are tumbling windows.
+
+    Methods:
+        push
+    """
+
+    def __init__(self, binary_op: Callable[[T, T], T], duration: float,
+                 slide: Optional[float] = None,
+                 inverse: Optional[Callable[[T, T], T]] = None):
+        """
+        @param binary_op: An associative operator : Callable[[T, T], T]
+        @param duration: The length of a window, in seconds : float
+        @param slide: The time between two reductions (default: duration) : float
+        @param inverse: (optional) The inverse of binary_op : Callable[[T, T], T]
+        """
+        assert duration > 0
+        self.__duration: float = duration
+        self.__slide: float = duration if slide is None else slide
+        assert self.__slide > 0
+        self.__queue = _queue(binary_op, inverse)
+        self.__times: deque = deque()
+        self.__next: Optional[float] = None
+
+    def push(self, value: T, timestamp: Optional[float] = None) -> Optional[T]:
+        """
+        Add a value to the window. The timestamps should not decrease
+        @param value: The new value : T
+        @param timestamp: The time of the value (default: the current time) : float
+        @return: The reduction of the values of the window [end - duration, end),
+            where end is the first reduction time reached by the timestamp,
+            None if no reduction time was reached
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if self.__next is None:
+            self.__next = timestamp + self.__slide
+        result = None
+        if timestamp >= self.__next:
+            self.__evict(self.__next)
+            result = self.__queue.query()
+            while self.__next <= timestamp:
+                self.__next += self.__slide
+        self.__queue.push(value)
+        self.__times.append(timestamp)
+        return result
+
+    def __evict(self, now: float):
+        while self.__times and self.__times[0] < now - self.__duration:
+            self.__times.popleft()
+            self.__queue.pop()
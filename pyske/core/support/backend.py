@@ -0,0 +1,525 @@
+"""
+Internal module: execution backends of the parallel functions
+
+A backend provides the communicator used by PySke, with the subset of the
+interface of the communicators of mpi4py it needs (``Get_rank``, ``Get_size``,
+``send``, ``ssend``, ``recv``, ``bcast``, ``scatter``, ``gather``, ``allgather``,
+``alltoall``, ``allreduce``, ``exscan``, ``barrier``, ``Allgatherv`` and
+``Alltoallv``), a clock, the operations given to reductions, and the parallel
+writing of files.
+
+Two backends are available:
+
+* ``mpi``: the processes are launched by ``mpirun`` and communicate with MPI;
+* ``shared``: the processes are launched on the local machine by ``run``, or by
+  ``python -m pyske.core.support.launch -n N program.py``. They exchange objects
+  through queues, and numeric buffers through shared memory. A program that is
+  not launched this way runs on a single process.
+
+The backend is given by the environment variable ``PYSKE_BACKEND`` (``mpi`` or
+``shared``), or by ``select``. By default, the MPI backend is used if mpi4py is
+installed. It must be chosen before ``pyske.core.support.parallel`` is imported.
+"""
+__all__ = ['MPI_BACKEND', 'SHARED_BACKEND', 'MPIBackend', 'SharedBackend', 'SharedComm',
+           'current', 'select', 'run']
+
+import functools
+import importlib.util
+import multiprocessing
+import operator
+import os
+import pickle
+import queue
+import sys
+import time
+import traceback
+from multiprocessing import shared_memory
+from typing import Any, Callable, List, Optional, Sequence
+
+from pyske.core.support import operators
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+MPI_BACKEND = 'mpi'
+SHARED_BACKEND = 'shared'
+ENVIRONMENT_VARIABLE = 'PYSKE_BACKEND'
+# The identifier and the number of the processes launched by run
+_RANK_VARIABLE = 'PYSKE_SHARED_RANK'
+_NPROCS_VARIABLE = 'PYSKE_SHARED_NPROCS'
+
+_STATE: dict = {'backend': None}
+
+# Tag of the messages of the collectives of the shared backend
+_TAG_COLLECTIVE = -1
+# Tag of the acknowledgements of the messages sent by ssend
+_TAG_ACK = -2
+# Period, in seconds, of the checks of the processes launched by run
+_POLL = 0.1
+
+
+class MPIBackend:
+    """
+    The processes are launched by ``mpirun`` and communicate with MPI.
+    """
+    name = MPI_BACKEND
+
+    def __init__(self):
+        # mpi4py initializes MPI when it is imported: only this backend imports it
+        from mpi4py import MPI  # pylint: disable=import-outside-toplevel
+        self.__mpi = MPI
+        self.comm = MPI.COMM_WORLD  # pylint: disable=c-extension-no-member
+
+    def wtime(self) -> float:
+        """
+        :return: the current time as a floating point number.
+        """
+        return self.__mpi.Wtime()
+
+    @staticmethod
+    def collective_op(binary_op: Callable) -> Any:
+        """
+        :param binary_op: an associative function of two arguments
+        :return: the operation to give to the reductions and scans of the communicator
+        """
+        return operators.collective_op(binary_op)
+
+    def write_ordered(self, filename: str, data: bytes, offset: int, total: int) -> None:
+        """
+        Collective: write the local data at the given position of a file, with MPI-IO.
+
+        :param filename: the name of the file (the same on all processors)
+        :param data: the local data
+        :param offset: the position of the local data in the file
+        :param total: the size of the file
+        """
+        mpi = self.__mpi
+        mode = mpi.MODE_WRONLY | mpi.MODE_CREATE
+        file = mpi.File.Open(self.comm, filename, mode)
+        try:
+            file.Set_size(total)
+            file.Write_at_all(offset, data)
+        finally:
+            file.Close()
+
+
+class SharedComm:
+    """
+    A communicator between processes of the local machine.
+
+    Each process reads the messages sent to it from its own queue. The messages
+    received while waiting for another one are kept until they are asked for.
+    A message sent by ``ssend`` is acknowledged by the receiver when it is received.
+    The buffers of ``Allgatherv`` and ``Alltoallv`` are exchanged through blocks of
+    shared memory, that are copied once, and never serialized.
+    """
+
+    def __init__(self, rank: int = 0, nprocs: int = 1):
+        """
+        :param rank: the identifier of the current process
+        :param nprocs: the number of processes. If there are several processes,
+            the communicator should be connected to their queues (see ``connect``)
+        """
+        assert 0 <= rank < nprocs
+        self.__rank = rank
+        self.__queues: Sequence = [None] * nprocs
+        self.__pending: dict = {}
+
+    def connect(self, queues: Sequence) -> None:
+        """
+        :param queues: the queue of each process
+        """
+        assert len(queues) == len(self.__queues)
+        self.__queues = queues
+
+    def Get_rank(self) -> int:  # pylint: disable=invalid-name
+        """
+        :return: the identifier of the current process.
+        """
+        return self.__rank
+
+    def Get_size(self) -> int:  # pylint: disable=invalid-name
+        """
+        :return: the number of processes.
+        """
+        return len(self.__queues)
+
+    def send(self, obj: Any, dest: int, tag: int = 0) -> None:
+        """
+        Send an object to a process.
+
+        :param obj: the object to send
+        :param dest: the identifier of the receiver
+        :param tag: the tag of the message
+        """
+        self.__put(obj, dest, tag, False)
+
+    def ssend(self, obj: Any, dest: int, tag: int = 0) -> None:
+        """
+        Send an object to a process, and wait until the process receives it.
+
+        :param obj: the object to send
+        :param dest: the identifier of the receiver
+        :param tag: the tag of the message
+        """
+        if dest == self.__rank:
+            self.send(obj, dest, tag)
+        else:
+            self.__put(obj, dest, tag, True)
+            self.recv(source=dest, tag=_TAG_ACK)
+
+    def __put(self, obj: Any, dest: int, tag: int, synchronous: bool) -> None:
+        if dest == self.__rank:
+            self.__pending.setdefault((dest, tag), []).append((obj, synchronous))
+        else:
+            self.__queues[dest].put((self.__rank, tag, obj, synchronous))
+
+    def recv(self, buf: Any = None, source: int = 0, tag: int = 0) -> Any:
+        """
+        Receive an object from a process.
+
+        :param buf: unused, for compatibility with mpi4py
+        :param source: the identifier of the sender
+        :param tag: the tag of the message
+        :return: the first object sent by the source with the tag, not received yet
+        """
+        del buf
+        key = (source, tag)
+        while not self.__pending.get(key):
+            (sender, sender_tag, obj, synchronous) = self.__queues[self.__rank].get()
+            self.__pending.setdefault((sender, sender_tag), []).append((obj, synchronous))
+        (obj, synchronous) = self.__pending[key].pop(0)
+        if synchronous:
+            self.send(None, source, _TAG_ACK)
+        return obj
+
+    def __others(self) -> List[int]:
+        return [pid for pid in range(self.Get_size()) if pid != self.__rank]
+
+    def bcast(self, obj: Any, root: int = 0) -> Any:
+        """
+        Collective: broadcast an object from the root.
+        """
+        if self.__rank != root:
+            return self.recv(source=root, tag=_TAG_COLLECTIVE)
+        for pid in self.__others():
+            self.send(obj, pid, _TAG_COLLECTIVE)
+        return obj
+
+    def scatter(self, objs: Optional[Sequence], root: int = 0) -> Any:
+        """
+        Collective: send ``objs[pid]`` from the root to each process ``pid``.
+        """
+        if self.__rank != root:
+            return self.recv(source=root, tag=_TAG_COLLECTIVE)
+        for pid in self.__others():
+            self.send(objs[pid], pid, _TAG_COLLECTIVE)
+        return objs[root]
+
+    def gather(self, obj: Any, root: int = 0) -> Optional[List]:
+        """
+        Collective: gather the objects of all processes on the root (None on the others).
+        """
+        if self.__rank != root:
+            self.send(obj, root, _TAG_COLLECTIVE)
+            return None
+        return [obj if pid == root else self.recv(source=pid, tag=_TAG_COLLECTIVE)
+                for pid in range(self.Get_size())]
+
+    def alltoall(self, objs: Sequence) -> List:
+        """
+        Collective: send ``objs[pid]`` to each process ``pid``.
+        """
+        for pid in self.__others():
+            self.send(objs[pid], pid, _TAG_COLLECTIVE)
+        return [objs[pid] if pid == self.__rank else self.recv(source=pid, tag=_TAG_COLLECTIVE)
+                for pid in range(self.Get_size())]
+
+    def allgather(self, obj: Any) -> List:
+        """
+        Collective: gather the objects of all processes on all processes.
+        """
+        return self.alltoall([obj] * self.Get_size())
+
+    def allreduce(self, obj: Any, op: Callable = operator.add) -> Any:
+        # pylint: disable=invalid-name
+        """
+        Collective: combine the objects of all processes, in the order of their identifiers.
+        """
+        return functools.reduce(op, self.allgather(obj))
+
+    def exscan(self, obj: Any, op: Callable = operator.add) -> Any:
+        # pylint: disable=invalid-name
+        """
+        Collective: combine the objects of the processes with a smaller identifier
+        (None on process 0).
+        """
+        objs = self.allgather(obj)
+        return None if self.__rank == 0 else functools.reduce(op, objs[:self.__rank])
+
+    def barrier(self) -> None:
+        """
+        Collective: wait for all processes.
+        """
+        self.allgather(None)
+
+    def Allgatherv(self, sendbuf, recvbuf) -> None:  # pylint: disable=invalid-name
+        """
+        Collective: gather the arrays of all processes on all processes.
+
+        :param sendbuf: the local array
+        :param recvbuf: a pair: the array receiving the concatenation of the
+            arrays of all processes, and their lengths
+        """
+        (recv, counts) = recvbuf
+        with _Block(numpy.asarray(sendbuf, dtype=recv.dtype)) as block:
+            names = self.allgather(block.name)
+            position = 0
+            for (pid, count) in enumerate(counts):
+                block.read(names[pid], 0, recv[position:position + count])
+                position += count
+            # The blocks of the other processes are read before they are released
+            self.barrier()
+
+    def Alltoallv(self, sendbuf, recvbuf) -> None:  # pylint: disable=invalid-name
+        """
+        Collective: total exchange of arrays.
+
+        :param sendbuf: a pair: the concatenation of the arrays to send to each process,
+            and their lengths
+        :param recvbuf: a pair: the array receiving the concatenation of the
+            arrays received from each process, and their lengths
+        """
+        (send, send_counts) = sendbuf
+        (recv, recv_counts) = recvbuf
+        with _Block(numpy.asarray(send, dtype=recv.dtype)) as block:
+            starts = [0]
+            for count in send_counts[:-1]:
+                starts.append(starts[-1] + count)
+            parts = self.alltoall([(block.name, start) for start in starts])
+            position = 0
+            for (pid, count) in enumerate(recv_counts):
+                (name, start) = parts[pid]
+                block.read(name, start, recv[position:position + count])
+                position += count
+            self.barrier()
+
+
+class _Block:
+    """A block of shared memory containing a copy of a local array, released on exit"""
+
+    def __init__(self, array):
+        self.__array = array
+        self.__memory = None
+        self.name = None
+
+    def __enter__(self):
+        if self.__array.nbytes > 0:
+            self.__memory = shared_memory.SharedMemory(create=True, size=self.__array.nbytes)
+            self.name = self.__memory.name
+            view = numpy.ndarray(self.__array.shape, dtype=self.__array.dtype,
+                                 buffer=self.__memory.buf)
+            view[:] = self.__array
+            del view
+        return self
+
+    def __exit__(self, *_):
+        if self.__memory is not None:
+            self.__memory.close()
+            self.__memory.unlink()
+
+    def read(self, name: Optional[str], start: int, out) -> None:
+        """
+        Copy a part of a block into an array.
+
+        :param name: the name of the block, the current one if it is ours
+        :param start: the position of the part in the block
+        :param out: the array receiving the part
+        """
+        if len(out) == 0:
+            return
+        if name == self.name:
+            out[:] = self.__array[start:start + len(out)]
+            return
+        memory = shared_memory.SharedMemory(name=name)
+        try:
+            view = numpy.ndarray((start + len(out),), dtype=out.dtype, buffer=memory.buf)
+            out[:] = view[start:]
+            del view
+        finally:
+            memory.close()
+
+
+class SharedBackend:
+    """
+    The processes run on the local machine, and communicate through queues and shared memory.
+    """
+    name = SHARED_BACKEND
+
+    def __init__(self, comm: Optional[SharedComm] = None):
+        """
+        :param comm: the communicator of the current process (by default, a single process)
+        """
+        self.comm = SharedComm() if comm is None else comm
+
+    @staticmethod
+    def wtime() -> float:
+        """
+        :return: the current time as a floating point number.
+        """
+        return time.perf_counter()
+
+    @staticmethod
+    def collective_op(binary_op: Callable) -> Callable:
+        """
+        :param binary_op: an associative function of two arguments
+        :return: the operation to give to the reductions and scans of the communicator
+        """
+        return binary_op
+
+    def write_ordered(self, filename: str, data: bytes, offset: int, total: int) -> None:
+        """
+        Collective: write the local data at the given position of a file.
+
+        :param filename: the name of the file (the same on all processors)
+        :param data: the local data
+        :param offset: the position of the local data in the file
+        :param total: the size of the file
+        """
+        if self.comm.Get_rank() == 0:
+            with open(filename, 'wb') as file:
+                file.truncate(total)
+        self.comm.barrier()
+        with open(filename, 'r+b') as file:
+            file.seek(offset)
+            file.write(data)
+        self.comm.barrier()
+
+
+def _from_environment():
+    name = os.environ.get(ENVIRONMENT_VARIABLE)
+    if name is None:
+        name = MPI_BACKEND if importlib.util.find_spec('mpi4py') else SHARED_BACKEND
+    if name == MPI_BACKEND:
+        return MPIBackend()
+    if name == SHARED_BACKEND:
+        rank = int(os.environ.get(_RANK_VARIABLE, 0))
+        nprocs = int(os.environ.get(_NPROCS_VARIABLE, 1))
+        return SharedBackend(SharedComm(rank, nprocs))
+    raise ValueError(f"Unknown backend {name!r}: {ENVIRONMENT_VARIABLE} should be "
+                     f"{MPI_BACKEND!r} or {SHARED_BACKEND!r}")
+
+
+def current():
+    """
+    :return: the backend of the current process. It is chosen the first time
+        this function is called.
+    """
+    if _STATE['backend'] is None:
+        _STATE['backend'] = _from_environment()
+    return _STATE['backend']
+
+
+def select(name: str) -> None:
+    """
+    Choose the backend of the current process, instead of the environment variable.
+
+    :param name: ``MPI_BACKEND`` or ``SHARED_BACKEND`` (a single process)
+    """
+    assert 'pyske.core.support.parallel' not in sys.modules, \
+        "The backend should be selected before pyske.core.support.parallel is imported"
+    os.environ[ENVIRONMENT_VARIABLE] = name
+    _STATE['backend'] = _from_environment()
+
+
+class _RemoteTraceback(Exception):
+    """
+    The traceback of an exception raised in a process launched by ``run``,
+    given as the cause of the exception raised again by ``run``.
+    """
+
+    def __init__(self, text: str):
+        super().__init__(text)
+        self.text = text
+
+    def __str__(self) -> str:
+        return self.text
+
+
+def _picklable(error: BaseException) -> BaseException:
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:  # pylint: disable=broad-except
+        return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+def _worker(pid: int, queues: list, results, main: Callable, args: tuple) -> None:
+    # The backend is given by the environment of the process
+    current().comm.connect(queues)
+    try:
+        results.put((pid, True, main(*args)))
+    except BaseException as error:  # pylint: disable=broad-except
+        # The traceback of the exception is lost when it is pickled: it is sent as text
+        results.put((pid, False, (_picklable(error), traceback.format_exc())))
+
+
+def run(main: Callable, nprocs: int, *args) -> List:
+    """
+    Run a function on processes of the local machine, with the shared backend.
+
+    The processes are started by the ``spawn`` method of ``multiprocessing``:
+    the function and its arguments must be picklable, and the main module of
+    a program calling ``run`` should only call it under ``if __name__ == '__main__':``.
+    If the function raises an exception in a process, the other processes are
+    terminated and the exception is raised, caused by its traceback in the process.
+
+    :param main: the function, that each process calls with the arguments
+    :param nprocs: the number of processes
+    :param args: the arguments of the function
+    :return: the list of the results of the function in each process
+    """
+    assert nprocs > 0
+    context = multiprocessing.get_context('spawn')
+    queues = [context.Queue() for _ in range(nprocs)]
+    results = context.Queue()
+    processes = [context.Process(target=_worker, args=(pid, queues, results, main, args))
+                 for pid in range(nprocs)]
+    saved = {name: os.environ.get(name)
+             for name in [ENVIRONMENT_VARIABLE, _RANK_VARIABLE, _NPROCS_VARIABLE]}
+    try:
+        os.environ[ENVIRONMENT_VARIABLE] = SHARED_BACKEND
+        os.environ[_NPROCS_VARIABLE] = str(nprocs)
+        for (pid, process) in enumerate(processes):
+            os.environ[_RANK_VARIABLE] = str(pid)
+            process.start()
+    finally:
+        for (name, value) in saved.items():
+            if value is None:
+                del os.environ[name]
+            else:
+                os.environ[name] = value
+    res: List = [None] * nprocs
+    remaining = nprocs
+    try:
+        while remaining > 0:
+            try:
+                (pid, success, value) = results.get(timeout=_POLL)
+            except queue.Empty:
+                for (pid, process) in enumerate(processes):
+                    if process.exitcode not in (None, 0):
+                        raise RuntimeError(f"Process {pid} exited with code {process.exitcode}")
+                continue
+            if not success:
+                (error, text) = value
+                raise error from _RemoteTraceback(f"\n\nTraceback of process {pid}:\n{text}")
+            res[pid] = value
+            remaining -= 1
+    finally:
+        for process in processes:
+            if remaining > 0:
+                process.terminate()
+            process.join()
+    return res
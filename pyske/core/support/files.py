@@ -0,0 +1,80 @@
+"""
+Reading parts of files, for parallel readers
+
+A text file is split in byte ranges: a processor reads the lines that start
+in its range, so that each line is read by exactly one processor.
+A binary file of fixed-size records is split in ranges of records.
+"""
+import os
+import struct
+from typing import List, Tuple
+
+__all__ = ['byte_range', 'read_lines', 'count_records', 'read_records']
+
+
+def byte_range(size: int, pid: int, nprocs: int) -> Tuple[int, int]:
+    """
+    :param size: the size of a file, in bytes
+    :param pid: a process identifier (0 <= pid < nprocs)
+    :param nprocs: the number of processors
+    :return: the start and stop positions of the part of the file of processor pid.
+    """
+    assert 0 <= pid < nprocs
+    return size * pid // nprocs, size * (pid + 1) // nprocs
+
+
+def read_lines(filename: str, start: int, stop: int, encoding: str = 'utf-8') -> List[str]:
+    """
+    Read the lines of a text file that start between two positions.
+
+    :param filename: the name of the file
+    :param start: a position in the file
+    :param stop: a position in the file
+    :param encoding: the encoding of the file
+    :return: the lines, without their end of line characters.
+    """
+    res = []
+    with open(filename, 'rb') as file:
+        if start > 0:
+            # The line containing start belongs to the previous part,
+            # unless the previous character ends a line
+            file.seek(start - 1)
+            file.readline()
+        position = file.tell()
+        while position < stop:
+            line = file.readline()
+            if not line:
+                break
+            position += len(line)
+            res.append(line.decode(encoding).rstrip('\r\n'))
+    return res
+
+
+def count_records(filename: str, fmt: str) -> int:
+    """
+    :param filename: the name of a binary file of records
+    :param fmt: the format of a record (see the ``struct`` module), for instance ``'<d'``
+    :return: the number of records of the file.
+    """
+    return os.path.getsize(filename) // struct.calcsize(fmt)
+
+
+def read_records(filename: str, fmt: str, first: int, count: int) -> list:
+    """
+    Read consecutive records of a binary file.
+
+    :param filename: the name of the file
+    :param fmt: the format of a record (see the ``struct`` module)
+    :param first: the index of the first record to read
+    :param count: the number of records to read
+    :return: the records; a record with a single field is replaced by this field.
+    """
+    record = struct.Struct(fmt)
+    with open(filename, 'rb') as file:
+        file.seek(first * record.size)
+        data = file.read(count * record.size)
+    assert len(data) == count * record.size, "the file has less records than expected"
+    records = record.iter_unpack(data)
+    if len(record.unpack(bytes(record.size))) == 1:
+        return [fields[0] for fields in records]
+    return list(records)
@@ -0,0 +1,43 @@
+"""
+Launch a PySke program on processes of the local machine, with the shared backend.
+
+Usage::
+
+    python -m pyske.core.support.launch -n 4 program.py [arguments]
+
+Each process runs the program as its main module, as ``mpirun`` would do with
+the MPI backend.
+"""
+import argparse
+import os
+import runpy
+import sys
+from typing import List
+
+from pyske.core.support import backend
+
+__all__ = ['main']
+
+
+def _run_program(program: str, arguments: List[str]) -> None:
+    sys.argv = [program] + arguments
+    runpy.run_path(program, run_name='__main__')
+
+
+def main() -> None:
+    """
+    Parse the command line, and run the program on the given number of processes.
+    """
+    parser = argparse.ArgumentParser(prog='python -m pyske.core.support.launch',
+                                     description='Run a PySke program on local processes')
+    parser.add_argument('-n', '--nprocs', type=int, default=os.cpu_count() or 1,
+                        help='the number of processes (by default, the number of processors)')
+    parser.add_argument('program', help='the Python file of the program')
+    parser.add_argument('arguments', nargs=argparse.REMAINDER,
+                        help='the arguments of the program')
+    args = parser.parse_args()
+    backend.run(_run_program, args.nprocs, args.program, args.arguments)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Internal module: classification of the content of sequences
+
+Sequences of numbers of the same kind are stored in NumPy arrays by ``AList``,
+and communicated as buffers by the collectives of ``pyske.core.support.parallel``.
+"""
+__all__ = ['EMPTY', 'INT', 'FLOAT', 'OTHER', 'numeric_kind']
+
+from typing import Sequence
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# The kinds of content of a sequence
+EMPTY, INT, FLOAT, OTHER = 0, 1, 2, 3
+
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def numeric_kind(values: Sequence) -> int:
+    """
+    Classify the content of a local sequence.
+
+    :param values: a sequence
+    :return: ``EMPTY`` if the sequence is empty, ``INT`` if it only contains
+        integers fitting in 64 bits, ``FLOAT`` if it only contains floats,
+        and ``OTHER`` otherwise.
+    """
+    if numpy is None:
+        return OTHER
+    if hasattr(values, '__array__'):
+        values = numpy.asarray(values)
+        if values.size == 0:
+            return EMPTY
+        if values.dtype.kind == 'i' and values.dtype.itemsize <= 8:
+            return INT
+        if values.dtype.kind == 'u' and values.dtype.itemsize < 8:
+            return INT
+        if values.dtype == numpy.uint64 and values.max() <= _INT64_MAX:
+            return INT
+        if values.dtype == numpy.float64:
+            return FLOAT
+        return OTHER
+    if len(values) == 0:
+        return EMPTY
+    # The types are collected without a Python loop
+    types = set(map(type, values))
+    if types == {float}:
+        return FLOAT
+    if types == {int} and _INT64_MIN <= min(values) and max(values) <= _INT64_MAX:
+        return INT
+    return OTHER
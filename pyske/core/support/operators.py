@@ -0,0 +1,145 @@
+"""
+Internal module: registry of operators having a native implementation.
+
+A Python function registered here is known to behave, on numbers, as a NumPy
+universal function, or as a predefined MPI reduction operation.
+Array-backed data structures use the registry to replace one Python call per
+element by a single call to the universal function, and collective
+communications use it to perform reductions with MPI operations.
+"""
+__all__ = ['register_unary', 'register_binary', 'register_mpi',
+           'unary_ufunc', 'binary_ufunc', 'mpi_op', 'collective_op']
+
+import builtins
+import operator
+from typing import Callable, Optional, Union
+
+from pyske.core.util import fun
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+_UNARY: dict = {}
+_BINARY: dict = {}
+_MPI: dict = {}
+# The predefined MPI operations are registered the first time they are needed:
+# importing mpi4py initializes MPI, that the shared backend does not use
+_MPI_PREDEFINED = [(operator.add, 'SUM'), (fun.add, 'SUM'), (operator.mul, 'PROD'),
+                   (builtins.max, 'MAX'), (builtins.min, 'MIN'),
+                   (operator.and_, 'BAND'), (operator.or_, 'BOR'), (operator.xor, 'BXOR')]
+
+
+def register_unary(unary_op: Callable, ufunc) -> None:
+    """
+    Register the vectorized version of a unary function.
+
+    :param unary_op: a Python function of one argument
+    :param ufunc: a NumPy universal function with one input
+    """
+    _UNARY[unary_op] = ufunc
+
+
+def register_binary(binary_op: Callable, ufunc) -> None:
+    """
+    Register the vectorized version of a binary function.
+
+    :param binary_op: a Python function of two arguments
+    :param ufunc: a NumPy universal function with two inputs
+    """
+    _BINARY[binary_op] = ufunc
+
+
+def register_mpi(binary_op: Callable, mpi_operation: 'MPI.Op') -> None:
+    """
+    Register the MPI reduction operation corresponding to a binary function.
+
+    :param binary_op: an associative Python function of two arguments
+    :param mpi_operation: an MPI operation
+    """
+    _MPI[binary_op] = mpi_operation
+
+
+def _lookup(table: dict, function: Callable, nin: int):
+    if numpy is None:
+        return None
+    if isinstance(function, numpy.ufunc):
+        return function if function.nin == nin else None
+    try:
+        return table.get(function)
+    except TypeError:  # unhashable callable
+        return None
+
+
+def unary_ufunc(unary_op: Callable) -> Optional[Callable]:
+    """
+    :param unary_op: a function of one argument
+    :return: its vectorized version if any, None otherwise
+    """
+    return _lookup(_UNARY, unary_op, 1)
+
+
+def binary_ufunc(binary_op: Callable) -> Optional[Callable]:
+    """
+    :param binary_op: a function of two arguments
+    :return: its vectorized version if any, None otherwise.
+        The result is a NumPy universal function, that also provides
+        ``reduce`` and ``accumulate``.
+    """
+    return _lookup(_BINARY, binary_op, 2)
+
+
+def _register_predefined_mpi() -> None:
+    if _MPI_PREDEFINED:
+        from mpi4py import MPI  # pylint: disable=import-outside-toplevel
+        for (binary_op, name) in _MPI_PREDEFINED:
+            _MPI.setdefault(binary_op, getattr(MPI, name))
+        _MPI_PREDEFINED.clear()
+
+
+def mpi_op(binary_op: Callable) -> 'Optional[MPI.Op]':
+    """
+    :param binary_op: a function of two arguments
+    :return: the corresponding predefined MPI operation if any, None otherwise
+    """
+    _register_predefined_mpi()
+    try:
+        return _MPI.get(binary_op)
+    except TypeError:  # unhashable callable
+        return None
+
+
+def collective_op(binary_op: Callable) -> 'Union[MPI.Op, Callable]':
+    """
+    Return the operation to give to a reduction or scan collective.
+
+    Both predefined MPI operations and Python functions are combined by
+    mpi4py along a tree, in the order of the processor identifiers.
+
+    :param binary_op: an associative function of two arguments
+    :return: the corresponding MPI operation if any, ``binary_op`` otherwise
+    """
+    mpi_operation = mpi_op(binary_op)
+    return binary_op if mpi_operation is None else mpi_operation
+
+
+if numpy is not None:
+    for _op, _ufunc in [(operator.add, numpy.add), (fun.add, numpy.add),
+                        (operator.sub, numpy.subtract),
+                        (operator.mul, numpy.multiply),
+                        (operator.truediv, numpy.true_divide),
+                        (operator.floordiv, numpy.floor_divide),
+                        (operator.mod, numpy.mod),
+                        (operator.pow, numpy.power),
+                        (builtins.max, numpy.maximum),
+                        (builtins.min, numpy.minimum),
+                        (operator.and_, numpy.bitwise_and),
+                        (operator.or_, numpy.bitwise_or),
+                        (operator.xor, numpy.bitwise_xor)]:
+        register_binary(_op, _ufunc)
+    for _op, _ufunc in [(operator.neg, numpy.negative),
+                        (operator.pos, numpy.positive),
+                        (builtins.abs, numpy.absolute),
+                        (operator.abs, numpy.absolute)]:
+        register_unary(_op, _ufunc)
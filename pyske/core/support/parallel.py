@@ -1,14 +1,25 @@
 """
 Internal module providing basic parallel functions
+
+The communications are performed by the backend of the current process
+(see ``pyske.core.support.backend``): MPI, or local processes sharing memory.
 """
-__all__ = ['COMM', 'PID', 'NPROCS', 'local_size', 'scan']
+__all__ = ['BACKEND', 'COMM', 'PID', 'NPROCS', 'local_size', 'wtime', 'scan', 'reduce',
+           'numeric_kind', 'alltoallv', 'allgatherv', 'write_ordered']
+
+from typing import Callable, TypeVar, Tuple, Sequence, List, Optional
+from pyske.core.support import backend
+from pyske.core.support.numeric import numeric_kind, EMPTY, INT, FLOAT, OTHER
 
-from typing import Callable, TypeVar, Tuple
-from mpi4py import MPI
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
 
 T = TypeVar('T')    # pylint: disable=invalid-name
 
-COMM = MPI.COMM_WORLD  # pylint: disable=c-extension-no-member
+BACKEND = backend.current()
+COMM = BACKEND.comm
 PID = COMM.Get_rank()
 NPROCS = COMM.Get_size()
 
@@ -25,19 +36,145 @@ def local_size(pid: int, size: int) -> int:
     return int(size / NPROCS) + (1 if pid < size % NPROCS else 0)
 
 
+def wtime() -> float:
+    """
+    :return: the current time as a floating point number.
+    """
+    return BACKEND.wtime()
+
+
 def scan(binary_op: Callable[[T, T], T], value: T) -> Tuple[T, T]:
     """
-    :param binary_op: a binary operation
+    Collective: exclusive prefix sum and reduction.
+
+    With the MPI backend, operations registered in ``pyske.core.support.operators``
+    are performed with the corresponding MPI operation, other operations along the
+    same tree-shaped communication pattern, in O(log NPROCS) steps.
+
+    :param binary_op: a binary associative operation
+    :param value: each processor possess such a value
+    :return: a pair: the combination of the values of the processors with
+        a smaller identifier (the value of processor 0 at processor 0),
+        and the combination of the values of all the processors.
+    """
+    operation = BACKEND.collective_op(binary_op)
+    pre = COMM.exscan(value, op=operation)
+    if PID == 0:
+        pre = value
+    return pre, COMM.allreduce(value, op=operation)
+
+
+def reduce(binary_op: Callable[[T, T], T], value: T) -> T:
+    """
+    Collective: reduction of the values of all the processors.
+
+    :param binary_op: a binary associative operation
     :param value: each processor possess such a value
-    :return: prefix sum
-    """
-    values = COMM.alltoall([value for _ in range(0, NPROCS)])
-    pre = values[0]
-    for i in range(1, PID):
-        pre = binary_op(pre, values[i])
-    res = values[PID]
-    for i in range(PID + 1, NPROCS):
-        res = binary_op(res, values[i])
-    if PID != 0:
-        return pre, binary_op(pre, res)
-    return pre, res
+    :return: the combination of the values of all the processors,
+        in the order of their identifiers.
+    """
+    return COMM.allreduce(value, op=BACKEND.collective_op(binary_op))
+
+
+def _common_dtype(kind: int) -> Optional['numpy.dtype']:
+    """
+    Collective: agree on a NumPy type able to represent the data of all processors.
+
+    :param kind: the kind of the local data (see ``numeric_kind``)
+    :return: a NumPy type if all the non-empty local data have the same numeric kind,
+        None otherwise.
+    """
+    if numpy is None:
+        return None
+    kinds = {kind} if NPROCS == 1 else set(COMM.allgather(kind))
+    kinds.discard(EMPTY)
+    if kinds == {INT}:
+        return numpy.dtype(numpy.int64)
+    if kinds == {FLOAT}:
+        return numpy.dtype(numpy.float64)
+    return None
+
+
+def _is_array(values: Sequence) -> bool:
+    return numpy is not None and hasattr(values, '__array__')
+
+
+def alltoallv(messages: List[Sequence[T]]) -> List[T]:
+    """
+    Collective: total exchange of sequences.
+
+    When all the exchanged values are numbers of the same kind, the
+    exchange is performed on contiguous buffers without serialization.
+
+    :param messages: ``messages[pid]`` is the sequence to send to processor ``pid``
+    :return: the concatenation of the sequences received from all the processors,
+        ordered by processor identifier: a NumPy array if the messages are arrays
+        (or ``AList``), a list otherwise.
+    """
+    assert len(messages) == NPROCS
+    as_array = all(_is_array(msg) for msg in messages)
+    kinds = {numeric_kind(msg) for msg in messages}
+    kinds.discard(EMPTY)
+    kind = EMPTY if not kinds else kinds.pop() if len(kinds) == 1 else OTHER
+    dtype = _common_dtype(kind)
+    if dtype is None:
+        received = COMM.alltoall(messages)
+        if as_array:
+            return numpy.concatenate([numpy.asarray(msg) for msg in received])
+        return [value for msg in received for value in msg]
+    send_counts = [len(msg) for msg in messages]
+    recv_counts = COMM.alltoall(send_counts)
+    send_buf = numpy.empty(sum(send_counts), dtype=dtype)
+    position = 0
+    for msg in messages:
+        send_buf[position:position + len(msg)] = msg
+        position += len(msg)
+    recv_buf = numpy.empty(sum(recv_counts), dtype=dtype)
+    COMM.Alltoallv([send_buf, send_counts], [recv_buf, recv_counts])
+    return recv_buf if as_array else recv_buf.tolist()
+
+
+def allgatherv(values: Sequence[T], counts: Optional[List[int]] = None) -> List[T]:
+    """
+    Collective: gather the local sequences on all processors.
+
+    When all the gathered values are numbers of the same kind, the
+    communication is performed on contiguous buffers without serialization.
+
+    :param values: the local sequence
+    :param counts: (optional) the lengths of the local sequences of all processors
+    :return: the concatenation of the local sequences of all processors,
+        ordered by processor identifier: a NumPy array if the local sequence is
+        an array (or an ``AList``), a list otherwise.
+    """
+    as_array = _is_array(values)
+    dtype = _common_dtype(numeric_kind(values))
+    if dtype is None:
+        gathered = COMM.allgather(values)
+        if as_array:
+            return numpy.concatenate([numpy.asarray(local) for local in gathered])
+        return [value for local in gathered for value in local]
+    if counts is None:
+        counts = COMM.allgather(len(values))
+    send_buf = numpy.asarray(values, dtype=dtype)
+    recv_buf = numpy.empty(sum(counts), dtype=dtype)
+    COMM.Allgatherv(send_buf, [recv_buf, counts])
+    return recv_buf if as_array else recv_buf.tolist()
+
+
+def write_ordered(filename: str, data: bytes) -> None:
+    """
+    Collective: write the local data of all processors in a file, ordered by processor identifier.
+
+    The position of the local data in the file is the exclusive prefix sum
+    of the local sizes. Each processor writes its own part (with MPI-IO for the
+    MPI backend), and the data are never gathered.
+
+    :param filename: the name of the file (the same on all processors)
+    :param data: the local data
+    """
+    offset = COMM.exscan(len(data))
+    if PID == 0:
+        offset = 0
+    total = COMM.allreduce(len(data))
+    BACKEND.write_ordered(filename, data, offset, total)
@@ -1,41 +1,196 @@
-from pyske.core.util import fun
+"""
+Partition of linearized trees on processors
+
+The segments of a linearized tree are assigned to processors as contiguous
+blocks. Each segment has a cost (by default, its length); the blocks are
+chosen to minimise the maximum cost of a processor (linear partition).
+"""
+import time
+from bisect import bisect_right
+
 from pyske.core.list.slist import SList
 
+__all__ = ['distribute_tree', 'segment_costs', 'measure', 'linear_partition', 'imbalance',
+           'index_segments']
 
-def distribute_tree(lt, n):
-    total_size = lt.map(fun.one, fun.one).reduce(fun.add, fun.idt, fun.add, fun.add, fun.add)
-    avg_elements = int(total_size / n)
-    # Definition of global_index and distribution
-    global_index = SList([])
-    distribution = SList.init(lambda x: 0, n)
-    current_pid = 0
-    nb_segs = 1
-    seg = lt[0]
-    seg_length = seg.length()
-    acc_size = seg_length
-    global_index.append((0, seg_length))
-    for seg_i in range(1, lt.length()):
-        seg = lt[seg_i]
-        curr_seg_length = seg.length()
-        # We need to give all the rest to the last processor
-        if seg_i == lt.length() - 1:
-            distribution[current_pid] = (nb_segs + 1)
-            global_index.append((acc_size, curr_seg_length))
-        else:
-            if current_pid == n - 1:
-                nb_segs += 1
-                global_index.append((acc_size, curr_seg_length))
-                acc_size = acc_size + curr_seg_length
+_BISECTION_STEPS = 64
+
+
+def segment_costs(lt, costs=None):
+    """Get the cost of each segment of a linearized tree
+
+    Parameters
+    ----------
+    lt : :obj:`LTree`
+        A linearized tree
+    costs : list or callable, optional
+        The cost of each segment, or a function from a segment to its cost.
+        By default, the cost of a segment is its length
+    """
+    if costs is None:
+        return [seg.length() for seg in lt]
+    if callable(costs):
+        return [costs(seg) for seg in lt]
+    assert len(costs) == lt.length()
+    return list(costs)
+
+
+def measure(function, repeat=1):
+    """Get a cost function measuring the execution time of a function on a segment
+
+    Parameters
+    ----------
+    function : callable
+        A function applied to a segment, for instance ``lambda seg: seg.map_local(f, g)``
+    repeat : int, optional
+        The number of executions (the minimum time is kept). By default, 1
+    """
+    def cost(seg):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function(seg)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+    return cost
+
+
+def _parts(prefix, n, bound):
+    """Get the ends of the blocks of a partition of maximum cost bound, or None
+
+    Each block is as large as possible, but leaves at least one segment
+    to each of the following processors (if there are enough segments).
+    """
+    nb_costs = len(prefix) - 1
+    ends = []
+    start = 0
+    for pid in range(n):
+        if start == nb_costs:
+            ends.append(start)
+            continue
+        end = bisect_right(prefix, prefix[start] + bound, lo=start) - 1
+        end = min(end, max(start + 1, nb_costs - (n - pid - 1)))
+        if prefix[end] - prefix[start] > bound:
+            return None
+        ends.append(end)
+        start = end
+    return ends if start == nb_costs else None
+
+
+def linear_partition(costs, n):
+    """Split a sequence of costs in n contiguous blocks minimising the maximum cost of a block
+
+    The optimal maximum cost is found by a binary search: for a given bound,
+    the blocks are built greedily, each end being found by a binary search
+    in the prefix sums of the costs. The search is exact for integer costs.
+    If there are at least n costs, no block is empty.
+
+    Parameters
+    ----------
+    costs : list
+        The non negative cost of each segment
+    n : int
+        The number of blocks (processors)
+
+    Returns
+    -------
+    The number of segments of each block
+    """
+    assert n > 0
+    prefix = [0]
+    for cost in costs:
+        assert cost >= 0
+        prefix.append(prefix[-1] + cost)
+    if not costs:
+        return SList([0] * n)
+    low = max(costs)
+    high = prefix[-1]
+    if all(isinstance(cost, int) for cost in costs):
+        while low < high:
+            middle = (low + high) // 2
+            if _parts(prefix, n, middle) is None:
+                low = middle + 1
+            else:
+                high = middle
+    else:
+        for _ in range(_BISECTION_STEPS):
+            middle = (low + high) / 2
+            if middle in (low, high):
+                break
+            if _parts(prefix, n, middle) is None:
+                low = middle
             else:
-                curr_seg_length = seg.length()
-                if abs(avg_elements - (acc_size + curr_seg_length)) > abs(avg_elements - acc_size):
-                    distribution[current_pid] = nb_segs
-                    global_index.append((0, curr_seg_length))
-                    acc_size = curr_seg_length
-                    nb_segs = 1
-                    current_pid += 1
-                else:
-                    nb_segs += 1
-                    global_index.append((acc_size, curr_seg_length))
-                    acc_size = acc_size + curr_seg_length
-    return distribution, global_index
+                high = middle
+    ends = _parts(prefix, n, high)
+    return SList(end - start for (start, end) in zip([0] + ends, ends))
+
+
+def imbalance(costs, distribution):
+    """Get the imbalance of a distribution: the maximum cost of a processor over the average cost
+
+    A perfectly balanced distribution has an imbalance of 1.
+
+    Parameters
+    ----------
+    costs : list
+        The cost of each segment
+    distribution : list
+        The number of segments of each processor
+    """
+    loads = []
+    start = 0
+    for nb_segs in distribution:
+        loads.append(sum(costs[start:start + nb_segs]))
+        start += nb_segs
+    total = sum(loads)
+    if total == 0:
+        return 1.0
+    return max(loads) * len(loads) / total
+
+
+def index_segments(distribution, lengths):
+    """Get the global index of distributed segments
+
+    Parameters
+    ----------
+    distribution : list
+        The number of segments of each processor
+    lengths : list
+        The length of each segment
+
+    Returns
+    -------
+    For each segment, its start in the content of its processor and its length
+    """
+    global_index = SList([])
+    i_seg = 0
+    for nb_segs in distribution:
+        start = 0
+        for length in lengths[i_seg:i_seg + nb_segs]:
+            global_index.append((start, length))
+            start += length
+        i_seg += nb_segs
+    return global_index
+
+
+def distribute_tree(lt, n, costs=None):
+    """Distribute the segments of a linearized tree on processors
+
+    Parameters
+    ----------
+    lt : :obj:`LTree`
+        A linearized tree
+    n : int
+        The number of processors
+    costs : list or callable, optional
+        The cost of each segment, or a function from a segment to its cost
+        (see ``segment_costs`` and ``measure``). By default, the length of the segments
+
+    Returns
+    -------
+    The number of segments of each processor, and for each segment its start
+    in the content of its processor and its length
+    """
+    distribution = linear_partition(segment_costs(lt, costs), n)
+    return distribution, index_segments(distribution, [seg.length() for seg in lt])
@@ -0,0 +1,335 @@
+"""
+Binary files of linearized trees
+
+A file contains, in this order:
+
+* a header: a magic string, the type code of the values, the number of
+  processors, of segments and of elements
+* the distribution (number of segments of each processor)
+* the global index (start and offset of each segment)
+* the position of the values of each segment in the value area
+* the tags of all the elements, one byte each
+* the values of all the segments
+
+Integers are stored as little-endian 64-bit integers. The values are
+stored as 64-bit integers (type code ``q``), as 64-bit floats (``d``),
+or pickled segment by segment (``O``).
+
+A reader maps the file in memory and only reads the segments it needs.
+"""
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+
+from pyske.core.support.errors import IllFormedError
+
+__all__ = ['EXT_FILE_LTB', 'Layout', 'value_code', 'common_code', 'encode', 'decode',
+           'write_segments', 'save', 'load']
+
+EXT_FILE_LTB = "ltb"
+
+_MAGIC = b"PYSKELTB"
+_HEADER = struct.Struct('<8s1s7xqqq')
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+_OBJECT_CODE = 'O'
+
+
+def _align(offset):
+    return (offset + 7) // 8 * 8
+
+
+def _int64s(values):
+    res = array('q', values)
+    if sys.byteorder == 'big':
+        res.byteswap()
+    return res.tobytes()
+
+
+def _read_int64s(buffer, offset, count):
+    res = array('q')
+    res.frombytes(buffer[offset:offset + 8 * count])
+    if sys.byteorder == 'big':
+        res.byteswap()
+    return res.tolist()
+
+
+def value_code(values):
+    """Get the type code able to store some values
+
+    Parameters
+    ----------
+    values : list
+        The values to store
+
+    Returns
+    -------
+    ``q`` if the values are 64-bit integers, ``d`` if they are floats,
+    ``O`` otherwise, and None if there is no value
+    """
+    if not values:
+        return None
+    kind = type(values[0])
+    if kind is int and all(type(val) is int for val in values) \
+            and _INT64_MIN <= min(values) and max(values) <= _INT64_MAX:
+        return 'q'
+    if kind is float and all(type(val) is float for val in values):
+        return 'd'
+    return _OBJECT_CODE
+
+
+def common_code(codes):
+    """Get a type code able to store the values of several lists, given their type codes
+
+    Returns None if all the type codes are None (there is no value)
+    """
+    codes = set(code for code in codes if code is not None)
+    if len(codes) <= 1:
+        return codes.pop() if codes else None
+    return _OBJECT_CODE
+
+
+def encode(code, values):
+    """Get the bytes representing the values of a segment
+
+    Parameters
+    ----------
+    code : str
+        The type code of the values
+    values : list
+        The values of a segment
+    """
+    if code == _OBJECT_CODE:
+        return pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+    res = array(code, values)
+    if sys.byteorder == 'big':
+        res.byteswap()
+    return res.tobytes()
+
+
+def decode(code, data):
+    """Get the values of a segment from their bytes
+
+    Parameters
+    ----------
+    code : str
+        The type code of the values
+    data : bytes-like object
+        The bytes produced by ``encode``
+    """
+    if code == _OBJECT_CODE:
+        return pickle.loads(data)
+    res = array(code)
+    res.frombytes(data)
+    if sys.byteorder == 'big':
+        res.byteswap()
+    return res.tolist()
+
+
+class Layout:
+    """The positions of the parts of a binary file
+
+    Attributes
+    ----------
+    code : str
+        The type code of the values
+    distribution : list
+        The number of segments of each processor
+    global_index : list
+        The start and offset of each segment
+    value_offsets : list
+        The position of the values of each segment in the value area, and the size of this area
+    node_offsets : list
+        The position of the first element of each segment, and the number of elements
+    tags_offset : int
+        The position of the tags in the file
+    values_offset : int
+        The position of the value area in the file
+    size : int
+        The size of the file
+
+    Methods
+    -------
+    header()
+        Get the bytes preceding the tags
+    tags_range(first, count)
+        Get the position of the tags of some segments in the file
+    values_range(first, count)
+        Get the position of the values of some segments in the file
+    read(buffer)
+        Get the layout of a binary file
+    """
+
+    def __init__(self, code, distribution, global_index, value_sizes):
+        assert len(global_index) == len(value_sizes)
+        self.code = code
+        self.distribution = list(distribution)
+        self.global_index = [tuple(index) for index in global_index]
+        self.value_offsets = [0]
+        for size in value_sizes:
+            self.value_offsets.append(self.value_offsets[-1] + size)
+        self.node_offsets = [0]
+        for (_, offset) in self.global_index:
+            self.node_offsets.append(self.node_offsets[-1] + offset)
+        nb_segs = len(self.global_index)
+        self.tags_offset = _HEADER.size + 8 * (len(self.distribution) + 3 * nb_segs + 1)
+        self.values_offset = _align(self.tags_offset + self.node_offsets[-1])
+        self.size = self.values_offset + self.value_offsets[-1]
+
+    def header(self):
+        """Get the bytes preceding the tags
+        """
+        return b"".join([
+            _HEADER.pack(_MAGIC, self.code.encode(), len(self.distribution),
+                         len(self.global_index), self.node_offsets[-1]),
+            _int64s(self.distribution),
+            _int64s([val for index in self.global_index for val in index]),
+            _int64s(self.value_offsets)])
+
+    def tags_range(self, first, count):
+        """Get the position of the tags of some segments in the file
+
+        Parameters
+        ----------
+        first : int
+            The index of the first segment
+        count : int
+            The number of segments
+        """
+        return (self.tags_offset + self.node_offsets[first],
+                self.tags_offset + self.node_offsets[first + count])
+
+    def values_range(self, first, count):
+        """Get the position of the values of some segments in the file
+
+        Parameters
+        ----------
+        first : int
+            The index of the first segment
+        count : int
+            The number of segments
+        """
+        return (self.values_offset + self.value_offsets[first],
+                self.values_offset + self.value_offsets[first + count])
+
+    @staticmethod
+    def read(buffer):
+        """Get the layout of a binary file
+
+        Parameters
+        ----------
+        buffer : bytes-like object
+            The content of the file (or at least all the bytes preceding the tags)
+
+        Raises
+        ------
+        IllFormedError
+            If the buffer does not start with a header of a binary file of linearized tree
+        """
+        if len(buffer) < _HEADER.size:
+            raise IllFormedError("Not a binary file of linearized tree")
+        (magic, code, nprocs, nb_segs, _) = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC:
+            raise IllFormedError("Not a binary file of linearized tree")
+        offset = _HEADER.size
+        distribution = _read_int64s(buffer, offset, nprocs)
+        offset += 8 * nprocs
+        flat_index = _read_int64s(buffer, offset, 2 * nb_segs)
+        offset += 16 * nb_segs
+        value_offsets = _read_int64s(buffer, offset, nb_segs + 1)
+        value_sizes = [high - low for (low, high) in zip(value_offsets, value_offsets[1:])]
+        global_index = list(zip(flat_index[0::2], flat_index[1::2]))
+        return Layout(code.decode(), distribution, global_index, value_sizes)
+
+
+def write_segments(file, layout, first, segments, blobs):
+    """Write the tags and the values of consecutive segments in an open binary file
+
+    Parameters
+    ----------
+    file : file object
+        A file opened in binary mode, with a size of at least ``layout.size``
+    layout : :obj:`Layout`
+        The layout of the file
+    first : int
+        The index of the first segment to write
+    segments : list
+        The segments to write (objects with a ``tags`` method)
+    blobs : list
+        The encoded values of the segments
+    """
+    if not segments:
+        return
+    file.seek(layout.tags_range(first, len(segments))[0])
+    for seg in segments:
+        file.write(seg.tags())
+    file.seek(layout.values_range(first, len(segments))[0])
+    for blob in blobs:
+        file.write(blob)
+
+
+def save(filename, segments, distribution, global_index):
+    """Write a binary file containing segments
+
+    Parameters
+    ----------
+    filename : str
+        The name of the file
+    segments : list
+        All the segments of the tree (objects with ``tags`` and ``values`` methods)
+    distribution : list
+        The number of segments of each processor
+    global_index : list
+        The start and offset of each segment
+    """
+    code = common_code(value_code(seg.values()) for seg in segments) or 'q'
+    blobs = [encode(code, seg.values()) for seg in segments]
+    layout = Layout(code, distribution, global_index, [len(blob) for blob in blobs])
+    with open(filename, "wb") as file:
+        file.write(layout.header())
+        file.truncate(layout.size)
+        write_segments(file, layout, 0, segments, blobs)
+
+
+def load(filename, select=None):
+    """Read some segments of a binary file
+
+    The file is mapped in memory: only the header and the selected segments are read.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the file
+    select : callable, optional
+        A function from the layout of the file to the index of the first segment to read
+        and the number of segments to read. By default, all the segments are read.
+
+    Returns
+    -------
+    The layout of the file and, for each segment read, its tags and its values
+    """
+    with open(filename, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            layout = Layout.read(buffer)
+            nb_segs = len(layout.global_index)
+            (first, count) = (0, nb_segs) if select is None else select(layout)
+            assert 0 <= first and first + count <= nb_segs
+            (tags_start, tags_stop) = layout.tags_range(first, count)
+            tags = buffer[tags_start:tags_stop]
+            if layout.code != _OBJECT_CODE:
+                # The values of consecutive segments are decoded at once
+                (values_start, values_stop) = layout.values_range(first, count)
+                values = decode(layout.code, buffer[values_start:values_stop])
+            segments = []
+            for i_seg in range(first, first + count):
+                low = layout.node_offsets[i_seg] - layout.node_offsets[first]
+                high = layout.node_offsets[i_seg + 1] - layout.node_offsets[first]
+                if layout.code == _OBJECT_CODE:
+                    (start, stop) = layout.values_range(i_seg, 1)
+                    seg_values = decode(layout.code, buffer[start:stop])
+                else:
+                    seg_values = values[low:high]
+                segments.append((bytearray(tags[low:high]), seg_values))
+    return layout, segments
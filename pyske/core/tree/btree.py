@@ -92,6 +92,68 @@ class BTree(ABC):
         pass
 
 
+def _postorder(tree, leaf_fn, node_fn):
+    """Computes a value bottom-up on a BTree, using an explicit stack
+
+    Parameters
+    ----------
+    tree : :obj:`BTree`
+        The tree to traverse
+    leaf_fn : callable
+        The function giving the value of a leaf
+    node_fn : callable
+        The function giving the value of a node, from the node and the values
+        of its left and right subtrees
+    """
+    results = []
+    stack = [(tree, False)]
+    while stack:
+        current, expanded = stack.pop()
+        if current.is_leaf():
+            results.append(leaf_fn(current))
+        elif expanded:
+            right = results.pop()
+            left = results.pop()
+            results.append(node_fn(current, left, right))
+        else:
+            stack.append((current, True))
+            stack.append((current.get_right(), False))
+            stack.append((current.get_left(), False))
+    return results.pop()
+
+
+def _postorder2(tree1, tree2, leaf_fn, node_fn):
+    """Computes a value bottom-up on two BTrees of the same shape, using an explicit stack
+
+    Parameters
+    ----------
+    tree1, tree2 : :obj:`BTree`
+        The trees to traverse
+    leaf_fn : callable
+        The function giving the value of a pair of leaves
+    node_fn : callable
+        The function giving the value of a pair of nodes, from the nodes and
+        the values of their left and right subtrees
+    """
+    results = []
+    stack = [(tree1, tree2, False)]
+    while stack:
+        current1, current2, expanded = stack.pop()
+        if current1.is_leaf():
+            assert current2.is_leaf(), "A leaf can only be zipped with another leaf"
+            results.append(leaf_fn(current1, current2))
+        elif expanded:
+            right = results.pop()
+            left = results.pop()
+            results.append(node_fn(current1, current2, left, right))
+        else:
+            assert current2.is_node(), "A node can only be zipped with another node"
+            stack.append((current1, current2, True))
+            stack.append((current1.get_right(), current2.get_right(), False))
+            stack.append((current1.get_left(), current2.get_left(), False))
+    return results.pop()
+
+
 class Leaf(BTree):
     """A class that overrides BTree used to represent a Leaf
 
@@ -390,10 +452,19 @@ class Node(BTree):
         return "node " + str(self.value) + " (" + str(self.left) + ") (" + str(self.right) + ")"
 
     def __eq__(self, other):
-        if isinstance(other, Node):
-            return (self.get_value() == other.get_value()) and \
-                   (self.get_left() == other.get_left()) and (self.get_right() == other.get_right())
-        return False
+        stack = [(self, other)]
+        while stack:
+            current, other_current = stack.pop()
+            if current.is_leaf():
+                if current != other_current:
+                    return False
+            elif not isinstance(other_current, Node) \
+                    or current.get_value() != other_current.get_value():
+                return False
+            else:
+                stack.append((current.get_right(), other_current.get_right()))
+                stack.append((current.get_left(), other_current.get_left()))
+        return True
 
     def is_node(self):
         """Indicates if the BTree is a node
@@ -439,14 +510,9 @@ class Node(BTree):
         acc: callable
             Continuation
         """
-        if tail_recursive:
-            return self.get_left()\
-               .map(kl, kn, lambda lm: self.get_right()
-                    .map(kl, kn, lambda rm: acc(Node(kn(self.get_value()), lm, rm))))
-        new_val = kn(self.get_value())
-        left = self.get_left().map(kl, kn)
-        right = self.get_right().map(kl, kn)
-        return Node(new_val, left, right)
+        res = _postorder(self, lambda leaf: Leaf(kl(leaf.get_value())),
+                         lambda node, left, right: Node(kn(node.get_value()), left, right))
+        return acc(res) if tail_recursive else res
 
     def mapt(self, kl, kn, tail_recursive=False, acc=lambda x: x):
         """Applies kl to every leaf values the current instance, and kn to every subtrees that are
@@ -463,20 +529,16 @@ class Node(BTree):
         acc: callable
             Continuation
         """
-        if tail_recursive:
-            return self.get_left()\
-               .mapt(kl, kn, lambda lm: self.get_right()
-                     .mapt(kl, kn, lambda rm: acc(Node(kn(self.get_value(), self.get_left(),
-                                                          self.get_right()), lm, rm))))
-        new_val = kn(self.get_value(), self.get_left(), self.get_right())
-        left = self.get_left().mapt(kl, kn)
-        right = self.get_right().mapt(kl, kn)
-        return Node(new_val, left, right)
+        res = _postorder(self, lambda leaf: Leaf(kl(leaf.get_value())),
+                         lambda node, left, right:
+                         Node(kn(node.get_value(), node.get_left(), node.get_right()),
+                              left, right))
+        return acc(res) if tail_recursive else res
 
     def reduce(self, k, tail_recursive=False, acc=lambda x: x):
         """Reduces a BTree into a single value using a function k
 
-        We use recursive calls of sub-reduction to make a total reduction.
+        The tree is traversed in post-order, with an explicit stack.
 
         Parameters
         ----------
@@ -487,13 +549,9 @@ class Node(BTree):
         acc: callable
             Continuation
         """
-        if tail_recursive:
-            return self.get_left()\
-                .reduce(k, lambda lm: self.get_right()
-                        .reduce(k, lambda rm: acc(k(lm, self.get_value(), rm))))
-        left = self.get_left().reduce(k)
-        right = self.get_right().reduce(k)
-        return k(left, self.get_value(), right)
+        res = _postorder(self, lambda leaf: leaf.get_value(),
+                         lambda node, left, right: k(left, node.get_value(), right))
+        return acc(res) if tail_recursive else res
 
     def uacc(self, k, tail_recursive=False, acc=lambda x: x):
         """Makes an upward accumulation of the values in the current instance using a function k
@@ -510,13 +568,11 @@ class Node(BTree):
         acc: callable
             Continuation
         """
-        if tail_recursive:
-            return self.get_left()\
-               .uacc(k, lambda lm: self.get_right()
-                     .uacc(k, lambda rm: acc(Node(k(lm.get_value(), self.get_value(),
-                                                    rm.get_value()), lm, rm))))
-        r = self.reduce(k)
-        return Node(r, self.get_left().uacc(k), self.get_right().uacc(k))
+        res = _postorder(self, lambda leaf: Leaf(leaf.get_value()),
+                         lambda node, left, right:
+                         Node(k(left.get_value(), node.get_value(), right.get_value()),
+                              left, right))
+        return acc(res) if tail_recursive else res
 
     def dacc(self, gl, gr, c, tail_recursive=False, acc=lambda x: x):
         """Makes an downward accumulation of the values in a BTree using gl, gr and c
@@ -534,14 +590,25 @@ class Node(BTree):
         acc: callable
             Continuation
         """
-        if tail_recursive:
-            return self.get_left()\
-                .dacc(gl, gr, gl(c, self.get_value()), lambda lm: self.get_right()
-                      .dacc(gl, gr, gr(c, self.get_value()), lambda rm: acc(Node(c, lm, rm))))
-        b = self.get_value()
-        left = self.get_left().dacc(gl, gr, gl(c, b))
-        right = self.get_right().dacc(gl, gr, gr(c, b))
-        return Node(c, left, right)
+        results = []
+        stack = [(self, c, False)]
+        while stack:
+            current, value, expanded = stack.pop()
+            if current.is_leaf():
+                results.append(Leaf(value))
+            elif expanded:
+                right = results.pop()
+                left = results.pop()
+                results.append(Node(value, left, right))
+            else:
+                b = current.get_value()
+                left_value = gl(value, b)
+                right_value = gr(value, b)
+                stack.append((current, value, True))
+                stack.append((current.get_right(), right_value, False))
+                stack.append((current.get_left(), left_value, False))
+        res = results.pop()
+        return acc(res) if tail_recursive else res
 
     def zip(self, t, tail_recursive=False, acc=lambda x: x):
         """Zip the values contained in t with the ones in the current instance
@@ -560,15 +627,11 @@ class Node(BTree):
             Continuation
         """
         assert t.is_node(), "A node can only be zipped with another node"
-        if tail_recursive:
-            return self.get_left()\
-                .zip(t.get_left(), lambda lm: self.get_right()
-                     .zip(t.get_right(), lambda rm: acc(Node((self.get_value(),
-                                                              t.get_value()), lm, rm))))
-        v = (self.get_value(), t.get_value())
-        left = self.get_left().zip(t.get_left())
-        right = self.get_right().zip(t.get_right())
-        return Node(v, left, right)
+        res = _postorder2(self, t,
+                          lambda leaf1, leaf2: Leaf((leaf1.get_value(), leaf2.get_value())),
+                          lambda node1, node2, left, right:
+                          Node((node1.get_value(), node2.get_value()), left, right))
+        return acc(res) if tail_recursive else res
 
     def map2(self, f, t, tail_recursive=False, acc=lambda x: x):
         """Zip the values contained in a tree with the ones in the current instance using a function
@@ -589,15 +652,11 @@ class Node(BTree):
             Continuation
         """
         assert t.is_node(), "A node can only be zipped with another node"
-        if tail_recursive:
-            return self.get_left()\
-                .map2(f, t.get_left(), lambda lm: self.get_right()
-                      .map2(f, t.get_right(), lambda rm: acc(Node(f(self.get_value(),
-                                                                    t.get_value()), lm, rm))))
-        v = f(self.get_value(), t.get_value())
-        left = self.get_left().map2(f, t.get_left())
-        right = self.get_right().map2(f, t.get_right())
-        return Node(v, left, right)
+        res = _postorder2(self, t,
+                          lambda leaf1, leaf2: Leaf(f(leaf1.get_value(), leaf2.get_value())),
+                          lambda node1, node2, left, right:
+                          Node(f(node1.get_value(), node2.get_value()), left, right))
+        return acc(res) if tail_recursive else res
 
     def getchl(self, c, tail_recursive=False, acc=lambda x: x):
         """Shift all the values contained in the current instance by the left
@@ -611,14 +670,10 @@ class Node(BTree):
         acc: callable
             Continuation
         """
-        if tail_recursive:
-            return self.get_left()\
-                .getchl(c, lambda lm: self.get_right()
-                        .getchl(c, lambda rm: acc(Node(self.get_left().get_value(), lm, rm))))
-        v = self.get_left().get_value()
-        left = self.get_left().getchl(c)
-        right = self.get_right().getchl(c)
-        return Node(v, left, right)
+        res = _postorder(self, lambda leaf: Leaf(c),
+                         lambda node, left, right:
+                         Node(node.get_left().get_value(), left, right))
+        return acc(res) if tail_recursive else res
 
     def getchr(self, c, tail_recursive=False, acc=lambda x: x):
         """Shift all the values contained in the current instance by the right
@@ -632,11 +687,7 @@ class Node(BTree):
         acc: callable
             Continuation
         """
-        if tail_recursive:
-            return self.get_left()\
-                .getchr(c, lambda lm: self.get_right()
-                        .getchr(c, lambda rm: acc(Node(self.get_right().get_value(), lm, rm))))
-        v = self.get_right().get_value()
-        left = self.get_left().getchr(c)
-        right = self.get_right().getchr(c)
-        return Node(v, left, right)
+        res = _postorder(self, lambda leaf: Leaf(c),
+                         lambda node, left, right:
+                         Node(node.get_right().get_value(), left, right))
+        return acc(res) if tail_recursive else res
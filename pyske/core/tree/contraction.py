@@ -0,0 +1,343 @@
+"""
+Parallel tree contraction
+
+The global phase of the skeletons of linearized trees works on the top-level
+tree of the segments (the leaves are the segments without critical value).
+Instead of a sequential walk of this tree, it may be computed by a tree
+contraction: at each round, every other leaf is raked, that is removed with its
+parent, and the sibling of the leaf takes the place of the parent. The leaves
+raked in a same step are independent, and each round halves the number of leaves,
+so a tree of n segments is contracted in O(log n) rounds, whatever its shape.
+The function applications of a step may thus be computed at the same time, for
+instance by the processes of a ``SegmentPool``.
+
+The shape of the contraction (its schedule) only depends on the tags of the
+top-level tree: it is computed by every processor. The values are distributed:
+each processor owns a block of consecutive nodes, and the values are exchanged
+at each step.
+"""
+from bisect import bisect_right
+
+from pyske.core.support.errors import IllFormedError
+
+__all__ = ['Contraction']
+
+_NO_PARENT = -1
+
+
+def _local_exchange(outbox):
+    return outbox
+
+
+def _local_apply(calls):
+    return [function(*args) for (function, args) in calls]
+
+
+class Contraction:
+    """A class used to contract a binary tree given in prefix order
+
+    Attributes
+    ----------
+    __leaves: for each node, True if it is a leaf
+    __parent, __left, __right: the parent and children of each node (-1 for none)
+    __steps: the steps of the contraction: lists of rakes (leaf, parent, sibling,
+        grandparent, the leaf is a left child)
+    __final: the leaf that remains at the end of the contraction
+    __starts: the first node of each processor
+    __pid: the current processor
+    __exchange: a function taking a list of messages for each processor, and returning
+        the list of messages received from each processor (an all-to-all exchange)
+    __apply: a function taking a list of independent (function, arguments) calls, and
+        returning the list of their results
+
+    Methods
+    -------
+    steps()
+        Get the steps of the contraction
+    reduce(values, psi_n, psi_l, psi_r)
+        Reduce the tree, on the processor of the last leaf
+    uacc(values, psi_n, psi_l, psi_r)
+        Makes an upward accumulation of the tree
+    dacc(values, psi_u, psi_d, c)
+        Makes a downward accumulation of the tree
+    """
+
+    def __init__(self, leaves, distribution=None, pid=0, exchange=_local_exchange,
+                 apply=_local_apply):
+        """
+        Parameters
+        ----------
+        leaves : list
+            For each node of the tree in prefix order, True if it is a leaf
+        distribution : list, optional
+            The number of nodes of each processor. By default, all the nodes belong
+            to the current processor
+        pid : int, optional
+            The current processor
+        exchange : callable, optional
+            The all-to-all exchange of messages between the processors
+        apply : callable, optional
+            The application of the independent calls of a step. By default, the calls
+            are applied one after the other by the current process
+
+        Raises
+        ------
+        IllFormedError
+            If leaves does not describe a binary tree
+        """
+        size = len(leaves)
+        self.__leaves = leaves
+        self.__parent = [_NO_PARENT] * size
+        self.__left = [_NO_PARENT] * size
+        self.__right = [_NO_PARENT] * size
+        stack = []
+        for i in reversed(range(size)):
+            if not leaves[i]:
+                if len(stack) < 2:
+                    raise IllFormedError("A tree contraction cannot be applied if there is a node "
+                                         "that does not have two children")
+                self.__left[i] = stack.pop()
+                self.__right[i] = stack.pop()
+                self.__parent[self.__left[i]] = i
+                self.__parent[self.__right[i]] = i
+            stack.append(i)
+        if len(stack) != 1:
+            raise IllFormedError("A tree contraction cannot be applied to several trees")
+        distribution = [size] if distribution is None else distribution
+        self.__starts = [0]
+        for nb_nodes in distribution:
+            self.__starts.append(self.__starts[-1] + nb_nodes)
+        self.__pid = pid
+        self.__exchange = exchange
+        self.__apply = apply
+        self.__steps, self.__final = self.__schedule()
+
+    def __schedule(self):
+        """Rakes the odd leaves that are left children, then the ones that are right children,
+        and numbers the remaining leaves again, until there is only one leaf"""
+        parent = list(self.__parent)
+        left = list(self.__left)
+        right = list(self.__right)
+        order = [i for (i, leaf) in enumerate(self.__leaves) if leaf]
+        steps = []
+        while len(order) > 1:
+            for left_pass in (True, False):
+                step = []
+                for leaf in order[0::2]:
+                    par = parent[leaf]
+                    if (left[par] == leaf) != left_pass:
+                        continue
+                    sibling = right[par] if left_pass else left[par]
+                    grand = parent[par]
+                    step.append((leaf, par, sibling, grand, left_pass))
+                    parent[sibling] = grand
+                    if grand != _NO_PARENT:
+                        if left[grand] == par:
+                            left[grand] = sibling
+                        else:
+                            right[grand] = sibling
+                steps.append(step)
+            order = order[1::2]
+        return steps, order[0]
+
+    def steps(self):
+        """Get the steps of the contraction"""
+        return self.__steps
+
+    def __owner(self, i):
+        return bisect_right(self.__starts, i) - 1
+
+    def __mine(self, i):
+        return self.__starts[self.__pid] <= i < self.__starts[self.__pid + 1]
+
+    def __send(self, messages):
+        """Exchanges (destination, key, value) messages, and returns the received ones
+        in a dictionary"""
+        outbox = [[] for _ in range(len(self.__starts) - 1)]
+        for (dest, key, value) in messages:
+            outbox[dest].append((key, value))
+        received = {}
+        for inbox in self.__exchange(outbox):
+            received.update(inbox)
+        return received
+
+    def __local(self, values):
+        start = self.__starts[self.__pid]
+        return {start + i: value for (i, value) in enumerate(values)}
+
+    def __upwards(self, values, psi_n, psi_l, psi_r):
+        """Contracts the tree, each sibling absorbing the parent of the raked leaf
+
+        The value of a leaf is the value of the topmost node it absorbed, the value of a node
+        a partial value of its topmost node, from the values of its children."""
+        val = self.__local(values)
+        records = []
+        for step in self.__steps:
+            messages = []
+            for (leaf, par, sibling, _, _) in step:
+                if self.__mine(leaf):
+                    messages.append((self.__owner(sibling), ('l', sibling), val[leaf]))
+                if self.__mine(par):
+                    messages.append((self.__owner(sibling), ('p', sibling), val[par]))
+            received = self.__send(messages)
+            record = []
+            calls = []
+            for (_, par, sibling, _, left_pass) in step:
+                if not self.__mine(sibling):
+                    continue
+                (lv, pv, sv) = (received[('l', sibling)], received[('p', sibling)], val[sibling])
+                if self.__leaves[sibling]:
+                    calls.append((psi_n, (lv, pv, sv) if left_pass else (sv, pv, lv)))
+                else:
+                    calls.append((psi_r, (lv, pv, sv)) if left_pass else (psi_l, (sv, pv, lv)))
+                record.append((par, sibling, left_pass, lv, sv))
+            for ((_, sibling, _, _, _), value) in zip(record, self.__apply(calls)):
+                val[sibling] = value
+            records.append(record)
+        return val, records
+
+    def reduce(self, values, psi_n, psi_l, psi_r):
+        """Reduce the tree
+
+        Parameters
+        ----------
+        values : list
+            The values of the nodes of the current processor: a value for a leaf,
+            a partial value for a node
+        psi_n : callable
+            The function applying a partial value to the values of its children
+        psi_l : callable
+            The function combining a partial value with a partial value on its left
+        psi_r : callable
+            The function combining a partial value with a partial value on its right
+
+        Returns
+        -------
+        The reduction on the processor of the last leaf, None on the others
+        """
+        (val, _) = self.__upwards(values, psi_n, psi_l, psi_r)
+        return val[self.__final] if self.__mine(self.__final) else None
+
+    def final_owner(self):
+        """Get the processor that gets the reduction"""
+        return self.__owner(self.__final)
+
+    def uacc(self, values, psi_n, psi_l, psi_r):
+        """Makes an upward accumulation of the tree
+
+        The removed nodes are restored in the reverse order: the value of a node
+        is computed from the value of its raked leaf, and from the partial value of
+        the sibling before it absorbed the node, applied to the values of the
+        children of the sibling, that were restored before.
+
+        Parameters
+        ----------
+        values : list
+            The values of the nodes of the current processor (see ``reduce``)
+        psi_n : callable
+            The function applying a partial value to the values of its children
+        psi_l : callable
+            The function combining a partial value with a partial value on its left
+        psi_r : callable
+            The function combining a partial value with a partial value on its right
+
+        Returns
+        -------
+        The accumulated values of the nodes of the current processor, and for each node,
+        the values of its children
+        """
+        (_, records) = self.__upwards(values, psi_n, psi_l, psi_r)
+        start = self.__starts[self.__pid]
+        res = list(values)
+        children = [None] * len(values)
+        for record in reversed(records):
+            # The partial values of the siblings that are nodes are applied to the values
+            # of their children
+            calls = [(psi_n, (children[sibling - start][0], sv, children[sibling - start][1]))
+                     for (_, sibling, _, _, sv) in record if not self.__leaves[sibling]]
+            applied = iter(self.__apply(calls))
+            messages = [(self.__owner(par), par,
+                         (left_pass, lv, sv if self.__leaves[sibling] else next(applied)))
+                        for (par, sibling, left_pass, lv, sv) in record]
+            received = self.__send(messages)
+            calls = []
+            for (par, (left_pass, lv, sv)) in received.items():
+                (lc, rc) = (lv, sv) if left_pass else (sv, lv)
+                children[par - start] = (lc, rc)
+                calls.append((psi_n, (lc, values[par - start], rc)))
+            for (par, value) in zip(received, self.__apply(calls)):
+                res[par - start] = value
+        return res, children
+
+    def dacc(self, values, psi_u, psi_d, c):
+        """Makes a downward accumulation of the tree
+
+        Each node gets the partial value of the path from its parent (the partial value
+        of its parent for the side of the node), that is composed with the one of the
+        parent when the parent is removed. The removed nodes are restored in the reverse
+        order, from the accumulated value of their parent, that was restored before.
+
+        Parameters
+        ----------
+        values : list
+            The values of the nodes of the current processor: for a node, the pair of
+            partial values to its left and right children
+        psi_u : callable
+            The function composing two partial values
+        psi_d : callable
+            The function applying a partial value to an accumulated value
+        c
+            The accumulated value of the root
+
+        Returns
+        -------
+        The accumulated values of the nodes of the current processor
+        """
+        messages = []
+        for (i, value) in self.__local(values).items():
+            if not self.__leaves[i]:
+                messages.append((self.__owner(self.__left[i]), self.__left[i], value[0]))
+                messages.append((self.__owner(self.__right[i]), self.__right[i], value[1]))
+        # The partial value of the path from the parent of each node
+        path = self.__send(messages)
+        # The accumulated value of the root, that is a sibling absorbing the root
+        roots = {0: c} if self.__mine(0) else {}
+        records = []
+        for step in self.__steps:
+            messages = []
+            record = []
+            for (leaf, par, sibling, grand, _) in step:
+                if self.__mine(par):
+                    value = roots.pop(par) if grand == _NO_PARENT else path[par]
+                    messages.append((self.__owner(sibling), sibling, value))
+                    record.append((leaf, par, grand, value))
+            received = self.__send(messages)
+            siblings = [(sibling, grand) for (_, _, sibling, grand, _) in step
+                        if self.__mine(sibling)]
+            calls = [(psi_d if grand == _NO_PARENT else psi_u, (received[sibling], path[sibling]))
+                     for (sibling, grand) in siblings]
+            for ((sibling, grand), value) in zip(siblings, self.__apply(calls)):
+                if grand == _NO_PARENT:
+                    roots[sibling] = value
+                else:
+                    path[sibling] = value
+            records.append(record)
+        res = dict(roots)
+        leaf_messages = []
+        for (step, record) in zip(reversed(self.__steps), reversed(records)):
+            messages = [(self.__owner(par), par, res[grand])
+                        for (_, par, _, grand, _) in step
+                        if grand != _NO_PARENT and self.__mine(grand)]
+            received = self.__send(messages)
+            applied = iter(self.__apply([(psi_d, (received[par], value))
+                                         for (_, par, grand, value) in record
+                                         if grand != _NO_PARENT]))
+            for (leaf, par, grand, value) in record:
+                res[par] = value if grand == _NO_PARENT else next(applied)
+                leaf_messages.append((self.__owner(leaf), leaf, res[par]))
+        received = self.__send(leaf_messages)
+        for (leaf, value) in zip(received, self.__apply([(psi_d, (value, path[leaf]))
+                                                         for (leaf, value) in received.items()])):
+            res[leaf] = value
+        start = self.__starts[self.__pid]
+        return [res[i] for i in range(start, self.__starts[self.__pid + 1])]
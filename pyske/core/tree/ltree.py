@@ -2,16 +2,24 @@
 LTree Module
 """
 import sys
+from bisect import bisect_left
+from functools import partial
 
 from pyske.core.list.slist import SList
 from pyske.core.support.errors \
     import EmptyError, UnknownTypeError, IllFormedError, ApplicationError, NotSameTagError
 from pyske.core.tree.btree import Leaf, Node
+from pyske.core.tree.contraction import Contraction
+from pyske.core.tree.pool import apply_segments, apply_calls
+from pyske.core.support.separate import distribute_tree
+from pyske.core.tree import binfile
 
 MINUS_INFINITY = int((-sys.maxsize - 1) / 2)
 TAG_LEAF = 1
 TAG_NODE = 2
 TAG_CRITICAL = 3
+# Tag of an empty position (None) in a Segment
+TAG_NONE = 0
 
 SEPARATOR_TV = "^"
 LEFT_TV = "("
@@ -80,6 +88,8 @@ class TaggedValue:
         Indicates if the current instance is tagged by the Node tag
     """
 
+    __slots__ = ('val', 'tag')
+
     def __init__(self, val, t):
         self.val = val
         if (t == TAG_LEAF) | (t == TAG_NODE) | (t == TAG_CRITICAL):
@@ -132,14 +142,32 @@ class TaggedValue:
         return self.tag == TAG_NODE
 
 
-class Segment(__List):
+class Segment:
     """A list of TaggedValue
 
+    The tags and the values are stored in two parallel arrays: the tags in a ``bytearray``
+    (one byte per element) and the values in a list. No TaggedValue is stored: indexing or
+    iterating over a Segment builds them on demand, and the skeletons work directly on the
+    two arrays. An element may be None (an empty position, tagged by TAG_NONE), as in the
+    result of a local upwards accumulation.
+
+    A Segment may be a view of a range of larger arrays (see ``view``): it then shares
+    them with the Segment it comes from. The skeletons producing a Segment can write
+    their result in place into a view of a preallocated Segment (parameter ``out``).
+
     ...
 
 
     Methods
     -------
+    from_arrays(tags, values, start, stop)
+        Create a Segment from an array of tags and a list of values
+    view(start, stop)
+        Get a Segment sharing a range of the elements of the current instance
+    tags()
+        Get the tags of the current instance
+    values()
+        Get the values of the current instance
     has_critical()
         Indicates if the current instance contains a value tagged by the Critical VTag
     map_local(kl, kn)
@@ -173,28 +201,190 @@ class Segment(__List):
         using a function
     """
 
+    __slots__ = ('__tags', '__values', '__start', '__stop')
+
+    def __init__(self, tvs=()):
+        self.__tags = bytearray()
+        self.__values = []
+        self.__start = 0
+        self.__stop = 0
+        self.extend(tvs)
+
+    @staticmethod
+    def from_arrays(tags, values, start=0, stop=None):
+        """Create a Segment from an array of tags and a list of values
+
+        The arrays are not copied if they already are a ``bytearray`` and a list.
+
+        Parameters
+        ----------
+        tags : bytearray
+            The tags of the elements
+        values : list
+            The values of the elements
+        start : int, optional
+            The index of the first element of the Segment in the arrays. By default, 0
+        stop : int, optional
+            The index following the last element of the Segment in the arrays.
+            By default, the length of the arrays
+        """
+        assert len(tags) == len(values), "A Segment needs as many tags as values"
+        stop = len(tags) if stop is None else stop
+        assert 0 <= start <= stop <= len(tags), "A Segment must be a range of the arrays"
+        seg = Segment()
+        seg.__tags = tags if isinstance(tags, bytearray) else bytearray(tags)
+        seg.__values = values if isinstance(values, list) else list(values)
+        seg.__start = start
+        seg.__stop = stop
+        return seg
+
+    def view(self, start, stop):
+        """Get a Segment sharing the elements of the current instance from index start to
+        index stop (excluded)
+
+        Parameters
+        ----------
+        start : int
+            The index of the first element of the view
+        stop : int
+            The index following the last element of the view
+        """
+        assert 0 <= start <= stop <= self.length(), "A view must be a range of the Segment"
+        return Segment.from_arrays(self.__tags, self.__values,
+                                   self.__start + start, self.__start + stop)
+
+    def __is_view(self):
+        return self.__start != 0 or self.__stop != len(self.__tags)
+
+    def tags(self):
+        """Get the tags of the current instance
+
+        The underlying array is returned, or a copy of its range if the current instance is a view
+        """
+        if self.__is_view():
+            return self.__tags[self.__start:self.__stop]
+        return self.__tags
+
+    def values(self):
+        """Get the values of the current instance
+
+        The underlying list is returned, or a copy of its range if the current instance is a view
+        """
+        if self.__is_view():
+            return self.__values[self.__start:self.__stop]
+        return self.__values
+
+    def append(self, tv):
+        """Add a TaggedValue (or None) at the end of the current instance
+        """
+        assert not self.__is_view(), "Values cannot be added to a view"
+        if tv is None:
+            self.__tags.append(TAG_NONE)
+            self.__values.append(None)
+        else:
+            self.__tags.append(tv.get_tag())
+            self.__values.append(tv.get_value())
+        self.__stop = len(self.__tags)
+
+    def extend(self, tvs):
+        """Add several TaggedValue (or None) at the end of the current instance
+        """
+        assert not self.__is_view(), "Values cannot be added to a view"
+        if isinstance(tvs, Segment):
+            self.__tags.extend(tvs.tags())
+            self.__values.extend(tvs.values())
+            self.__stop = len(self.__tags)
+        else:
+            for tv in tvs:
+                self.append(tv)
+
+    def __len__(self):
+        return self.__stop - self.__start
+
+    def length(self):
+        """Get the length of the current instance"""
+        return self.__stop - self.__start
+
+    def __index(self, i):
+        if i < 0:
+            i = i + self.length()
+        if not 0 <= i < self.length():
+            raise IndexError("Segment index out of range")
+        return self.__start + i
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return Segment.from_arrays(self.tags()[i], self.values()[i])
+        i = self.__index(i)
+        tag = self.__tags[i]
+        if tag == TAG_NONE:
+            return None
+        return TaggedValue(self.__values[i], tag)
+
+    def __setitem__(self, i, tv):
+        if isinstance(i, slice):
+            assert not self.__is_view(), "Slices of a view cannot be assigned"
+            seg = tv if isinstance(tv, Segment) else Segment(tv)
+            self.__tags[i] = seg.tags()
+            self.__values[i] = seg.values()
+            self.__stop = len(self.__tags)
+            return
+        i = self.__index(i)
+        if tv is None:
+            self.__tags[i] = TAG_NONE
+            self.__values[i] = None
+        else:
+            self.__tags[i] = tv.get_tag()
+            self.__values[i] = tv.get_value()
+
+    def __iter__(self):
+        tags = self.__tags
+        values = self.__values
+        for i in range(self.__start, self.__stop):
+            yield None if tags[i] == TAG_NONE else TaggedValue(values[i], tags[i])
+
+    def __reversed__(self):
+        for i in reversed(range(self.length())):
+            yield self[i]
+
     def __eq__(self, other):
         if isinstance(other, Segment):
-            if self.length() != other.length():
-                return False
-            for i in range(0, self.length()):
-                if self[i] != other[i]:
-                    return False
-            return True
+            return self.tags() == other.tags() and self.values() == other.values()
         return False
 
+    __hash__ = None
+
+    def __str__(self):
+        return LEFT_SEG + SEPARATOR_SEG.join(str(tv) for tv in self) + RIGHT_SEG
+
+    def __repr__(self):
+        return str(self)
+
     def empty(self):
-        return self == []
+        """Indicates if the current instance is empty
+        """
+        return self.length() == 0
 
     def has_critical(self):
         """Indicates if the current instance contains a value tagged by the Critical tag
         """
-        for v in self:
-            if v.is_critical():
-                return True
-        return False
+        return self.__tags.find(TAG_CRITICAL, self.__start, self.__stop) >= 0
 
-    def map_local(self, kl, kn):
+    def __output(self, out):
+        """Get the Segment where to write the result of a skeleton, its arrays, and the shift
+        from the indices of the current instance to the indices of these arrays
+
+        The tags of the current instance are copied to the output Segment.
+        """
+        if out is None:
+            out = Segment.from_arrays(self.__tags[self.__start:self.__stop],
+                                      [None] * self.length())
+        else:
+            assert out.length() == self.length(), "The output Segment has not the same length"
+            out.__tags[out.__start:out.__stop] = self.__tags[self.__start:self.__stop]
+        return out, out.__tags, out.__values, out.__start - self.__start
+
+    def map_local(self, kl, kn, out=None):
         """Applies function kl to each leaf and function kn to each internal node
         and the m-critical node in a local Segment
 
@@ -205,19 +395,18 @@ class Segment(__List):
             The function to apply to every values tagged by LEAF of the current instance
         kn : callable
             The function to apply to every values tagged by CRITICAL or NODE of the current instance
+        out : :obj:`Segment`, optional
+            A Segment of the same length where to write the result
         """
-        res = Segment([None] * self.length())
-        for i in range(self.length()):
-            tv = self[i]
-            if tv.is_leaf():
-                v = TaggedValue(kl(tv.get_value()), tv.get_tag())
-            else:  # v.is_node() or v.is_critical()
-                v = TaggedValue(kn(tv.get_value()), tv.get_tag())
-            res[i] = v
-        return res
+        out, _, res_values, shift = self.__output(out)
+        # The tags are unchanged: the tag of each value selects the function to apply
+        res_values[self.__start + shift:self.__stop + shift] = \
+            [kl(val) if tag == TAG_LEAF else kn(val)
+             for (tag, val) in zip(self.tags(), self.values())]
+        return out
 
     @staticmethod
-    def __node_reduce_local_compute(stack, d, k, psi_l, phi, v, psi_r):
+    def __node_reduce_local_compute(stack, d, k, psi_l, phi, val, psi_r):
         """Computes when the value is a node"""
         if len(stack) < 2:
             raise IllFormedError(
@@ -230,16 +419,17 @@ class Segment(__List):
             # The current node is an ancestor of a critical value by the left
             # That is, there is a critical value on its left children in a BTree representation
             # We process and stack a partial reduction
-            stack.append(psi_l(lv, phi(v.get_value()), rv))
+            stack.append(psi_l(lv, phi(val), rv))
         elif d == 1:
             # The current node is an ancestor of a critical value by the right
             # That is, there is a critical value on its right children in a BTree representation
             # We process and stack a partial reduction
-            stack.append(psi_r(lv, phi(v.get_value()), rv))
+            stack.append(psi_r(lv, phi(val), rv))
             d = 0
         else:
             # We did not meet a critical value, we process and stack a normal reduction
-            stack.append(k(lv, v.get_value(), rv))
+            stack.append(k(lv, val, rv))
+            d = d - 1
         return stack, d
 
     def reduce_local(self, k, phi, psi_l, psi_r):
@@ -267,22 +457,26 @@ class Segment(__List):
             That is there is a node that does not have two children which can be either
             a leaf value or a critical value
         """
-        assert self != [], "reduce_local cannot be applied to an empty Segment"
+        assert not self.empty(), "reduce_local cannot be applied to an empty Segment"
+        tags = self.__tags
+        values = self.__values
         stack = []
         d = MINUS_INFINITY
         has_critical = False
-        for v in reversed(self):
+        for i in reversed(range(self.__start, self.__stop)):
             # Starts by the end, that is the most deep leaves
             # We stack every elements we already reduced
-            if v.is_leaf():
+            tag = tags[i]
+            if tag == TAG_LEAF:
                 # We cannot reduce a leaf value
-                stack.append(v.get_value())
+                stack.append(values[i])
                 d = d + 1
-            elif v.is_node():
-                stack, d = self.__node_reduce_local_compute(stack, d, k, psi_l, phi, v, psi_r)
-            else:  # v.is_critical()
+            elif tag == TAG_NODE:
+                stack, d = self.__node_reduce_local_compute(stack, d, k, psi_l, phi, values[i],
+                                                            psi_r)
+            else:  # tag == TAG_CRITICAL
                 # we process and stack the reduction of critical value
-                stack.append(phi(v.get_value()))
+                stack.append(phi(values[i]))
                 has_critical = True
                 d = 0
         top = stack.pop()
@@ -315,14 +509,16 @@ class Segment(__List):
         """
         assert not self.has_critical(), "reduce_global cannot be applied to a" \
                                         "Segments which contains a critical"
-        assert self != [], "reduce_global cannot be applied to an empty Segment"
+        assert not self.empty(), "reduce_global cannot be applied to an empty Segment"
+        tags = self.__tags
+        values = self.__values
         stack = []
-        for g in reversed(self):
+        for i in reversed(range(self.__start, self.__stop)):
             # We stack every value we already reduced
-            if g.is_leaf():
+            if tags[i] == TAG_LEAF:
                 # Nothing to calculate, we only stack the value
-                stack.append(g.get_value())
-            else:  # g.is_node()
+                stack.append(values[i])
+            else:  # tags[i] == TAG_NODE
                 # We get two sub reductions to make a total reduction of the current node
                 if len(stack) < 2:
                     raise IllFormedError(
@@ -331,13 +527,13 @@ class Segment(__List):
                 lv = stack.pop()
                 rv = stack.pop()
                 # We process and stack a reduction
-                stack.append(psi_n(lv, g.get_value(), rv))
+                stack.append(psi_n(lv, values[i], rv))
         top = stack.pop()
         return top
 
     @staticmethod
-    def __node_uacc_local_compute(stack, d, phi, v, psi_l, res, psi_r, i, k):
-        """Computes when the value is a node"""
+    def __node_uacc_local_compute(stack, d, phi, val, psi_l, psi_r, k):
+        """Computes when the value is a node, the accumulated value is pushed on the stack"""
         if len(stack) < 2:
             raise IllFormedError(
                 "uacc_local cannot be applied if there is a node that does not have two children "
@@ -349,26 +545,20 @@ class Segment(__List):
             # The current node is an ancestor of a critical value by the left
             # That is, there is a critical value on its left children in a BTree representation
             # We process and stack the value of a partial accumulation
-            val = phi(v.get_value())
-            stack.append(psi_l(lv, val, rv))
-            res[i] = None
+            stack.append(psi_l(lv, phi(val), rv))
         elif d == 1:
             # The current node is an ancestor of a critical value by the left
             # That is, there is a critical value on its left children in a BTree representation
             # We process and stack the value of a partial accumulation
-            val = phi(v.get_value())
-            stack.append(psi_r(lv, val, rv))
-            res[i] = None
+            stack.append(psi_r(lv, phi(val), rv))
             d = 0
         else:
             # We did not meet a critical value, we can process a normal upward accumulation with k
-            val = k(lv, v.get_value(), rv)
-            res[i] = TaggedValue(val, v.get_tag())
-            stack.append(val)
+            stack.append(k(lv, val, rv))
             d = d - 1
-        return d, stack, res
+        return d
 
-    def uacc_local(self, k, phi, psi_l, psi_r):
+    def uacc_local(self, k, phi, psi_l, psi_r, out=None):
         """Computes local upwards accumulation and reduction
 
         Precondition
@@ -385,6 +575,8 @@ class Segment(__List):
             A function used to respect the closure property to make partial computation on the left
         psi_r : callable
             A function used to respect the closure property to make partial computation on the right
+        out : :obj:`Segment`, optional
+            A Segment of the same length where to write the accumulated subtree
 
         Raises
         ------
@@ -393,27 +585,35 @@ class Segment(__List):
             That is there is a node that doesn't have two children which can be either a leaf
             value or a critical value
         """
-        assert self != [], "uacc_local cannot be applied to an empty Segment"
+        assert not self.empty(), "uacc_local cannot be applied to an empty Segment"
+        tags = self.__tags
+        values = self.__values
+        out, res_tags, res_values, shift = self.__output(out)
         stack = []
         d = MINUS_INFINITY
-        res = Segment([None] * self.length())
         has_crit = False
-        for i in reversed(range(self.length())):
-            v = self[i]
+        for i in reversed(range(self.__start, self.__stop)):
+            tag = tags[i]
             # We stack all the values of previous accumulation
-            if v.is_leaf():
-                res[i] = v
-                stack.append(v.get_value())
+            if tag == TAG_LEAF:
+                res_values[i + shift] = values[i]
+                stack.append(values[i])
                 d = d + 1
-            elif v.is_node():
-                d, stack, res = self.__node_uacc_local_compute(stack, d,
-                                                               phi, v, psi_l,
-                                                               res, psi_r, i, k)
-            else:  # v.is_critical()
+            elif tag == TAG_NODE:
+                complete = d not in (0, 1)
+                d = self.__node_uacc_local_compute(stack, d, phi, values[i], psi_l, psi_r, k)
+                if complete:
+                    res_values[i + shift] = stack[-1]
+                else:
+                    # The accumulation is partial: there is no value yet at this position
+                    res_tags[i + shift] = TAG_NONE
+                    res_values[i + shift] = None
+            else:  # tag == TAG_CRITICAL
                 # The current value is critical.
                 # We make a partial accumulation with phi and stack the result
-                stack.append(phi(v.get_value()))
-                res[i] = None
+                stack.append(phi(values[i]))
+                res_tags[i + shift] = TAG_NONE
+                res_values[i + shift] = None
                 d = 0
                 has_crit = True
 
@@ -421,7 +621,7 @@ class Segment(__List):
         tag = "N" if has_crit else "L"
         # We return both the top values for following global upward accumulation, and the current
         # accumulated subtree
-        return TaggedValue(top, tag), res
+        return TaggedValue(top, tag), out
 
     def uacc_global(self, psi_n):
         """Performs sequential upwards accumulation
@@ -442,54 +642,60 @@ class Segment(__List):
             If the current instance does not represent a correct linearized subtree
             That is there is a node that doesn't have two children
         """
+        (out, _) = self.uacc_global_children(psi_n)
+        return out
+
+    def uacc_global_children(self, psi_n):
+        """Performs sequential upwards accumulation, and gets the accumulated values of the
+        children of each node, in the same pass
+
+        Precondition
+        -------------
+        self should not have critical nodes
+
+        Parameters
+        ----------
+        psi_n : callable
+            A function used to respect the closure property on k
+            (the initial function used for accumulation) to allow partial computation
+
+        Raises
+        ------
+        IllformedError
+            If the current instance does not represent a correct linearized subtree
+            That is there is a node that doesn't have two children
+
+        Returns
+        -------
+        The accumulated Segment, and the list of the pairs of accumulated values of the
+        children of each value (None for a leaf)
+        """
         assert not self.has_critical(), "uacc_global cannot be applied to a " \
                                         "Segments which contains a critical"
+        tags = self.__tags
+        values = self.__values
+        out, _, res_values, shift = self.__output(None)
+        children = [None] * self.length()
         stack = []
-        res = Segment([None] * self.length())
-        for i in reversed(range(self.length())):
-            g = self[i]
+        for i in reversed(range(self.__start, self.__stop)):
             # We process a global accumulation using a stack to store previous accumulation,
             # to get them for the accumulation on nodes
-            if g.is_leaf():
-                res[i] = g
-                val = g.get_value()
-            else:  # g.is_node()
+            if tags[i] == TAG_LEAF:
+                val = values[i]
+            else:  # tags[i] == TAG_NODE
                 if len(stack) < 2:
                     raise IllFormedError(
                         "uacc_global cannot be applied if there is a node that "
                         "does not have two children in the current instance")
                 lv = stack.pop()
                 rv = stack.pop()
-                val = psi_n(lv, g.get_value(), rv)
-                res[i] = TaggedValue(val, g.get_tag())
+                val = psi_n(lv, values[i], rv)
+                children[i - self.__start] = (lv, rv)
+            res_values[i + shift] = val
             stack.append(val)
-        # We get the top value of the accumulation
-        return res
+        return out, children
 
-    @staticmethod
-    def __node_uacc_update_compute(stack, d, res, k, v1, v2, i):
-        """Computes when the value is a node"""
-        if len(stack) < 2:
-            raise IllFormedError(
-                "uacc_update cannot be applied if there is a node that does not have two children "
-                "in the current instance")
-        # We need two sub accumulation values to process the accumulation of a node
-        lv = stack.pop()
-        rv = stack.pop()
-        if d in (0, 1):
-            # We met a critical value before, so the accumulation is not completed yet
-            val = k(lv, v1.get_value(), rv)
-            res[i] = TaggedValue(val, v1.get_tag())
-            stack.append(val)
-            d = 0
-        else:
-            # We did not meet a critical value before, so the accumulation is completed yet
-            res[i] = v2
-            stack.append(v2.get_value())
-            d = d - 1
-        return res, stack, d
-
-    def uacc_update(self, seg2, k, lc, rc):
+    def uacc_update(self, seg2, k, lc, rc, out=None):
         """Makes an update of the current accumulation, using initial values and the top
          accumulated values
 
@@ -507,6 +713,8 @@ class Segment(__List):
             Top value of the left children in a global structure
         rc
             Top value of the left children in a global structure
+        out : :obj:`Segment`, optional
+            A Segment of the same length where to write the result, it may be seg2
 
         Raises
         ------
@@ -516,50 +724,61 @@ class Segment(__List):
         """
         assert self.length() == seg2.length(), "uacc_update cannot needs to " \
                                                "Segment of same size as input"
-        stack = [rc, lc]
+        tags = self.__tags
+        values = self.__values
+        acc_values = seg2.__values
+        acc_shift = seg2.__start - self.__start
+        out, _, res_values, shift = self.__output(out)
+        stack = []
         d = MINUS_INFINITY
-        res = Segment([None] * self.length())
-        for i in reversed(range(seg2.length())):
-            v1 = self[i]
-            v2 = seg2[i]
+        for i in reversed(range(self.__start, self.__stop)):
+            tag = tags[i]
             # We update the accumulation from seg2
             # We stack the values already updated to process updates on nodes
-            if v1.is_leaf():
+            if tag == TAG_LEAF:
                 # The result of the accumulation is the node made in seg2
-                res[i] = v2
-                stack.append(v2.get_value())
+                val = acc_values[i + acc_shift]
                 d = d + 1
-            elif v1.is_node():
-                res, stack, d = self.__node_uacc_update_compute(stack, d, res, k, v1, v2, i)
-            else:  # v1.is_critical()
+            elif tag == TAG_CRITICAL:
+                # The children of the critical value are the top values of other segments
+                val = k(lc, values[i], rc)
+                d = 0
+            else:
                 if len(stack) < 2:
                     raise IllFormedError(
                         "uacc_update cannot be applied if there is a node that "
                         "does not have two children in the current instance")
-                # We need two sub accumulation values to process the accumulation of a critical node
-                lv = stack.pop()
-                rv = stack.pop()
-                val = k(lv, v1.get_value(), rv)
-                res[i] = TaggedValue(val, v1.get_tag())
-                stack.append(val)
-                d = 0
-        return res
+                if tag == TAG_NODE and d not in (0, 1):
+                    # We did not meet a critical value before, so the accumulation is completed
+                    # yet, the sub accumulation values are not needed
+                    val = acc_values[i + acc_shift]
+                    del stack[-2:]
+                    d = d - 1
+                else:
+                    # We met a critical value before, so the accumulation is not completed yet
+                    lv = stack.pop()
+                    rv = stack.pop()
+                    val = k(lv, values[i], rv)
+                    d = 0
+            res_values[i + shift] = val
+            stack.append(val)
+        return out
 
     @staticmethod
-    def __node_dacc_path_compute(d, psi_u, phi_l, v, to_l, to_r):
+    def __node_dacc_path_compute(d, psi_u, phi_l, phi_r, val, to_l, to_r):
         """Computes when the value is a node"""
         if d == 0:
             # The current node is an ancestor of a critical value by the left
             # That is, there is a critical value on its left children in a BTree representation
             # We process and stack the value of a partial downward accumulation
-            to_l = psi_u(phi_l(v.get_value()), to_l)
-            to_r = psi_u(phi_l(v.get_value()), to_r)
+            to_l = psi_u(phi_l(val), to_l)
+            to_r = psi_u(phi_l(val), to_r)
         elif d == 1:
             # The current node is an ancestor of a critical value by the right
             # That is, there is a critical value on its right children in a BTree representation
             # We process and stack the value of a partial downward accumulation
-            to_l = psi_u(phi_l(v.get_value()), to_l)
-            to_r = psi_u(phi_l(v.get_value()), to_r)
+            to_l = psi_u(phi_r(val), to_l)
+            to_r = psi_u(phi_r(val), to_r)
             d = 0
         else:
             d = d - 1
@@ -589,22 +808,26 @@ class Segment(__List):
         ApplicationError
             If the current instance does not contain a critical value
         """
-        assert self != [], "dacc_path cannot be applied to an empty Segment"
+        assert not self.empty(), "dacc_path cannot be applied to an empty Segment"
+        tags = self.__tags
+        values = self.__values
         d = MINUS_INFINITY
         # The value to pass to the left children for a total downward accumulation
         to_l = None
         # The value to pass to the right children for a total downward accumulation
         to_r = None
         has_critical = False
-        for v in reversed(self):
-            if v.is_leaf():
+        for i in reversed(range(self.__start, self.__stop)):
+            tag = tags[i]
+            if tag == TAG_LEAF:
                 d = d + 1
-            elif v.is_node():
-                to_l, to_r, d = self.__node_dacc_path_compute(d, psi_u, phi_l, v, to_l, to_r)
-            else:  # v.is_critical()
+            elif tag == TAG_NODE:
+                to_l, to_r, d = self.__node_dacc_path_compute(d, psi_u, phi_l, phi_r,
+                                                              values[i], to_l, to_r)
+            else:  # tag == TAG_CRITICAL
                 has_critical = True
-                to_l = phi_l(v.get_value())
-                to_r = phi_r(v.get_value())
+                to_l = phi_l(values[i])
+                to_r = phi_r(values[i])
                 d = 0
         if not has_critical:
             raise ApplicationError("dacc_path must be imperatively applied to a "
@@ -632,29 +855,30 @@ class Segment(__List):
             If the current instance does not represent a correct linearized subtree
             That is there are several leaves that doesn't have a parent in a BTree representation
         """
-        stack = [c]
-        res = Segment([None] * self.length())
         assert not self.has_critical(), "dacc_global cannot be applied to " \
                                         "Segment which contains a critical node"
-        for i in range(self.length()):
-            v = self[i]
+        tags = self.__tags
+        values = self.__values
+        out, _, res_values, shift = self.__output(None)
+        stack = [c]
+        for i in range(self.__start, self.__stop):
             if len(stack) == 0:
                 raise IllFormedError(
                     "dacc_global cannot be applied to ill-formed "
                     "Segments that is two leaf values do not have a parent")
             # We add the previous accumulation as a new value of our result
             val = stack.pop()
-            res[i] = TaggedValue(val, v.get_tag())
+            res_values[i + shift] = val
             # If the current value is node, we need to update
             # the value to pass to the right, and left children
             # These values are contained in the stack
-            if v.is_node():
-                (to_l, to_r) = v.get_value()
+            if tags[i] == TAG_NODE:
+                (to_l, to_r) = values[i]
                 stack.append(psi_d(val, to_r))
                 stack.append(psi_d(val, to_l))
-        return res
+        return out
 
-    def dacc_local(self, gl, gr, c):
+    def dacc_local(self, gl, gr, c, out=None):
         """Computes local downward accumulation for the current instance using an
         accumulative parameter resulting of a global downward accumulation
 
@@ -666,6 +890,8 @@ class Segment(__List):
             Function to make a downward accumulation to the right
         c
             Initial value of the accumulator
+        out : :obj:`Segment`, optional
+            A Segment of the same length where to write the result
 
         Raises
         ------
@@ -676,19 +902,19 @@ class Segment(__List):
         """
         # We update not finished accumulation locally using the value from the parent in the global
         # representation of a linearized tree
+        tags = self.__tags
+        values = self.__values
+        out, _, res_values, shift = self.__output(out)
         stack = [c]
-        res = Segment([None] * self.length())
-        for i in range(self.length()):
-            v = self[i]
-            if v.is_leaf() or v.is_critical():
+        for i in range(self.__start, self.__stop):
+            if tags[i] != TAG_NODE:
                 if len(stack) == 0:
                     raise IllFormedError(
                         "dacc_local cannot be applied if there are two leaf values, or critical "
                         "values that do not have a parent")
                 # We get the accumulated value passed from the last parent
-                val = stack.pop()
-                res[i] = TaggedValue(val, v.get_tag())
-            else:  # v.is_node()
+                res_values[i + shift] = stack.pop()
+            else:  # tags[i] == TAG_NODE
                 if len(stack) == 0:
                     raise IllFormedError(
                         "dacc_local cannot be applied if there is not a value to accumulate from "
@@ -697,10 +923,10 @@ class Segment(__List):
                 # We get the accumulated value passed from the last parent
                 # And two new ones, one for the left children, and one to the right, using
                 # the gr and gl functions
-                res[i] = TaggedValue(val, v.get_tag())
-                stack.append(gr(val, v.get_value()))
-                stack.append(gl(val, v.get_value()))
-        return res
+                res_values[i + shift] = val
+                stack.append(gr(val, values[i]))
+                stack.append(gl(val, values[i]))
+        return out
 
     def get_left(self, i):
         """Get the left children of a value at the i-th index
@@ -717,7 +943,7 @@ class Segment(__List):
         """
         assert not self.has_critical(), "The left children of a value in a non-global Segment " \
                                         "cannot be found "
-        assert not self[i].is_leaf(), "A leaf value doesn't have a left children"
+        assert self.__tags[self.__index(i)] != TAG_LEAF, "A leaf value doesn't have a left children"
         assert i < self.length() - 1, "Cannot get the left children of a node in an ill-formed " \
                                       "Segment "
         return self[i + 1]
@@ -738,19 +964,24 @@ class Segment(__List):
         """
         assert not self.has_critical(), "The right children of a value in a non-global Segment " \
                                         "cannot be found "
-        assert not self[i].is_leaf(), "A leaf value doesn't have a right children"
+        assert self.__tags[self.__index(i)] != TAG_LEAF, \
+            "A leaf value doesn't have a right children"
         assert i < self.length() - 2, "Cannot get the left children of a node in an ill-formed " \
                                       "Segment "
+        # We skip the left subtree: it ends when each of its nodes got its two children
+        j = self.__start + i + 1
+        missing = 1
+        while missing > 0:
+            missing = missing - 1 if self.__tags[j] == TAG_LEAF else missing + 1
+            j = j + 1
+        return self[j - self.__start]
+
+    def __check_same_tags(self, seg):
+        assert self.length() == seg.length(), "The linearized trees have not the same shape"
+        if self.__tags[self.__start:self.__stop] != seg.__tags[seg.__start:seg.__stop]:
+            raise NotSameTagError("Two zipped values have not the same tag")
 
-        def get_right_index(gt, idx):
-            if gt[idx + 1].is_leaf():
-                return idx + 2
-            return 1 + get_right_index(gt, idx + 1)
-
-        j = get_right_index(self, i)
-        return self[j]
-
-    def zip(self, seg):
+    def zip(self, seg, out=None):
         """Zip the values contained in a second Segment with the ones in the current instance
 
         Precondition
@@ -761,24 +992,17 @@ class Segment(__List):
         ----------
         seg : :obj:`Segment`
             The Segment to zip with the current instance
+        out : :obj:`Segment`, optional
+            A Segment of the same length where to write the result
 
         Raises
         ------
         NotSameTagError
             If two values with not the same tag are trying to be zipped together
         """
-        assert self.length() == seg.length(), "The linearized trees have not the same shape"
-        res = Segment([None] * self.length())
-        for j in range(self.length()):
-            tv1 = self[j]
-            tv2 = seg[j]
-            if tv1.get_tag() != tv2.get_tag():
-                raise NotSameTagError("Two zipped values have not the same tag")
-            tv = TaggedValue((tv1.get_value(), tv2.get_value()), tv1.get_tag())
-            res[j] = tv
-        return res
+        return self.map2(lambda left, right: (left, right), seg, out)
 
-    def map2(self, f, seg):
+    def map2(self, f, seg, out=None):
         """Zip the values contained in a second Segment with the ones in the current instance
         using a function
 
@@ -792,22 +1016,19 @@ class Segment(__List):
             A function to zip values
         seg : :obj:`Segment`
             The Segment to zip with the current instance
+        out : :obj:`Segment`, optional
+            A Segment of the same length where to write the result
 
         Raises
         ------
         NotSameTagError
             If two values with not the same tag are trying to be zipped together
         """
-        assert self.length() == seg.length(), "The linearized trees have not the same shape"
-        res = Segment([None] * self.length())
-        for j in range(self.length()):
-            tv1 = self[j]
-            tv2 = seg[j]
-            if tv1.get_tag() != tv2.get_tag():
-                raise NotSameTagError("Two zipped values have not the same tag")
-            tv = TaggedValue(f(tv1.get_value(), tv2.get_value()), tv1.get_tag())
-            res[j] = tv
-        return res
+        self.__check_same_tags(seg)
+        out, _, res_values, shift = self.__output(out)
+        res_values[self.__start + shift:self.__stop + shift] = \
+            list(map(f, self.values(), seg.values()))
+        return out
 
     @staticmethod
     def from_str(s, parser=int):
@@ -821,19 +1042,137 @@ class Segment(__List):
             A function that transforms a string into a specific type.
             By default, string to int
         """
-        res = Segment()
-        values = s.replace(LEFT_SEG, "").replace(RIGHT_SEG, "").split(SEPARATOR_SEG)
-        for v in values:
+        tags = bytearray()
+        values = []
+        for v in s.replace(LEFT_SEG, "").replace(RIGHT_SEG, "").split(SEPARATOR_SEG):
             v = v.replace(LEFT_TV, "")
             v = v.replace(RIGHT_TV, "")
             tv = v.split(SEPARATOR_TV)
-            res.append(TaggedValue(parser(tv[0]), parse_tag(tv[1])))
-        return res
+            values.append(parser(tv[0]))
+            tags.append(parse_tag(tv[1]))
+        return Segment.from_arrays(tags, values)
 
 
 # ------------------------------- #
 
 
+def linearize(bt, m):
+    """Get the nodes of a BTree in prefix order, with their tag and the size of their subtree
+
+    The tree is traversed once, in post order with the right subtrees first (an explicit
+    stack is used): this is the reverse of the prefix order, and the size of the subtrees
+    of a node, hence its tag, are known when it is visited.
+    A node is critical if it is the first one to need more segments of size m than both
+    of its subtrees.
+
+    Parameters
+    ----------
+    bt : :obj:`BTree`
+        The BTree to linearize
+    m : int
+        Variable to define the critical nodes of bt
+
+    Returns
+    -------
+    The tags (a bytearray), the values and the subtree sizes of the nodes in prefix order,
+    and the positions of the critical nodes in increasing order
+    """
+    tags = bytearray()
+    values = []
+    sizes = []
+    critical = []
+    stack = [(bt, False)]
+    while stack:
+        current, expanded = stack.pop()
+        if current.is_leaf():
+            tags.append(TAG_LEAF)
+            values.append(current.get_value())
+            sizes.append(1)
+        elif expanded:
+            # The right subtree has been visited first: its root precedes the left one
+            left = sizes[-1]
+            right = sizes[-1 - left]
+            size = left + right + 1
+            segs = -(-size // m)
+            if segs > -(-left // m) and segs > -(-right // m):
+                critical.append(len(tags))
+                tags.append(TAG_CRITICAL)
+            else:
+                tags.append(TAG_NODE)
+            values.append(current.get_value())
+            sizes.append(size)
+        else:
+            stack.append((current, True))
+            stack.append((current.get_left(), False))
+            stack.append((current.get_right(), False))
+    tags.reverse()
+    values.reverse()
+    sizes.reverse()
+    last = len(tags) - 1
+    critical = [last - pos for pos in reversed(critical)]
+    return tags, values, sizes, critical
+
+
+def segment_runs(sizes, critical):
+    """Get the segments of a linearized BTree, as runs of consecutive nodes in prefix order
+
+    A segment starts at the root, or at a child of a critical node, and contains the nodes
+    of its subtree in prefix order, except those below its critical nodes. The segments
+    are in the prefix order of their first node. Only the critical nodes are visited.
+
+    Parameters
+    ----------
+    sizes : list
+        The sizes of the subtrees of the nodes in prefix order
+    critical : list
+        The positions of the critical nodes in increasing order
+
+    Returns
+    -------
+    For each segment, the list of its runs (the start and stop positions of consecutive nodes)
+    """
+    res = []
+    starts = [0] if sizes else []
+    while starts:
+        pos = starts.pop()
+        stop = pos + sizes[pos]
+        runs = []
+        children = []
+        i_crit = bisect_left(critical, pos)
+        while i_crit < len(critical) and critical[i_crit] < stop:
+            crit = critical[i_crit]
+            runs.append((pos, crit + 1))
+            children.append(crit + 1)
+            children.append(crit + 1 + sizes[crit + 1])
+            pos = crit + sizes[crit]
+            i_crit = bisect_left(critical, pos, i_crit)
+        if pos < stop:
+            runs.append((pos, stop))
+        res.append(runs)
+        starts.extend(reversed(children))
+    return res
+
+
+def runs_to_segment(tags, values, runs):
+    """Get the Segment made of some runs of the nodes of a linearized BTree
+
+    Parameters
+    ----------
+    tags : bytearray
+        The tags of the nodes in prefix order
+    values : list
+        The values of the nodes in prefix order
+    runs : list
+        The start and stop positions of the runs of the segment
+    """
+    seg_tags = bytearray()
+    seg_values = []
+    for (start, stop) in runs:
+        seg_tags += tags[start:stop]
+        seg_values += values[start:stop]
+    return Segment.from_arrays(seg_tags, seg_values)
+
+
 class LTree(__List):
     """A list of Segment
 
@@ -845,6 +1184,10 @@ class LTree(__List):
         Initialize a LTree from a file
     write_file(filename)
         Write a file that contains the current instance
+    init_from_binary(filename)
+        Initialize a LTree from a binary file
+    write_binary(filename, nprocs)
+        Write a binary file that contains the current instance
     map(kl, kn)
         Applies function to every element of the current instance
     reduce(k, phi, psi_n, psi_l, psi_r)
@@ -894,44 +1237,9 @@ class LTree(__List):
         m : int
             Variable to define the critical nodes of bt
         """
-
-        def __tv2lv(bt_value):
-            val = bt_value.get_value()
-            res = Segment()
-            res_0 = Segment()
-            if bt_value.is_leaf():
-                res_0.append(val)
-                res.append(res_0)
-            else:  # bt_val.is_node()
-                res_left = Segment(__tv2lv(bt_value.get_left()))
-                res_right = Segment(__tv2lv(bt_value.get_right()))
-                if val.is_critical():
-                    res_0.append(val)
-                    res.append(res_0)
-                    res.extend(res_left)
-                    res.extend(res_right)
-                else:  # val.is_node()
-                    res_0.append(val)
-                    res_0.extend(res_left[0])
-                    res_0.extend(res_right[0])
-                    res.append(res_0)
-                    res.extend(res_left[1:])
-                    res.extend(res_right[1:])
-            return res
-
-        # Get a LTree from a BTree
-        def up_div(n, m_val):
-            return int(n / m_val) + (0 if n % m_val == 0 else 1)
-
-        bt_one = bt.map(lambda x: 1, lambda x: 1)
-        bt_size = bt_one.uacc(lambda x, y, z: x + y + z)
-        bt_tags = bt_size.mapt(lambda x: TAG_LEAF,
-                               lambda x, y, z: TAG_CRITICAL
-                               if up_div(x, m) > up_div(y.get_value(), m)
-                               and up_div(x, m) > up_div(z.get_value(), m)
-                               else TAG_NODE)
-        bt_val = bt.map2(TaggedValue, bt_tags)
-        return LTree(__tv2lv(bt_val))
+        (tags, values, sizes, critical) = linearize(bt, m)
+        return LTree(runs_to_segment(tags, values, runs)
+                     for runs in segment_runs(sizes, critical))
 
     @staticmethod
     def init_from_file(filename, parser=int):
@@ -969,7 +1277,39 @@ class LTree(__List):
             f.write(str(self))
         f.close()
 
-    def map(self, kl, kn):
+    @staticmethod
+    def init_from_binary(filename):
+        """Initialize a LTree from a binary file
+
+        Parameters
+        ----------
+        filename : str
+            The name of the binary file that contains the LTree to instantiate
+        """
+        if filename[-4:] != "." + binfile.EXT_FILE_LTB:
+            filename = filename + "." + binfile.EXT_FILE_LTB
+        _, segments = binfile.load(filename)
+        return LTree([Segment.from_arrays(tags, values) for (tags, values) in segments])
+
+    def write_binary(self, filename, nprocs=1):
+        """Write a binary file that contains the current instance
+
+        The file also contains a distribution of the segments on processors,
+        used when the file is read as a PTree.
+
+        Parameters
+        ----------
+        filename : str
+            The name of the binary file that we want to write the current instance in
+        nprocs : int, optional
+            The number of processors of the distribution. By default, 1
+        """
+        if filename[-4:] != "." + binfile.EXT_FILE_LTB:
+            filename = filename + "." + binfile.EXT_FILE_LTB
+        (distribution, global_index) = distribute_tree(self, nprocs)
+        binfile.save(filename, self, distribution, global_index)
+
+    def map(self, kl, kn, pool=None):
         """Applies function to every element of the current instance
 
         Precondition
@@ -982,14 +1322,14 @@ class LTree(__List):
             Function to apply to every leaf value of the current instance
         kn : callable
             Function to apply to every node value of the current instance
+        pool : :obj:`SegmentPool`, optional
+            A pool of processes computing the local phases. By default, they are computed
+            by the current process
         """
         assert self != [], "map cannot be applied to an empty linearized tree"
-        res = LTree([None] * self.length())
-        for i in range(self.length()):
-            res[i] = self[i].map_local(kl, kn)
-        return res
+        return LTree(apply_segments(pool, "map_local", self, kl, kn))
 
-    def reduce(self, k, phi, psi_n, psi_l, psi_r):
+    def reduce(self, k, phi, psi_n, psi_l, psi_r, contract=False, pool=None):
         """Makes a reduction of the current instance into a single value
 
         The parameters must respect these equalities (closure property):
@@ -1013,16 +1353,24 @@ class LTree(__List):
             A function used to respect the closure property to make partial computation on the left
         psi_r : callable
             A function used to respect the closure property to make partial computation on the right
+        contract : bool, optional
+            If True, the global reduction is a tree contraction (see ``Contraction``),
+            whose independent steps are computed by the processes of pool if it is given
+        pool : :obj:`SegmentPool`, optional
+            A pool of processes computing the local phases. By default, they are computed
+            by the current process
         """
         assert self != [], "reduce cannot be applied to an empty linearized tree"
-        tops = Segment([None] * self.length())
         # We start by doing local reductions on each Segment, representing a sub part of the tree
-        for i in range(self.length()):
-            tops[i] = self[i].reduce_local(k, phi, psi_l, psi_r)
+        tops = Segment(apply_segments(pool, "reduce_local", self, k, phi, psi_l, psi_r))
         # The local reductions are reduced into a single value with reduce_global
+        if contract:
+            contraction = Contraction([top.is_leaf() for top in tops],
+                                      apply=partial(apply_calls, pool))
+            return contraction.reduce(tops.values(), psi_n, psi_l, psi_r)
         return tops.reduce_global(psi_n)
 
-    def uacc(self, k, phi, psi_n, psi_l, psi_r):
+    def uacc(self, k, phi, psi_n, psi_l, psi_r, contract=False, pool=None):
         """Processes an upward accumulation into the current instance
 
         The parameters must respect these equalities (closure property):
@@ -1046,36 +1394,40 @@ class LTree(__List):
             A function used to respect the closure property to make partial computation on the left
         psi_r : callable
             A function used to respect the closure property to make partial computation on the right
+        contract : bool, optional
+            If True, the global accumulation is a tree contraction (see ``Contraction``),
+            whose independent steps are computed by the processes of pool if it is given
+        pool : :obj:`SegmentPool`, optional
+            A pool of processes computing the local phases. By default, they are computed
+            by the current process
         """
         assert self != [], "uacc cannot be applied to an empty linearized tree"
-        gt = Segment([None] * self.length())
-        lt2 = LTree([None] * self.length())
         # We first make a local accumulation to get
         # * Locally non complete accumulated segments
         # * The top value of accumulations, to later pass them for a complete accumulation
-        for i in range(self.length()):
-            (top, res) = self[i].uacc_local(k, phi, psi_l, psi_r)
-            gt[i] = top
-            lt2[i] = res
+        local = apply_segments(pool, "uacc_local", self, k, phi, psi_l, psi_r)
+        gt = Segment([top for (top, _) in local])
+        lt2 = LTree([acc for (_, acc) in local])
 
         # We get real top values of accumulation considering a full linearized tree
-        gt2 = gt.uacc_global(psi_n)
+        if contract:
+            contraction = Contraction([top.is_leaf() for top in gt],
+                                      apply=partial(apply_calls, pool))
+            (_, children) = contraction.uacc(gt.values(), psi_n, psi_l, psi_r)
+        else:
+            (_, children) = gt.uacc_global_children(psi_n)
 
-        res = LTree([None] * gt.length())
         # We update each segment using the real top values calculated previously,
         # the non complete accumulated segments and the initial segments
-        # print(gt2)
-        # print(lt2)
-        for i in range(gt.length()):
-            if gt[i].is_node():
-                lc = gt2.get_left(i).get_value()
-                rc = gt2.get_right(i).get_value()
-                res[i] = self[i].uacc_update(lt2[i], k, lc, rc)
-            else:
-                res[i] = lt2[i]
-        return res
-
-    def dacc(self, gl, gr, c, phi_l, phi_r, psi_u, psi_d):
+        nodes = [i for i in range(gt.length()) if gt[i].is_node()]
+        updates = apply_segments(pool, "uacc_update", [self[i] for i in nodes],
+                                 each=[{"seg2": lt2[i], "k": k, "lc": children[i][0],
+                                        "rc": children[i][1]} for i in nodes])
+        for (i, update) in zip(nodes, updates):
+            lt2[i] = update
+        return lt2
+
+    def dacc(self, gl, gr, c, phi_l, phi_r, psi_u, psi_d, contract=False, pool=None):
         """Processes an downward accumulation into the current instance
 
         The parameters must respect these equalities (closure property):
@@ -1105,31 +1457,38 @@ class LTree(__List):
             A function used to respect the closure property to make partial downward accumulation
         psi_u : callable
             A function used to respect the closure property to make partial computation
+        contract : bool, optional
+            If True, the global accumulation is a tree contraction (see ``Contraction``),
+            whose independent steps are computed by the processes of pool if it is given
+        pool : :obj:`SegmentPool`, optional
+            A pool of processes computing the local phases. By default, they are computed
+            by the current process
         """
         assert self != [], "dacc cannot be applied to an empty linearized tree"
-        gt = Segment([None] * self.length())
-        res = LTree([None] * self.length())
+        gt = Segment([TaggedValue(seg[0].get_value(), "L") for seg in self])
         # We first find the values to pass to sub trees for each segment
         # that contains critical values
         # That is incomplete subtrees (which have node with left and right children not
         # contained in the same segment)
-        for i in range(self.length()):
-            seg = self[i]
-            if seg.has_critical():
-                gt[i] = seg.dacc_path(phi_l, phi_r, psi_u)
-            else:
-                gt[i] = TaggedValue(seg[0].get_value(), "L")
+        nodes = [i for i in range(self.length()) if self[i].has_critical()]
+        paths = apply_segments(pool, "dacc_path", [self[i] for i in nodes], phi_l, phi_r, psi_u)
+        for (i, path) in zip(nodes, paths):
+            gt[i] = path
 
         # We process a global downward accumulation using the initial value of the accumulator
-        gt2 = gt.dacc_global(psi_d, c)
+        if contract:
+            contraction = Contraction([top.is_leaf() for top in gt],
+                                      apply=partial(apply_calls, pool))
+            accs = contraction.dacc(gt.values(), psi_u, psi_d, c)
+        else:
+            accs = gt.dacc_global(psi_d, c).values()
 
         # We finally pass the values of global accumulation to each segment, to update their
         # local accumulation
-        for i in range(gt.length()):
-            res[i] = self[i].dacc_local(gl, gr, gt2[i].get_value())
-        return res
+        return LTree(apply_segments(pool, "dacc_local", self, gl, gr,
+                                    each=[{"c": acc} for acc in accs]))
 
-    def zip(self, lt):
+    def zip(self, lt, pool=None):
         """Zip the values contained in a second LTree with the ones in the current instance
 
         Precondition
@@ -1140,14 +1499,14 @@ class LTree(__List):
         ----------
         lt : :obj:`LTree`
             The LTree to zip with the current instance
+        pool : :obj:`SegmentPool`, optional
+            A pool of processes computing the local phases. By default, they are computed
+            by the current process
         """
         assert self.length() == lt.length(), "The linearized trees have not the same shape"
-        res = LTree([None] * self.length())
-        for i in range(self.length()):
-            res[i] = self[i].zip(lt[i])
-        return res
+        return LTree(apply_segments(pool, "zip", self, each=[{"seg": seg} for seg in lt]))
 
-    def map2(self, f, lt):
+    def map2(self, f, lt, pool=None):
         """Zip the values contained in a second LTree with the ones in the current instance using
         a function
 
@@ -1161,12 +1520,12 @@ class LTree(__List):
             A function to zip values
         lt : :obj:`LTree`
             The LTree to zip with the current instance
+        pool : :obj:`SegmentPool`, optional
+            A pool of processes computing the local phases. By default, they are computed
+            by the current process
         """
-        res = LTree([None] * self.length())
         assert self.length() == lt.length(), "The linearized trees have not the same shape"
-        for i in range(self.length()):
-            res[i] = self[i].map2(f, lt[i])
-        return res
+        return LTree(apply_segments(pool, "map2", self, f, each=[{"seg": seg} for seg in lt]))
 
     def deserialization(self):
         """Get a binary tree from its linear representation
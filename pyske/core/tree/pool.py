@@ -0,0 +1,165 @@
+"""
+Process pool for the local phases of the skeletons of linearized trees
+
+The local phases of the skeletons of a LTree (``Segment.map_local``, ``reduce_local``,
+``uacc_local``, ...) are independent for each segment: they may be computed by the
+processes of a pool, on a single machine, without MPI. The segments are sent to the
+processes by chunks, to amortise the cost of pickling. The global phases are computed
+by the driver, or by a tree contraction whose independent steps are computed by the
+processes of the pool (see ``Contraction``).
+
+The functions given to the skeletons must be picklable, that is defined at the top
+level of a module (not lambdas nor local functions).
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+__all__ = ['SegmentPool', 'apply_segments', 'apply_calls']
+
+# Number of chunks of segments per process, by default
+_CHUNKS_PER_WORKER = 4
+
+
+def _apply_chunk(method, segments, args, each):
+    return [getattr(seg, method)(*args, **kwargs) for (seg, kwargs) in zip(segments, each)]
+
+
+def _call_chunk(calls):
+    return [function(*args) for (function, args) in calls]
+
+
+class SegmentPool:
+    """A class used to apply the methods of segments in a pool of processes
+
+    Attributes
+    ----------
+    __executor: the pool of processes
+    __workers: the number of processes
+    __chunk_size: the number of segments sent at once to a process, or None
+
+    Methods
+    -------
+    apply(method, segments, *args, each=None)
+        Apply a method to segments in the processes of the pool
+    call(calls)
+        Apply independent functions in the processes of the pool
+    shutdown()
+        Stop the processes of the pool
+    """
+
+    def __init__(self, workers=None, chunk_size=None):
+        """
+        Parameters
+        ----------
+        workers : int, optional
+            The number of processes. By default, the number of processors of the machine
+        chunk_size : int, optional
+            The number of segments sent at once to a process. By default, the segments
+            are split in a few chunks per process
+        """
+        assert chunk_size is None or chunk_size > 0
+        self.__workers = workers or os.cpu_count() or 1
+        self.__executor = ProcessPoolExecutor(self.__workers)
+        self.__chunk_size = chunk_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.shutdown()
+
+    def shutdown(self):
+        """Stop the processes of the pool"""
+        self.__executor.shutdown()
+
+    def apply(self, method, segments, *args, each=None):
+        """Apply a method to segments in the processes of the pool
+
+        Parameters
+        ----------
+        method : str
+            The name of a method of Segment
+        segments : list
+            The segments
+        args
+            The arguments of the method common to all the segments
+        each : list, optional
+            For each segment, a dictionary of keyword arguments of the method
+
+        Returns
+        -------
+        The results of the method for each segment
+        """
+        each = [{}] * len(segments) if each is None else each
+        size = self.__size(len(segments))
+        futures = [self.__executor.submit(_apply_chunk, method, segments[start:start + size],
+                                          args, each[start:start + size])
+                   for start in range(0, len(segments), size)]
+        return self.__results(futures)
+
+    def call(self, calls):
+        """Apply independent functions in the processes of the pool
+
+        Parameters
+        ----------
+        calls : list
+            The pairs of a function and of the tuple of its arguments
+
+        Returns
+        -------
+        The results of the calls
+        """
+        size = self.__size(len(calls))
+        futures = [self.__executor.submit(_call_chunk, calls[start:start + size])
+                   for start in range(0, len(calls), size)]
+        return self.__results(futures)
+
+    def __size(self, length):
+        """The number of elements sent at once to a process"""
+        return self.__chunk_size or \
+            max(1, math.ceil(length / (self.__workers * _CHUNKS_PER_WORKER)))
+
+    @staticmethod
+    def __results(futures):
+        res = []
+        for future in futures:
+            res.extend(future.result())
+        return res
+
+
+def apply_segments(pool, method, segments, *args, each=None):
+    """Apply a method to segments, in the processes of a pool if it is not None
+
+    Parameters
+    ----------
+    pool : :obj:`SegmentPool` or None
+        A pool of processes, or None to apply the method in the current process
+    method : str
+        The name of a method of Segment
+    segments : list
+        The segments
+    args
+        The arguments of the method common to all the segments
+    each : list, optional
+        For each segment, a dictionary of keyword arguments of the method
+    """
+    if pool is not None:
+        return pool.apply(method, segments, *args, each=each)
+    each = [{}] * len(segments) if each is None else each
+    return _apply_chunk(method, segments, args, each)
+
+
+def apply_calls(pool, calls):
+    """Apply independent functions, in the processes of a pool if it is not None
+
+    Parameters
+    ----------
+    pool : :obj:`SegmentPool` or None
+        A pool of processes, or None to apply the functions in the current process
+    calls : list
+        The pairs of a function and of the tuple of its arguments
+    """
+    if pool is not None:
+        return pool.call(calls)
+    return _call_chunk(calls)
@@ -0,0 +1,404 @@
+"""
+PRTree Module
+
+A distributed rose tree is stored as the distributed linearization (PTree) of
+its binary encoding (see ``RNode.r2b``): the left child of a node is its first
+child, and its right child is its next sibling. The leaves of the encoding
+contain None.
+
+The skeletons of rose trees are computed by the skeletons of PTree, with
+functions respecting their closure property derived from the operators of
+the rose tree skeletons.
+"""
+from pyske.core.tree.ptree import PTree, GLOBAL_ROOT
+from pyske.core.tree.rtree import RNode, FlatRTree
+from pyske.core.util import fun
+
+# Kinds of the steps of a context
+_F = 0
+_G = 1
+
+
+def _none(_):
+    return None
+
+
+def _first(pair):
+    return pair[0]
+
+
+def _upwards_closure(f, g):
+    """Get the functions of the upward accumulation of the binary encoding of a rose tree
+
+    The value at a node of the encoding is a pair: the reduction of the node in the
+    rose tree, and the combination by g of this reduction with the reductions of its
+    next siblings. The reduction of a node is f applied to its value and to the
+    combination of the reductions of its children.
+
+    A partial accumulation, with a critical node c missing the values x and y of its
+    children in the encoding, is a triple (b, own, siblings): b is the value of c,
+    own and siblings are the contexts giving the two components of the pair of the
+    top node from the second component of the pair of c. own is None when c is the
+    top node. A context is either a constant (True, v) or a composition (False, steps)
+    of the unary functions u -> f(a, u) and u -> g(g(a1, u), a2), applied in order.
+    Consecutive steps of the same kind are merged, so f and g only need to be
+    associative.
+    """
+
+    def combine(a, b):
+        return b if a is None else a if b is None else g(a, b)
+
+    def compose(outer, inner):
+        (outer_const, outer_steps) = outer
+        (inner_const, inner_steps) = inner
+        if outer_const:
+            return outer
+        if inner_const:
+            return True, apply(outer, inner_steps)
+        if not inner_steps or not outer_steps:
+            return False, inner_steps + outer_steps
+        (last, first) = (inner_steps[-1], outer_steps[0])
+        if last[0] != first[0]:
+            return False, inner_steps + outer_steps
+        if last[0] == _F:
+            merged = (_F, f(first[1], last[1]))
+        else:  # last[0] == _G
+            merged = (_G, combine(first[1], last[1]), combine(last[2], first[2]))
+        return False, inner_steps[:-1] + [merged] + outer_steps[1:]
+
+    def apply(context, u):
+        (is_const, steps) = context
+        if is_const:
+            return steps
+        for step in steps:
+            if step[0] == _F:
+                u = f(step[1], u)
+            else:  # step[0] == _G
+                u = combine(combine(step[1], u), step[2])
+        return u
+
+    def next_siblings(r):
+        return (False, []) if r is None else (False, [(_G, None, r[1])])
+
+    def k(l, b, r):
+        own = b if l is None else f(b, l[1])
+        return own, own if r is None else g(own, r[1])
+
+    def phi(b):
+        return b, None, (False, [])
+
+    def psi_n(l, node, r):
+        (b, own, siblings) = node
+        own_c, siblings_c = k(l, b, r)
+        return (own_c if own is None else apply(own, siblings_c)), apply(siblings, siblings_c)
+
+    def psi_l(l, node, r):
+        (b, own, siblings) = node
+        (b_l, _, siblings_l) = l
+        own_c = compose((False, [(_F, b)]), siblings_l)
+        siblings_c = compose(next_siblings(r), own_c)
+        if own is not None:
+            own_c = compose(own, siblings_c)
+        return b_l, own_c, compose(siblings, siblings_c)
+
+    def psi_r(l, node, r):
+        (b, own, siblings) = node
+        (b_r, _, siblings_r) = r
+        own_c = b if l is None else f(b, l[1])
+        siblings_c = compose((False, [(_G, own_c, None)]), siblings_r)
+        own_c = (True, own_c) if own is None else compose(own, siblings_c)
+        return b_r, own_c, compose(siblings, siblings_c)
+
+    return k, phi, psi_n, psi_l, psi_r
+
+
+def _leftwards_closure(f, unit_f):
+    """Get the functions of the leftward accumulation of the binary encoding of a rose tree
+
+    The value at a node of the encoding is a pair: the accumulation of the values of
+    its next siblings, and f applied to its value and to this accumulation.
+
+    A partial accumulation is a pair of forms: a form is either a constant (True, v)
+    or the function (False, a) of the value y of the right child of the critical
+    node, that is f(a, y), where a None coefficient stands for the unit of f.
+    """
+
+    def substitute(form, y):
+        (is_const, a) = form
+        if is_const:
+            return form
+        if y is None:
+            return True, unit_f if a is None else a
+        (y_const, b) = y
+        if a is None:
+            return y_const, b
+        return y_const, a if b is None else f(a, b)
+
+    def constant(pair):
+        return None if pair is None else (True, pair[1])
+
+    def apply(node, y):
+        return substitute(node[0], y), substitute(node[1], y)
+
+    def k(_, b, r):
+        acc = unit_f if r is None else r[1]
+        return acc, f(b, acc)
+
+    def phi(b):
+        return (False, None), (False, b)
+
+    def psi_n(_, node, r):
+        ((_, acc), (_, red)) = apply(node, constant(r))
+        return acc, red
+
+    def psi_l(_, node, r):
+        return apply(node, constant(r))
+
+    def psi_r(_, node, r):
+        return apply(node, r[1])
+
+    return k, phi, psi_n, psi_l, psi_r
+
+
+class PRTree:
+    """A class used to represent a distributed rose tree
+
+    Attributes
+    ----------
+    __ptree: the distributed linearization of the binary encoding of the rose tree
+
+    Methods
+    -------
+    init_from_rt(rt, m, costs=None)
+        Instantiate a distributed rose tree from a RNode or a FlatRTree
+    to_rt()
+        Get a FlatRTree from the current instance, on the root processor
+    map(f)
+        Applies a function to every values contained in the current instance
+    reduce(f, g, closure=None)
+        Reduce the current instance into a single value using two operators
+    uacc(f, g, closure=None)
+        Makes an upward accumulation of the values in the current instance using two operators
+    dacc(f, unit_f)
+        Makes a downward accumulation of the values in the current instance
+    racc(f, unit_f)
+        Makes a rightward accumulation of the values in the current instance
+    lacc(f, unit_f)
+        Makes a leftward accumulation of the values in the current instance
+    zip(rt)
+        Zip the values contained in a second PRTree with the ones in the current instance
+    map2(rt, f)
+        Zip the values contained in a second PRTree with the ones in the current instance
+        using a function
+    """
+
+    def __init__(self, pt=None):
+        self.__ptree = PTree() if pt is None else pt
+
+    @property
+    def ptree(self):
+        """The distributed binary encoding of the current instance"""
+        return self.__ptree
+
+    def __eq__(self, other):
+        if isinstance(other, PRTree):
+            return self.__ptree == other.ptree
+        return False
+
+    def __str__(self):
+        return str(self.__ptree)
+
+    @staticmethod
+    def init_from_rt(rt, m, costs=None):
+        """Instantiate a distributed rose tree
+
+        Parameters
+        ----------
+        rt : :obj:`RNode` or :obj:`FlatRTree`
+            The rose tree to distribute
+        m : int
+            Variable to define the critical nodes of the binary encoding of rt
+        costs : list, optional
+            The cost of each segment, used to distribute them.
+            By default, the length of the segments
+        """
+        if isinstance(rt, RNode):
+            rt = FlatRTree.from_rnode(rt)
+        return PRTree(PTree.init_from_bt(rt.r2b(), m, costs))
+
+    def to_rt(self):
+        """Get a FlatRTree from the current instance on the root processor, None on the others
+        """
+        lt = self.__ptree.to_seq()
+        return None if lt is None else FlatRTree.b2r(lt.deserialization())
+
+    def map(self, f):
+        """Applies a function to every values contained in the current instance
+
+        Parameters
+        ----------
+        f : callable
+            The function to apply to every values of the current instance
+        """
+        return PRTree(self.__ptree.map(fun.idt, f))
+
+    def reduce(self, f, g, global_phase=GLOBAL_ROOT, closure=None):
+        """Reduce the current instance into a single value using two operators
+
+        The operators must be associative. The closure functions of the binary
+        encoding are derived from f and g, unless they are given by closure.
+
+        Parameters
+        ----------
+        f : callable
+            A binary operator to combine the value of a node with the combination
+            of the reductions of its children
+        g : callable
+            A binary operator to combine the reductions of the children of a node
+        global_phase : str, optional
+            GLOBAL_ROOT (default) to get the reduction on the root processor only,
+            the other processors get None, or GLOBAL_ALL to get it on all the processors
+        closure : tuple, optional
+            The functions (k, phi, psi_n, psi_l, psi_r) of ``PTree.reduce`` on the binary
+            encoding, used instead of the ones derived from f and g, for instance to get
+            partial reductions of constant size. The value at a node
+            of the encoding is the pair of the reduction of the node in the rose tree and
+            of the combination by g of this reduction with the reductions of its next
+            siblings; the leaves of the encoding are None
+        """
+        if closure is None:
+            closure = _upwards_closure(f, g)
+        res = self.__ptree.reduce(*closure, global_phase=global_phase)
+        return None if res is None else res[0]
+
+    def uacc(self, f, g, global_phase=GLOBAL_ROOT, closure=None):
+        """Makes an upward accumulation of the values in the current instance using two operators
+
+        The operators must be associative. The closure functions of the binary
+        encoding are derived from f and g, unless they are given by closure.
+
+        Parameters
+        ----------
+        f : callable
+            A binary operator to combine the value of a node with the combination
+            of the accumulations of its children
+        g : callable
+            A binary operator to combine the accumulations of the children of a node
+        global_phase : str, optional
+            Where the global accumulation is computed (see ``PTree.uacc``)
+        closure : tuple, optional
+            The functions (k, phi, psi_n, psi_l, psi_r) of ``PTree.uacc`` on the binary
+            encoding, used instead of the ones derived from f and g (see ``reduce``)
+        """
+        if closure is None:
+            closure = _upwards_closure(f, g)
+        pt = self.__ptree.uacc(*closure, global_phase=global_phase)
+        return PRTree(pt.map(fun.idt, _first))
+
+    def dacc(self, f, unit_f, global_phase=GLOBAL_ROOT):
+        """Makes a downward accumulation of the values in the current instance
+
+        The operator f must be associative.
+
+        Parameters
+        ----------
+        f : callable
+            A function to accumulate the value of a node with its accumulator,
+            giving the accumulator of its children
+        unit_f
+            The accumulator of the root
+        global_phase : str, optional
+            Where the global accumulation is computed (see ``PTree.dacc``)
+        """
+
+        def compose(a, b):
+            return b if a is None else a if b is None else f(a, b)
+
+        def down(c, a):
+            return c if a is None else f(c, a)
+
+        pt = self.__ptree.dacc(f, lambda c, _: c, unit_f, fun.idt, _none, compose, down,
+                               global_phase=global_phase)
+        return PRTree(pt.map(_none, fun.idt))
+
+    def racc(self, f, unit_f, global_phase=GLOBAL_ROOT):
+        """Makes a rightward accumulation of the values in the current instance
+
+        The root gets unit_f, and each other node the accumulation of the
+        values of its left siblings, from left to right. The operator f must
+        be associative.
+
+        Parameters
+        ----------
+        f : callable
+            A function to accumulate the value of a node with the current accumulator
+        unit_f
+            A value such as, forall value, f(value, unit_f) = value
+        global_phase : str, optional
+            Where the global accumulation is computed (see ``PTree.dacc``)
+        """
+
+        # An accumulation function is either a constant (True, c), or (False, a): c -> f(c, a)
+        def compose(upper, lower):
+            if lower[0]:
+                return lower
+            return upper[0], f(upper[1], lower[1])
+
+        def down(c, function):
+            return function[1] if function[0] else f(c, function[1])
+
+        pt = self.__ptree.dacc(lambda c, _: unit_f, f, unit_f,
+                               lambda _: (True, unit_f), lambda a: (False, a),
+                               compose, down, global_phase=global_phase)
+        return PRTree(pt.map(_none, fun.idt))
+
+    def lacc(self, f, unit_f, global_phase=GLOBAL_ROOT):
+        """Makes a leftward accumulation of the values in the current instance
+
+        The root gets unit_f, and each other node the accumulation of the
+        values of its right siblings, from right to left. The operator f must
+        be associative.
+
+        Parameters
+        ----------
+        f : callable
+            A function to accumulate the value of a node with the current accumulator
+        unit_f
+            A value such as, forall value, f(value, unit_f) = value
+        global_phase : str, optional
+            Where the global accumulation is computed (see ``PTree.uacc``)
+        """
+        pt = self.__ptree.uacc(*_leftwards_closure(f, unit_f), global_phase=global_phase)
+        return PRTree(pt.map(fun.idt, _first))
+
+    def zip(self, rt):
+        """Zip the values contained in a second PRTree with the ones in the current instance
+
+        Precondition
+        -------------
+        The two trees should have the same shape and distribution
+
+        Parameters
+        ----------
+        rt : :obj:`PRTree`
+            The PRTree to zip with the current instance
+        """
+        return PRTree(self.__ptree.zip(rt.ptree).map(_none, fun.idt))
+
+    def map2(self, rt, f):
+        """Zip the values contained in a second PRTree with the ones in the current instance
+        using a function
+
+        Precondition
+        -------------
+        The two trees should have the same shape and distribution
+
+        Parameters
+        ----------
+        rt : :obj:`PRTree`
+            The PRTree to zip with the current instance
+        f : callable
+            A function to zip values
+        """
+        # The leaves of the encodings are not given to f
+        return PRTree(self.__ptree.zip(rt.ptree).map(_none, fun.uncurry(f)))
@@ -1,33 +1,27 @@
 """
 PTree Module
 """
-import logging
-
-from pyske.core.tree.ltree import TaggedValue, Segment, LTree
+import itertools
+from operator import add
+
+from pyske.core.tree.ltree import TaggedValue, Segment, LTree, linearize, segment_runs, \
+    runs_to_segment
+from pyske.core.tree import binfile
+from pyske.core.tree.contraction import Contraction
+from pyske.core.support.errors import NotEqualSizeError
 from pyske.core.support.parallel import COMM, PID, NPROCS
-from pyske.core.support.separate import distribute_tree
+from pyske.core.support.separate import distribute_tree, linear_partition, index_segments
 from pyske.core.list.slist import SList
-from pyske.core.util import par
-
-TAG_BASE = "270995"
-TAG_COMM_REDUCE = int(TAG_BASE + "11")
-TAG_COMM_UACC_1 = int(TAG_BASE + "21")
-TAG_COMM_UACC_2 = int(TAG_BASE + "22")
-TAG_COMM_DACC_1 = int(TAG_BASE + "31")
-TAG_COMM_DACC_2 = int(TAG_BASE + "32")
-TAG_COMM_MERGE = int(TAG_BASE + "00")
-TAG_TO_SEQ = int(TAG_BASE + "01")
-
-logging.basicConfig(filename='run_ptree.log', level=logging.DEBUG)
-with open('run_ptree.log', 'w'):
-    pass
-logger = logging.getLogger('ptree')
-logger.setLevel(logging.DEBUG)
-ch = logging.StreamHandler()
-ch.setLevel(logging.DEBUG)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(funcName)s - %(levelname)s - %(message)s')
-ch.setFormatter(formatter)
-logger.addHandler(ch)
+from pyske.core.util import trace
+
+# Where the global phase of reduce, uacc and dacc is computed:
+# on the root processor only, on all the processors, or by a tree contraction
+# distributed on all the processors (see ``Contraction``)
+GLOBAL_ROOT = "root"
+GLOBAL_ALL = "all"
+GLOBAL_CONTRACT = "contract"
+
+_CATEGORY = "ptree"
 
 
 class PTree:
@@ -40,17 +34,23 @@ class PTree:
     __global_index: num seg -> (start, offset)
     __start_index: index of first index for the current PID in global_index
     __nb_segs: nb of indexes for the current PID in global_index
-    __content: concatenation of the segments contained in the current instance
+    __content: concatenation of the segments contained in the current instance (a Segment)
+
+    The skeletons work on views of the segments in __content (see ``Segment.view``), and
+    write their results in place into a new content.
+
+    When built from a LTree, the segments are distributed to minimise the maximum cost
+    of a processor; the optional ``costs`` are those of ``separate.distribute_tree``.
     """
 
-    def __init__(self, lt=None):
+    def __init__(self, lt=None, costs=None):
         self.__distribution = SList([])
         self.__global_index = SList([])
         self.__start_index = 0
         self.__nb_segs = 0
-        self.__content = SList([])
+        self.__content = Segment()
         if lt is not None:
-            (distribution, global_index) = distribute_tree(lt, NPROCS)
+            (distribution, global_index) = distribute_tree(lt, NPROCS, costs)
             self.__distribution = distribution
             self.__global_index = global_index
             self.__start_index = distribution.scanl(lambda x, y: x + y, 0)[PID]
@@ -58,6 +58,21 @@ class PTree:
             for i_seg in range(self.__start_index, self.__start_index + self.__nb_segs):
                 self.__content.extend(lt[i_seg])
 
+    def __local_index(self):
+        """Get the start and offset in __content of the segments of the current processor"""
+        return self.__global_index[self.__start_index: self.__start_index + self.__nb_segs]
+
+    def __segments(self, content=None):
+        """Get views of the segments of the current processor in a content (by default __content)
+        """
+        content = self.__content if content is None else content
+        return [content.view(start, start + offset) for (start, offset) in self.__local_index()]
+
+    def __new_content(self):
+        """Get a content of the same length as __content, to write the result of a skeleton"""
+        length = self.__content.length()
+        return Segment.from_arrays(bytearray(length), [None] * length)
+
     @property
     def distribution(self):
         """Distribution getter"""
@@ -111,7 +126,7 @@ class PTree:
     def __eq__(self, other):
         if isinstance(other, PTree):
             return self.__distribution == other.distribution \
-                   and self.__global_index == other.distribution \
+                   and self.__global_index == other.global_index \
                    and self.__start_index == other.start_index \
                    and self.__nb_segs == other.nb_segs \
                    and self.__content == other.content
@@ -159,7 +174,7 @@ class PTree:
             return int(ss[0]), int(ss[1])
 
         p = PTree()
-        content = SList([])
+        content = Segment()
         with open(filename, "r") as f:
             count_line = 0
             for line in f:
@@ -179,6 +194,101 @@ class PTree:
         p.content = content
         return p
 
+    @staticmethod
+    def init_from_bt(bt, m, costs=None):
+        """Instantiate a distributed tree from a BTree, without building the whole LTree
+
+        Each processor linearizes the BTree, but only builds its own segments.
+
+        Parameters
+        ----------
+        bt : :obj:`BTree`
+            The BTree to distribute
+        m : int
+            Variable to define the critical nodes of bt
+        costs : list, optional
+            The cost of each segment, used to distribute them.
+            By default, the length of the segments
+        """
+        (tags, values, sizes, critical) = linearize(bt, m)
+        runs = segment_runs(sizes, critical)
+        lengths = [sum(stop - start for (start, stop) in seg_runs) for seg_runs in runs]
+        distribution = linear_partition(lengths if costs is None else costs, NPROCS)
+        p = PTree()
+        p.distribution = distribution
+        p.global_index = index_segments(distribution, lengths)
+        p.start_index = distribution.scanl(add, 0)[PID]
+        p.nb_segs = distribution[PID]
+        content = Segment()
+        for seg_runs in runs[p.start_index:p.start_index + p.nb_segs]:
+            content.extend(runs_to_segment(tags, values, seg_runs))
+        p.content = content
+        return p
+
+    @staticmethod
+    def init_from_binary(filename):
+        """Instantiate a distributed tree from a binary file
+
+        Each processor maps the file in memory, and only reads its own segments.
+
+        Parameters
+        ----------
+        filename : str
+            The name of the binary file that contains the PTree to instantiate
+
+        Raises
+        ------
+        NotEqualSizeError
+            If the file contains a distribution for another number of processors
+        """
+        if filename[-4:] != "." + binfile.EXT_FILE_LTB:
+            filename = filename + "." + binfile.EXT_FILE_LTB
+
+        def __select(layout):
+            if len(layout.distribution) != NPROCS:
+                raise NotEqualSizeError("The file contains a distribution for " +
+                                        str(len(layout.distribution)) + " processors")
+            return sum(layout.distribution[:PID]), layout.distribution[PID]
+
+        layout, segments = binfile.load(filename, __select)
+        p = PTree()
+        p.distribution = SList(layout.distribution)
+        p.global_index = SList(layout.global_index)
+        p.start_index = p.distribution.scanl(add, 0)[PID]
+        p.nb_segs = p.distribution[PID]
+        content = Segment()
+        for (tags, values) in segments:
+            content.extend(Segment.from_arrays(tags, values))
+        p.content = content
+        return p
+
+    def write_binary(self, filename):
+        """Write a binary file that contains the current instance
+
+        Each processor writes its own segments in the file.
+
+        Parameters
+        ----------
+        filename : str
+            The name of the binary file that we want to write the current instance in
+        """
+        if filename[-4:] != "." + binfile.EXT_FILE_LTB:
+            filename = filename + "." + binfile.EXT_FILE_LTB
+        segments = self.__segments()
+        local_code = binfile.common_code(binfile.value_code(seg.values()) for seg in segments)
+        code = binfile.common_code(COMM.allgather(local_code)) or 'q'
+        blobs = [binfile.encode(code, seg.values()) for seg in segments]
+        sizes = itertools.chain.from_iterable(COMM.allgather([len(blob) for blob in blobs]))
+        layout = binfile.Layout(code, self.__distribution, self.__global_index, list(sizes))
+        if PID == 0:
+            with open(filename, "wb") as file:
+                file.write(layout.header())
+                file.truncate(layout.size)
+        COMM.barrier()
+        with open(filename, "r+b") as file:
+            binfile.write_segments(file, layout, self.__start_index, segments, blobs)
+        COMM.barrier()
+
     def __str__(self):
         return "PID[" + str(PID) + "]:\n" + \
                "  global_index: " + str(self.__global_index) + "\n" + \
@@ -191,9 +301,7 @@ class PTree:
         """Browse the linearized distributed tree contained in the current processor
         """
         res = "PID[" + str(PID) + "] "
-        for (start, offset) in \
-                self.__global_index[self.__start_index: self.__start_index + self.__nb_segs]:
-            seg = Segment(self.__content[start:start + offset])
+        for seg in self.__segments():
             res = res + "\n   " + str(seg)
         return res
 
@@ -207,21 +315,14 @@ class PTree:
         kn : callable
             Function to apply to every node value of the current instance
         """
-        content = SList([None] * self.__content.length())
-        logger.debug(
-            '[START] PID[%s] map skeleton', PID)
-        for (start, offset) in \
-                self.__global_index[self.__start_index: self.__start_index + self.__nb_segs]:
-            logger.debug('[START] PID[%s] map_local from %s to %s', PID, start, start + offset)
-            content[start:start + offset] = Segment(self.__content[start:start +
-                                                    offset]).map_local(kl, kn)
-            logger.debug('[END] PID[%s] map_local from %s to %s', PID, start, start + offset)
+        # The segments are consecutive in the content: they are all mapped at once
+        with trace.span("map.local", _CATEGORY):
+            content = self.__content.map_local(kl, kn)
         res = PTree.init(self, content)
-        logger.debug('[END] PID[%s] map skeleton', PID)
         return res
 
     # pylint: disable=too-many-arguments
-    def reduce(self, k, phi, psi_n, psi_l, psi_r):
+    def reduce(self, k, phi, psi_n, psi_l, psi_r, global_phase=GLOBAL_ROOT):
         """Reduce skeleton for distributed tree
 
         The parameters must respect these equalities (closure property):
@@ -241,99 +342,95 @@ class PTree:
             A function used to respect the closure property to make partial computation on the left
         psi_r : callable
             A function used to respect the closure property to make partial computation on the right
+        global_phase : str, optional
+            GLOBAL_ROOT (default) to compute the global reduction on the root processor only,
+            the other processors get None, GLOBAL_ALL to compute it on all the processors,
+            or GLOBAL_CONTRACT to compute it by a distributed tree contraction, all the
+            processors get the reduction
         """
-        logger.debug('[START] PID[%s] reduce skeleton', PID)
         # Step 1 : Local Reduction
-        gt = Segment([None] * self.__nb_segs)
-        i = 0
-        for (start, offset) in \
-                self.__global_index[self.__start_index: self.__start_index + self.__nb_segs]:
-            logger.debug('[START] PID[%s] reduce_local from %s to %s', PID, start, start + offset)
-            gt[i] = Segment(self.__content[start:start + offset]).reduce_local(k, phi, psi_l, psi_r)
-            logger.debug('[END] PID[%s] reduce_local from %s to %s', PID, start, start + offset)
-            i = i + 1
+        with trace.span("reduce.local", _CATEGORY):
+            gt = Segment([None] * self.__nb_segs)
+            for (i, seg) in enumerate(self.__segments()):
+                gt[i] = seg.reduce_local(k, phi, psi_l, psi_r)
+        if global_phase == GLOBAL_CONTRACT:
+            with trace.span("reduce.contract", _CATEGORY):
+                contraction = self.__contraction(gt)
+                res = contraction.reduce(gt.values(), psi_n, psi_l, psi_r)
+                res = COMM.bcast(res, root=contraction.final_owner())
+            return res
         # Step 2 : Gather local Results
-        self.__gather_local_result(gt, i, TAG_COMM_UACC_1)
+        with trace.span("reduce.gather", _CATEGORY):
+            gt = self.__gather_local_result(gt, global_phase)
         # Step 3 : Global Reduction
-        par.at_root(lambda: logger.debug('[START] PID[%s] reduce_global', PID))
-        res = gt.reduce_global(psi_n) if PID == 0 else None
-        par.at_root(lambda: logger.debug('[END] PID[%s] reduce_global', PID))
-        logger.debug('[END] PID[%s] reduce skeleton', PID)
+        with trace.span("reduce.global", _CATEGORY):
+            res = gt.reduce_global(psi_n) if gt is not None else None
         return res
 
+    def __contraction(self, gt):
+        """Get the tree contraction of the global structure, distributed as the segments"""
+        leaves = itertools.chain.from_iterable(COMM.allgather([top.is_leaf() for top in gt]))
+        return Contraction(list(leaves), self.__distribution, PID, COMM.alltoall)
+
     def __local_upwards_accumulation(self, k, phi, psi_l, psi_r):
         gt = Segment([None] * self.__nb_segs)
-        lt2 = SList([None] * self.__nb_segs)
-        i = 0
-        for (start, offset) in \
-                self.__global_index[self.__start_index: self.__start_index + self.__nb_segs]:
-            logger.debug('[START] PID[%s] uacc_local from %s to %s', PID, start, start + offset)
-            (top, res) = Segment(self.__content[start:start +
-                                                offset]).uacc_local(k, phi, psi_l, psi_r)
-            logger.debug('[END] PID[%s] uacc_local from %s to %s', PID, start, start + offset)
-            gt[i] = top
-            lt2[i] = res
-            i = i + 1
-        return i, gt, lt2
+        content = self.__new_content()
+        for (i, (seg, out)) in enumerate(zip(self.__segments(), self.__segments(content))):
+            (gt[i], _) = seg.uacc_local(k, phi, psi_l, psi_r, out)
+        return gt, content
 
     @staticmethod
-    def __gather_local_result(gt, i, tag):
-        if PID == 0:
-            for iproc in range(1, NPROCS):
-                logger.debug('[START] PID[%s] reception local from %s', PID, i)
-                gt.extend(COMM.recv(source=iproc, tag=tag)['c'])
-                logger.debug('[END] PID[%s] reception local from %s', PID, i)
+    def __gather_local_result(gt, global_phase):
+        """Collects the local results of all the processors, in the order of the segments
+
+        Returns None on the processors that do not compute the global phase"""
+        local = (gt.tags(), gt.values())
+        if global_phase == GLOBAL_ALL:
+            parts = COMM.allgather(local)
         else:
-            logger.debug('[START] PID[%s] emission local to %s', PID, 0)
-            COMM.send({'c': gt}, dest=0, tag=tag)
-            logger.debug('[END] PID[%s] emission local to %s', PID, 0)
+            assert global_phase == GLOBAL_ROOT, "Unknown global phase: " + str(global_phase)
+            parts = COMM.gather(local, root=0)
+        res = None
+        if parts is not None:
+            res = Segment()
+            for (tags, values) in parts:
+                res.extend(Segment.from_arrays(tags, values))
+        return res
 
     @staticmethod
     def __global_upwards_accumulation(psi_n, gt):
         gt2 = None
-        if PID == 0:
-            par.at_root(lambda: logger.debug('[START] PID[%s] uacc_global', PID))
-            gt2 = gt.uacc_global(psi_n)
-            for i, _ in enumerate(gt2):
-                if gt2[i].is_node():
-                    gt2[i] = TaggedValue((gt2.get_left(i).get_value(),
-                                          gt2.get_right(i).get_value()), gt2[i].get_tag())
-            par.at_root(lambda: logger.debug('[END] PID[%s] uacc_global', PID))
+        if gt is not None:
+            (gt2, children) = gt.uacc_global_children(psi_n)
+            for i, pair in enumerate(children):
+                if pair is not None:
+                    gt2[i] = TaggedValue(pair, gt2[i].get_tag())
         return gt2
 
-    def __distribute_global_result(self, gt2, tag):
-        start = 0
-        if PID == 0:
-            for iproc in range(NPROCS):
-                iproc_off = self.__distribution[iproc]
-                if iproc != 0:
-                    logger.debug('[START] PID[%s] emission global to %s', PID, iproc)
-                    COMM.send({'g': gt2[start: start + iproc_off]}, dest=iproc, tag=tag)
-                    logger.debug('[END] PID[%s] emission global to %s', PID, iproc)
-                start = start + iproc_off
+    def __distribute_global_result(self, gt2, global_phase):
+        """Gives to each processor the global results of its segments"""
+        if global_phase == GLOBAL_ALL:
+            # Every processor has all the global results
+            res = gt2[self.__start_index:self.__start_index + self.__nb_segs]
         else:
-            logger.debug('[START] PID[%s] reception global from %s', PID, 0)
-            gt2 = COMM.recv(source=0, tag=tag)['g']
-            logger.debug('[END] PID[%s] reception global from %s', PID, 0)
-        return gt2
+            parts = None
+            if PID == 0:
+                starts = self.__distribution.scanl(add, 0)
+                parts = [(gt2.tags()[start:start + nb_segs], gt2.values()[start:start + nb_segs])
+                         for (start, nb_segs) in zip(starts, self.__distribution)]
+            (tags, values) = COMM.scatter(parts, root=0)
+            res = Segment.from_arrays(tags, values)
+        return res
 
-    def __local_updates(self, gt, gt2, lt2, k):
-        content = SList([None] * self.__content.length())
-        for i in range(len(self.__global_index[self.__start_index: self.__start_index +
-                                               self.__nb_segs])):
-            (start, offset) = self.__global_index[self.__start_index: self.__start_index +
-                                                  self.__nb_segs][i]
-            logger.debug('[START] PID[%s] uacc_update from %s to %s', PID, start, start + offset)
+    def __local_updates(self, gt, gt2, content, k):
+        # The segments of the local accumulation are updated in place
+        for (i, (seg, acc)) in enumerate(zip(self.__segments(), self.__segments(content))):
             if gt[i].is_node():
                 (lc, rc) = gt2[i].get_value()
-                val = Segment(self.__content[start:start + offset]).uacc_update(lt2[i], k, lc, rc)
-            else:
-                val = lt2[i]
-            logger.debug('[END] PID[%s] uacc_update from %s to %s', PID, start, start + offset)
-            content[start:start + offset] = val
+                seg.uacc_update(acc, k, lc, rc, acc)
         return content
 
-    def uacc(self, k, phi, psi_n, psi_l, psi_r):
+    def uacc(self, k, phi, psi_n, psi_l, psi_r, global_phase=GLOBAL_ROOT):
         """Upward accumulation skeleton for distributed tree
 
         The parameters must respect these equalities (closure property):
@@ -353,29 +450,42 @@ class PTree:
             A function used to respect the closure property to make partial computation on the left
         psi_r : callable
             A function used to respect the closure property to make partial computation on the right
+        global_phase : str, optional
+            GLOBAL_ROOT (default) to compute the global accumulation on the root processor only,
+            GLOBAL_ALL to compute it on all the processors, or GLOBAL_CONTRACT to compute
+            it by a distributed tree contraction
         """
-        logger.debug('[START] PID[%s] uAcc skeleton', PID)
         assert self.__distribution != []
         # Step 1 : Local Upwards Accumulation
-        i, gt, lt2 = self.__local_upwards_accumulation(k, phi, psi_l, psi_r)
-
-        # Step 2 : Gather local Results
-        self.__gather_local_result(gt, i, TAG_COMM_UACC_1)
+        with trace.span("uacc.local", _CATEGORY):
+            gt, lt2 = self.__local_upwards_accumulation(k, phi, psi_l, psi_r)
+
+        if global_phase == GLOBAL_CONTRACT:
+            # Steps 2 to 4 : each processor gets the values of the children of its segments
+            with trace.span("uacc.contract", _CATEGORY):
+                (_, children) = self.__contraction(gt).uacc(gt.values(), psi_n, psi_l, psi_r)
+                gt2 = Segment.from_arrays(gt.tags(), children)
+        else:
+            # Step 2 : Gather local Results
+            with trace.span("uacc.gather", _CATEGORY):
+                gt_all = self.__gather_local_result(gt, global_phase)
 
-        # Step 3 : Global Upward Accumulation
-        gt2 = self.__global_upwards_accumulation(psi_n, gt)
+            # Step 3 : Global Upward Accumulation
+            with trace.span("uacc.global", _CATEGORY):
+                gt2 = self.__global_upwards_accumulation(psi_n, gt_all)
 
-        # Step 4 : Distributing Global Result
-        gt2 = self.__distribute_global_result(gt2, TAG_COMM_UACC_2)
+            # Step 4 : Distributing Global Result
+            with trace.span("uacc.distribute", _CATEGORY):
+                gt2 = self.__distribute_global_result(gt2, global_phase)
 
         # Step 5 : Local Updates
-        content = self.__local_updates(gt, gt2, lt2, k)
+        with trace.span("uacc.update", _CATEGORY):
+            content = self.__local_updates(gt, gt2, lt2, k)
 
         res = PTree.init(self, content)
-        logger.debug('[END] PID[%s] uAcc skeleton', PID)
         return res
 
-    def dacc(self, gl, gr, c, phi_l, phi_r, psi_u, psi_d):
+    def dacc(self, gl, gr, c, phi_l, phi_r, psi_u, psi_d, global_phase=GLOBAL_ROOT):
         """Downward accumulation skeleton for distributed tree
 
         The parameters must respect these equalities (closure property):
@@ -401,40 +511,40 @@ class PTree:
             A function used to respect the closure property to make partial downward accumulation
         psi_u : callable
             A function used to respect the closure property to make partial computation
+        global_phase : str, optional
+            GLOBAL_ROOT (default) to compute the global accumulation on the root processor only,
+            GLOBAL_ALL to compute it on all the processors, or GLOBAL_CONTRACT to compute
+            it by a distributed tree contraction
         """
-        logger.debug('[START] PID[%s] dAcc skeleton', PID)
         # Step 1 : Computing Local Intermediate Values
-        gt = Segment([None] * self.__nb_segs)
-        i = 0
-        for (start, offset) in \
-                self.__global_index[self.__start_index: self.__start_index + self.__nb_segs]:
-            seg = Segment(self.__content[start:start + offset])
-            logger.debug('[START] PID[%s] dacc_path from %s to %s', PID, start, start + offset)
-            if seg.has_critical():
-                gt[i] = seg.dacc_path(phi_l, phi_r, psi_u)
-            else:
-                gt[i] = TaggedValue(seg[0].get_value(), "L")
-            logger.debug('[END] PID[%s] dacc_path from %s to %s', PID, start, start + offset)
-            i = i + 1
-        # Step 2 : Gather Local Results
-        self.__gather_local_result(gt, i, TAG_COMM_DACC_1)
-        # Step 3 : Global Downward Accumulation
-        par.at_root(lambda: logger.debug('[START] PID[%s] dacc_global', PID))
-        gt2 = (gt.dacc_global(psi_d, c) if PID == 0 else None)
-        par.at_root(lambda: logger.debug('[END] PID[%s] dacc_global', PID))
-        # Step 4 : Distributing Global Result
-        gt2 = self.__distribute_global_result(gt2, TAG_COMM_DACC_2)
+        with trace.span("dacc.local", _CATEGORY):
+            gt = Segment([None] * self.__nb_segs)
+            segments = self.__segments()
+            for (i, seg) in enumerate(segments):
+                if seg.has_critical():
+                    gt[i] = seg.dacc_path(phi_l, phi_r, psi_u)
+                else:
+                    gt[i] = TaggedValue(seg[0].get_value(), "L")
+        if global_phase == GLOBAL_CONTRACT:
+            # Steps 2 to 4 : each processor gets the accumulated values of its segments
+            with trace.span("dacc.contract", _CATEGORY):
+                accs = self.__contraction(gt).dacc(gt.values(), psi_u, psi_d, c)
+                gt2 = Segment.from_arrays(gt.tags(), accs)
+        else:
+            # Step 2 : Gather Local Results
+            with trace.span("dacc.gather", _CATEGORY):
+                gt = self.__gather_local_result(gt, global_phase)
+            # Step 3 : Global Downward Accumulation
+            with trace.span("dacc.global", _CATEGORY):
+                gt2 = (gt.dacc_global(psi_d, c) if gt is not None else None)
+            # Step 4 : Distributing Global Result
+            with trace.span("dacc.distribute", _CATEGORY):
+                gt2 = self.__distribute_global_result(gt2, global_phase)
         # Step 5 : Local Downward Accumulation
-        content = SList([None] * self.__content.length())
-        for i in range(len(self.__global_index[self.__start_index: self.__start_index +
-                                               self.__nb_segs])):
-            (start, offset) = self.__global_index[self.__start_index: self.__start_index +
-                                                  self.__nb_segs][i]
-            logger.debug('[START] PID[%s] dacc_local from %s to %s', PID, start, start + offset)
-            content[start:start + offset] = \
-                Segment(self.__content[start:start + offset]).dacc_local(gl, gr, gt2[i].get_value())
-            logger.debug('[END] PID[%s] dacc_local from %s to %s', PID, start, start + offset)
-        logger.debug('[END] PID[%s] dAcc skeleton', PID)
+        with trace.span("dacc.update", _CATEGORY):
+            content = self.__new_content()
+            for (i, (seg, out)) in enumerate(zip(segments, self.__segments(content))):
+                seg.dacc_local(gl, gr, gt2[i].get_value(), out)
         return PTree.init(self, content)
 
     def zip(self, pt: 'PTree'):
@@ -449,19 +559,11 @@ class PTree:
         pt : :obj:`PTree`
             The PTree to zip with the current instance
         """
-        logger.debug('[START] PID[%s] zip skeleton', PID)
         assert self.__distribution == pt.distribution
-        content = SList([None] * self.__content.length())
-        for i in range(len(self.__global_index[self.__start_index: self.__start_index +
-                                               self.__nb_segs])):
-            (start, offset) = self.__global_index[self.__start_index: self.__start_index +
-                                                  self.__nb_segs][i]
-            logger.debug('[START] PID[%s] zip_local from %s to %s', PID, start, start + offset)
-            content[start:start + offset] = Segment(self.__content[start:start + offset]). \
-                zip(Segment(pt.content[start:start + offset]))
-            logger.debug('[END] PID[%s] zip_local from %s to %s', PID, start, start + offset)
+        # The segments are consecutive in the contents: they are all zipped at once
+        with trace.span("zip.local", _CATEGORY):
+            content = self.__content.zip(pt.content)
         res = PTree.init(self, content)
-        logger.debug('[END] PID[%s] zip skeleton', PID)
         return res
 
     def map2(self, f, pt):
@@ -478,19 +580,11 @@ class PTree:
         f : callable
             A function to zip values
         """
-        logger.debug('[START] PID[%s] map2 skeleton', PID)
         assert self.__distribution == pt.distribution
-        content = SList([None] * self.__content.length())
-        for i in range(len(self.__global_index[self.__start_index: self.__start_index +
-                                               self.__nb_segs])):
-            (start, offset) = self.__global_index[self.__start_index: self.__start_index +
-                                                  self.__nb_segs][i]
-            logger.debug('[START] PID[%s] map2_local from %s to %s', PID, start, start + offset)
-            content[start:start + offset] = Segment(self.__content[start:start + offset]). \
-                map2(f, Segment(pt.content[start:start + offset]))
-            logger.debug('[END] PID[%s] map2_local from %s to %s', PID, start, start + offset)
+        # The segments are consecutive in the contents: they are all mapped at once
+        with trace.span("map2.local", _CATEGORY):
+            content = self.__content.map2(f, pt.content)
         res = PTree.init(self, content)
-        logger.debug('[END] PID[%s] map2 skeleton', PID)
         return res
 
     def get_full_index(self):
@@ -502,17 +596,16 @@ class PTree:
         return SList(self.__global_index.scanr(f))
 
     def to_seq(self):
-        full_content = []
+        with trace.span("to_seq.gather", _CATEGORY):
+            parts = COMM.gather((self.__content.tags(), self.__content.values()), root=0)
         if PID == 0:
             full_index = self.get_full_index()
             res = LTree([None] * full_index.length())
-            full_content.extend(self.__content)
-            for iproc in range(1, NPROCS):
-                full_content.extend(COMM.recv(source=iproc, tag=TAG_TO_SEQ)['c'])
-
+            full_content = Segment()
+            for (tags, values) in parts:
+                full_content.extend(Segment.from_arrays(tags, values))
             for i in range(full_index.length()):
                 (start, offset) = full_index[i]
                 res[i] = full_content[start:start + offset]
             return res
-        COMM.send({'c': self.__content}, dest=0, tag=TAG_TO_SEQ)
         return None
@@ -199,9 +199,14 @@ class RNode:
             A binary operator to combine the value of the current instance with the intermediate
             accumulation
         """
-        v = self.reduce(f, g)
         ch = self.children.map(lambda x: x.uacc(f, g))
-        return RNode(v, ch)
+        if not ch:
+            return RNode(self.get_value(), ch)
+        # The reductions of the children are the values at the roots of their accumulations
+        red = ch[0].get_value()
+        for i in range(1, ch.length()):
+            red = g(red, ch[i].get_value())
+        return RNode(f(self.get_value(), red), ch)
 
     def dacc(self, f, unit_f):
         """Makes an downward accumulation of the values in a the current instance
@@ -240,7 +245,7 @@ class RNode:
         assert ch1.length() == ch2.length(), "The rose trees cannot be zipped (not the same shape)"
         ch = SList([])
         for i in range(0, ch1.length()):
-            ch.append(ch1[i].zip(ch2))
+            ch.append(ch1[i].zip(ch2[i]))
         v = (self.get_value(), rt.get_value())
         return RNode(v, ch)
 
@@ -264,7 +269,7 @@ class RNode:
         assert ch1.length() == ch2.length(), "The rose trees cannot be zipped (not the same shape)"
         ch = SList([])
         for i in range(0, ch1.length()):
-            ch.append(ch1[i].map2(ch2, f))
+            ch.append(ch1[i].map2(ch2[i], f))
         v = f(self.get_value(), rt.get_value())
         return RNode(v, ch)
 
@@ -336,3 +341,341 @@ class RNode:
             return r2b1(h, t)
 
         return r2b1(self, SList())
+
+
+class FlatRTree:
+    """
+    A class used to represent a Rose Tree stored in flat arrays
+
+    The values of the nodes are stored in prefix order, with the size of their
+    subtree. The children of the node at index i are at index i + 1 (its first
+    child, if the size of its subtree is greater than 1), and then at the
+    index following the subtree of the previous child, up to i + sizes[i].
+
+    All the skeletons are iterative, and run in time linear in the number of nodes:
+    they can be used on trees too deep or too large for the skeletons of RNode.
+
+    ...
+
+    Methods
+    -------
+    from_rnode(rt)
+        Create a FlatRTree from a RNode
+    to_rnode()
+        Get a RNode from the current instance
+    b2r(bt)
+        Create a FlatRTree from a BTree
+    r2b()
+        Get a BTree from the current instance
+    length()
+        Get the number of nodes of the current instance
+    get_values()
+        Get the values of the nodes of the current instance in prefix order
+    get_sizes()
+        Get the sizes of the subtrees of the nodes of the current instance in prefix order
+    children(i)
+        Get the indices of the children of a node
+    map(f)
+        Applies a function to every values contained in the current instance
+    reduce(f, g)
+        Reduce the current instance into a single value using two operators
+    uacc(f, g)
+        Makes an upward accumulation of the values in a the current instance using two operators
+    dacc(f, unit_f)
+        Makes an downward accumulation of the values in a the current instance
+    zip(rt)
+        Zip the values contained in a second FlatRTree with the ones in the current instance
+    map2(rt, f)
+        Zip the values contained in a second FlatRTree with the ones in the current instance
+        using a function
+    racc(f, unit_f)
+        Makes a rightward accumulation of the values in the current instance
+    lacc(f, unit_f)
+        Makes a leftward accumulation of the values in the current instance
+    """
+
+    def __init__(self, values, sizes):
+        assert len(values) == len(sizes) and len(values) > 0, \
+            "A FlatRTree needs a size for each of its values, and at least one value"
+        assert sizes[0] == len(sizes), "The first node of a FlatRTree must be its root"
+        self.__values = values if isinstance(values, list) else list(values)
+        self.__sizes = sizes if isinstance(sizes, list) else list(sizes)
+
+    @staticmethod
+    def from_rnode(rt):
+        """Create a FlatRTree from a RNode
+
+        Parameters
+        ----------
+        rt : :obj:`RNode`
+            The rose tree to store in flat arrays
+        """
+        values = []
+        sizes = []
+        # An integer in the stack marks the end of the subtree of the node at this index
+        stack = [rt]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, int):
+                sizes[current] = len(values) - current
+                continue
+            stack.append(len(values))
+            values.append(current.get_value())
+            sizes.append(1)
+            stack.extend(reversed(current.get_children()))
+        return FlatRTree(values, sizes)
+
+    def to_rnode(self):
+        """Get a RNode from the current instance
+        """
+        nodes = [None] * len(self.__values)
+        for i in range(len(self.__values) - 1, -1, -1):
+            nodes[i] = RNode(self.__values[i], [nodes[c] for c in self.children(i)])
+        return nodes[0]
+
+    @staticmethod
+    def b2r(bt):
+        """Create a FlatRTree from a BTree
+
+        The left child of a node of the BTree is its first child in the rose
+        tree, and its right child is its next sibling (see ``RNode.r2b``).
+
+        Parameters
+        ----------
+        bt : :obj:`BTree`
+            The binary tree to transform
+
+        Raises
+        ------
+        ConstructorError
+            If the binary tree is a single leaf containing None
+        """
+        if bt.is_leaf() and bt.get_value() is None:
+            raise ConstructorError("A RTree cannot be constructed from a single Leaf that "
+                                   "contains None")
+        values = []
+        sizes = []
+        # The siblings of the root are ignored.
+        # An integer in the stack marks the end of the first children of the node at this index
+        stack = [bt if bt.is_leaf() else Node(bt.get_value(), bt.get_left(), Leaf(None))]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, int):
+                sizes[current] = len(values) - current
+            elif current.is_leaf():
+                if current.get_value() is not None:
+                    values.append(current.get_value())
+                    sizes.append(1)
+            else:
+                stack.append(current.get_right())
+                stack.append(len(values))
+                values.append(current.get_value())
+                sizes.append(1)
+                stack.append(current.get_left())
+        return FlatRTree(values, sizes)
+
+    def r2b(self):
+        """Get a BTree from the current instance
+        """
+        trees = [None] * len(self.__values)
+        ends = self.__sibling_ends()
+        for i in range(len(self.__values) - 1, -1, -1):
+            first = i + 1
+            left = trees[first] if self.__sizes[i] > 1 else Leaf(None)
+            sibling = i + self.__sizes[i]
+            right = trees[sibling] if sibling < ends[i] else Leaf(None)
+            trees[i] = Node(self.__values[i], left, right)
+        return trees[0]
+
+    def __sibling_ends(self):
+        """Get, for each node, the end of the subtree of its parent"""
+        ends = [len(self.__values)] * len(self.__values)
+        for i in range(len(self.__values)):
+            for child in self.children(i):
+                ends[child] = i + self.__sizes[i]
+        return ends
+
+    def __eq__(self, other):
+        if isinstance(other, FlatRTree):
+            return self.__sizes == other.get_sizes() and self.__values == other.get_values()
+        return False
+
+    def __str__(self):
+        res = [None] * len(self.__values)
+        for i in range(len(self.__values) - 1, -1, -1):
+            res[i] = "rnode " + str(self.__values[i]) + "[" + \
+                     ", ".join(res[child] for child in self.children(i)) + "]"
+        return res[0]
+
+    def length(self):
+        """Get the number of nodes of the current instance
+        """
+        return len(self.__values)
+
+    def get_values(self):
+        """Get the values of the nodes of the current instance in prefix order
+        """
+        return self.__values
+
+    def get_sizes(self):
+        """Get the sizes of the subtrees of the nodes of the current instance in prefix order
+        """
+        return self.__sizes
+
+    def children(self, i):
+        """Get the indices of the children of a node
+
+        Parameters
+        ----------
+        i : int
+            The index of a node
+        """
+        child = i + 1
+        stop = i + self.__sizes[i]
+        while child < stop:
+            yield child
+            child += self.__sizes[child]
+
+    def map(self, f):
+        """Applies a function to every values contained in the current instance
+
+        Parameters
+        ----------
+        f : callable
+            The function to apply to every values of the current instance
+        """
+        return FlatRTree([f(v) for v in self.__values], self.__sizes)
+
+    def reduce(self, f, g):
+        """Reduce the current instance into a single value using two operators
+
+        Parameters
+        ----------
+        f : callable
+            A binary operator to combine the value of a node with the combination
+            of the reductions of its children
+        g : callable
+            A binary operator to combine the reductions of the children of a node
+        """
+        return self.__upwards(f, g)[0]
+
+    def uacc(self, f, g):
+        """Makes an upward accumulation of the values in a the current instance using two operators
+
+        Parameters
+        ----------
+        f : callable
+            A binary operator to combine the value of a node with the combination
+            of the accumulations of its children
+        g : callable
+            A binary operator to combine the accumulations of the children of a node
+        """
+        return FlatRTree(self.__upwards(f, g), self.__sizes)
+
+    def __upwards(self, f, g):
+        """Get the reduction of the subtree of each node, visiting the nodes in reverse
+        prefix order, so that the children of a node are reduced before it"""
+        res = [None] * len(self.__values)
+        for i in range(len(self.__values) - 1, -1, -1):
+            red = None
+            for (num, child) in enumerate(self.children(i)):
+                red = res[child] if num == 0 else g(red, res[child])
+            res[i] = self.__values[i] if self.__sizes[i] == 1 else f(self.__values[i], red)
+        return res
+
+    def dacc(self, f, unit_f):
+        """Makes an downward accumulation of the values in a the current instance
+
+        Parameters
+        ----------
+        f : callable
+            A function to accumulate the value of a node with its accumulator,
+            giving the accumulator of its children
+        unit_f
+            The accumulator of the root
+        """
+        res = [None] * len(self.__values)
+        res[0] = unit_f
+        for i in range(len(self.__values)):
+            acc = f(res[i], self.__values[i])
+            for child in self.children(i):
+                res[child] = acc
+        return FlatRTree(res, self.__sizes)
+
+    def zip(self, rt):
+        """Zip the values contained in a second FlatRTree with the ones in the current instance
+
+        Precondition
+        -------------
+        The two trees should have the same shape
+
+        Parameters
+        ----------
+        rt : :obj:`FlatRTree`
+            The FlatRTree to zip with the current instance
+        """
+        return self.map2(rt, lambda x, y: (x, y))
+
+    def map2(self, rt, f):
+        """Zip the values contained in a second FlatRTree with the ones in the current instance
+        using a function
+
+        Precondition
+        -------------
+        The two trees should have the same shape
+
+        Parameters
+        ----------
+        rt : :obj:`FlatRTree`
+            The FlatRTree to zip with the current instance
+        f : callable
+            A function to zip values
+        """
+        assert self.__sizes == rt.get_sizes(), \
+            "The rose trees cannot be zipped (not the same shape)"
+        return FlatRTree([f(x, y) for (x, y) in zip(self.__values, rt.get_values())],
+                         self.__sizes)
+
+    def racc(self, f, unit_f):
+        """Makes a rightward accumulation of the values in the current instance
+
+        The root gets unit_f, and each other node the accumulation of the
+        values of its left siblings, from left to right.
+
+        Parameters
+        ----------
+        f : callable
+            A function to accumulate the value of a node with the current accumulator
+        unit_f
+            A value such as, forall value, f(value, unit_f) = value
+        """
+        res = [None] * len(self.__values)
+        res[0] = unit_f
+        for i in range(len(self.__values)):
+            acc = unit_f
+            for child in self.children(i):
+                res[child] = acc
+                acc = f(acc, self.__values[child])
+        return FlatRTree(res, self.__sizes)
+
+    def lacc(self, f, unit_f):
+        """Makes a leftward accumulation of the values in the current instance
+
+        The root gets unit_f, and each other node the accumulation of the
+        values of its right siblings, from right to left.
+
+        Parameters
+        ----------
+        f : callable
+            A function to accumulate the value of a node with the current accumulator
+        unit_f
+            A value such as, forall value, f(value, unit_f) = value
+        """
+        res = [None] * len(self.__values)
+        res[0] = unit_f
+        for i in range(len(self.__values)):
+            acc = unit_f
+            for child in reversed(list(self.children(i))):
+                res[child] = acc
+                acc = f(self.__values[child], acc)
+        return FlatRTree(res, self.__sizes)
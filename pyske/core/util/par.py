@@ -7,7 +7,6 @@ __all__ = ['procs', 'wtime', 'barrier', 'at_root']
 
 from typing import Callable
 import random
-from mpi4py import MPI
 from pyske.core.support import parallel
 
 
@@ -31,7 +30,7 @@ def wtime() -> float:
     """
     :return:  the current time as a floating point number.
     """
-    return MPI.Wtime()  # pylint: disable=c-extension-no-member
+    return parallel.wtime()
 
 
 def barrier() -> None:
@@ -0,0 +1,156 @@
+"""
+A module to trace the phases of the execution of PySke parallel programs
+
+Tracing is disabled by default: ``span`` then returns a shared context
+manager that does nothing. When it is enabled, each processor records
+in memory the start time and the duration of the spans it executes.
+The records of all the processors can be merged into a timeline in the
+Chrome trace format (readable by chrome://tracing or Perfetto).
+
+Example::
+
+    trace.enable()
+    res = tree.uacc(...)
+    trace.dump("uacc.json")
+"""
+import json
+import time
+
+from pyske.core.support import parallel
+
+__all__ = ['enable', 'disable', 'is_enabled', 'clear', 'span', 'events', 'summary', 'dump']
+
+_STATE = {'enabled': False, 'origin': 0.0}
+_EVENTS = []
+
+
+class _NoSpan:
+    """A context manager doing nothing, used when tracing is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    """A context manager recording its duration"""
+    __slots__ = ('__name', '__category', '__args', '__start')
+
+    def __init__(self, name, category, args):
+        self.__name = name
+        self.__category = category
+        self.__args = args
+        self.__start = 0.0
+
+    def __enter__(self):
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        stop = time.perf_counter()
+        _EVENTS.append((self.__name, self.__category, self.__start - _STATE['origin'],
+                        stop - self.__start, self.__args))
+        return False
+
+
+def enable(synchronize: bool = True) -> None:
+    """
+    Enables tracing, and clears the previous records.
+
+    :param synchronize: if True (default), the processors are synchronized first,
+        so that their times start at the same instant. It should then be called
+        by all the processors.
+    """
+    if synchronize:
+        parallel.COMM.barrier()
+    clear()
+    _STATE['enabled'] = True
+
+
+def disable() -> None:
+    """
+    Disables tracing. The records are kept.
+    """
+    _STATE['enabled'] = False
+
+
+def is_enabled() -> bool:
+    """
+    :return: True if tracing is enabled.
+    """
+    return _STATE['enabled']
+
+
+def clear() -> None:
+    """
+    Removes the records of the current processor, and restarts its times from 0.
+    """
+    _EVENTS.clear()
+    _STATE['origin'] = time.perf_counter()
+
+
+def span(name: str, category: str = 'pyske', **args):
+    """
+    Returns a context manager recording the execution of a phase.
+
+    :param name: the name of the phase
+    :param category: the category of the phase (for instance, the name of a module)
+    :param args: additional information stored with the record
+    :return: a context manager
+    """
+    if not _STATE['enabled']:
+        return _NO_SPAN
+    return _Span(name, category, args)
+
+
+def events() -> list:
+    """
+    :return: the records of the current processor, as tuples
+        (name, category, start, duration, args), times in seconds.
+    """
+    return list(_EVENTS)
+
+
+def summary() -> dict:
+    """
+    :return: for each phase name, the total duration (in seconds)
+        of its records on the current processor.
+    """
+    res = {}
+    for (name, _, _, duration, _) in _EVENTS:
+        res[name] = res.get(name, 0.0) + duration
+    return res
+
+
+def dump(filename: str = None, root: int = 0):
+    """
+    Merges the records of all the processors into a timeline in the Chrome trace format.
+
+    It should be called by all the processors.
+
+    :param filename: if not None, the timeline is written in this JSON file by the root
+    :param root: the processor that gets the timeline
+    :return: the timeline (a dictionary) on the root, None on the other processors
+    """
+    parts = parallel.COMM.gather(_EVENTS, root=root)
+    if parallel.PID != root:
+        return None
+    timeline = {'displayTimeUnit': 'ms',
+                'traceEvents': [{'name': name, 'cat': category, 'ph': 'X',
+                                 'ts': start * 1e6, 'dur': duration * 1e6,
+                                 'pid': pid, 'tid': 0, 'args': args}
+                                for (pid, part) in enumerate(parts)
+                                for (name, category, start, duration, args) in part]}
+    timeline['traceEvents'].extend({'name': 'process_name', 'ph': 'M', 'pid': pid,
+                                    'args': {'name': 'PID[' + str(pid) + ']'}}
+                                   for pid in range(len(parts)))
+    if filename is not None:
+        with open(filename, "w") as file:
+            json.dump(timeline, file, default=str)
+    return timeline
@@ -0,0 +1,214 @@
+"""
+Tests of array-backed sequential lists
+"""
+
+import operator
+import pytest
+from pyske.core.util import fun
+from pyske.core import SList
+from pyske.core.list.alist import AList
+from pyske.test.support import swap
+
+numpy = pytest.importorskip("numpy")
+
+pytestmark = pytest.mark.alist  # pylint: disable=invalid-name
+
+# -------------------------- #
+
+
+def test_init():
+    # pylint: disable=missing-docstring
+    res = AList.init(fun.idt, 5)
+    exp = [0, 1, 2, 3, 4]
+    assert res == exp
+    assert isinstance(res[0], int)
+
+
+def test_init_not_numbers():
+    # pylint: disable=missing-docstring
+    for values in [[1, 'x'], ['a', 'b'], [1, 2.5], [2 ** 64], [[1, 2], [3, 4]], [[]]]:
+        with pytest.raises(TypeError):
+            AList(values)
+    with pytest.raises(TypeError):
+        AList(numpy.array([[1, 2], [3, 4]]))
+    with pytest.raises(TypeError):
+        AList.init(str, 3)
+
+
+def test_map_ufunc():
+    # pylint: disable=missing-docstring
+    res = AList.init(float, 4).map(numpy.sqrt)
+    exp = SList.init(float, 4).map(lambda x: x ** 0.5)
+    assert isinstance(res, AList)
+    assert res == exp
+
+
+def test_map_registered():
+    # pylint: disable=missing-docstring
+    res = AList.init(fun.idt, 4).map(operator.neg)
+    exp = [0, -1, -2, -3]
+    assert isinstance(res, AList)
+    assert res == exp
+
+
+def test_map_python():
+    # pylint: disable=missing-docstring
+    res = AList.init(fun.idt, 4).map(fun.incr)
+    exp = [1, 2, 3, 4]
+    assert isinstance(res, AList)
+    assert res == exp
+
+
+def test_map_not_numeric():
+    # pylint: disable=missing-docstring
+    res = AList.init(fun.idt, 3).map(str)
+    exp = ['0', '1', '2']
+    assert isinstance(res, SList)
+    assert res == exp
+    res = AList([1.0, float('nan')]).map(numpy.isnan)
+    assert isinstance(res, SList)
+    assert res == [False, True]
+
+
+def test_mapi():
+    # pylint: disable=missing-docstring
+    res = AList.init(fun.idt, 5).mapi(operator.mul)
+    exp = SList.init(fun.idt, 5).mapi(operator.mul)
+    assert res == exp
+
+
+def test_map2():
+    # pylint: disable=missing-docstring
+    size = 7
+    res = AList.init(fun.idt, size).map2(operator.mul, SList.init(fun.incr, size))
+    exp = SList.init(fun.idt, size).map2(operator.mul, SList.init(fun.incr, size))
+    assert res == exp
+
+
+def test_map2_python():
+    # pylint: disable=missing-docstring
+    size = 7
+    res = AList.init(fun.idt, size).map2(lambda x, y: x - 2 * y, AList.init(fun.incr, size))
+    exp = SList.init(fun.idt, size).map2(lambda x, y: x - 2 * y, SList.init(fun.incr, size))
+    assert res == exp
+
+
+def test_zip():
+    # pylint: disable=missing-docstring
+    res = AList.init(fun.idt, 3).zip(AList.init(float, 3))
+    exp = [(0, 0.0), (1, 1.0), (2, 2.0)]
+    assert res == exp
+
+
+def test_filter():
+    # pylint: disable=missing-docstring
+    res = AList.init(fun.idt, 10).filter(fun.is_even)
+    exp = [0, 2, 4, 6, 8]
+    assert isinstance(res, AList)
+    assert res == exp
+
+
+def test_reduce():
+    # pylint: disable=missing-docstring
+    data = AList.init(fun.idt, 100)
+    assert data.reduce(operator.add) == 4950
+    assert data.reduce(max) == 99
+    assert data.reduce(lambda x, y: x + y, 0) == 4950
+
+
+def test_reduce_empty():
+    # pylint: disable=missing-docstring
+    res = AList().reduce(operator.add, 0)
+    assert res == 0
+    assert isinstance(res, int)
+
+
+def test_int_overflow():
+    # pylint: disable=missing-docstring
+    # The results are the ones of Python integers, as with an SList
+    for (left, right) in [([10, 3], [30, 2]), ([2 ** 40, 1], [2 ** 40, 2]),
+                          ([2 ** 62, -2 ** 63], [2 ** 62, 1]), ([-2 ** 63, 5], [-1, 2])]:
+        for binary_op in [operator.add, operator.sub, operator.mul, operator.floordiv]:
+            exp = SList(left).map2(binary_op, SList(right))
+            assert AList(left).map2(binary_op, AList(right)) == exp
+    for (left, right) in [([10, 3], [30, 2]), ([-3, 2], [41, 62]), ([-2, 2], [63, 3])]:
+        exp = SList(left).map2(operator.pow, SList(right))
+        assert AList(left).map2(operator.pow, AList(right)) == exp
+    assert AList([-2 ** 63]).map(operator.neg) == [2 ** 63]
+    for values in [[2 ** 62, 2 ** 62], [-2 ** 62, -2 ** 62, -1], [2 ** 32, 2 ** 32]]:
+        for binary_op in [operator.add, operator.mul]:
+            assert AList(values).reduce(binary_op) == SList(values).reduce(binary_op)
+            assert AList(values).reduce(binary_op, 1) == SList(values).reduce(binary_op, 1)
+            assert AList(values).scanl_last(binary_op, 1) == \
+                SList(values).scanl_last(binary_op, 1)
+            assert AList(values).scanr(binary_op) == SList(values).scanr(binary_op)
+
+
+def test_reduce_wider_neutral():
+    # pylint: disable=missing-docstring
+    assert AList([1, 2]).reduce(operator.add, 0.5) == 3.5
+    assert AList([1, 2]).scanl(operator.add, 0.5) == [0.5, 1.5]
+
+
+def test_map2_python_errors():
+    # pylint: disable=missing-docstring
+    data = AList([1, 2])
+    for binary_op in [operator.floordiv, operator.mod, operator.truediv]:
+        with pytest.raises(ZeroDivisionError):
+            data.map2(binary_op, AList([0, 1]))
+        with pytest.raises(ZeroDivisionError):
+            data.map(float).map2(binary_op, AList([0.0, 1.0]))
+    exp = SList([1, 2]).map2(operator.pow, SList([-1, 2]))
+    assert data.map2(operator.pow, AList([-1, 2])) == exp
+
+
+def test_flatten():
+    # pylint: disable=missing-docstring
+    assert AList().flatten() == []
+    with pytest.raises(TypeError):
+        AList([1, 2]).flatten()
+
+
+def test_map_reduce():
+    # pylint: disable=missing-docstring
+    res = AList.init(float, 10).map_reduce(numpy.square, operator.add, 0.0)
+    exp = SList.init(float, 10).map_reduce(lambda x: x * x, operator.add, 0.0)
+    assert res == exp
+
+
+def test_scanl():
+    # pylint: disable=missing-docstring
+    res = AList.init(fun.idt, 10).scanl(operator.add, 0)
+    exp = SList.init(fun.idt, 10).scanl(operator.add, 0)
+    assert res == exp
+
+
+def test_scanl_last():
+    # pylint: disable=missing-docstring
+    res_l, res_v = AList.init(fun.incr, 10).scanl_last(operator.mul, 1)
+    exp_l, exp_v = SList.init(fun.incr, 10).scanl_last(operator.mul, 1)
+    assert res_l == exp_l
+    assert res_v == exp_v
+
+
+def test_scanl_last_python():
+    # pylint: disable=missing-docstring
+    res_l, res_v = AList.init(fun.idt, 10).scanl_last(lambda x, y: 2 * x + y, 0)
+    exp_l, exp_v = SList.init(fun.idt, 10).scanl_last(lambda x, y: 2 * x + y, 0)
+    assert res_l == exp_l
+    assert res_v == exp_v
+
+
+def test_scanr():
+    # pylint: disable=missing-docstring
+    res = AList.init(fun.idt, 10).scanr(operator.add)
+    exp = SList.init(fun.idt, 10).scanr(operator.add)
+    assert res == exp
+
+
+def test_permute():
+    # pylint: disable=missing-docstring
+    size = 11
+    res = AList.init(fun.idt, size).permute(swap(size))
+    exp = SList.init(fun.idt, size).permute(swap(size))
+    assert res == exp
@@ -0,0 +1,123 @@
+"""
+Tests of lazy lists
+"""
+
+import operator
+import pytest
+from pyske.core.util import fun
+from pyske.core import PList, SList, AList
+from pyske.core.list.lazy import LazyList
+
+pytestmark = pytest.mark.lazy  # pylint: disable=invalid-name
+
+SIZE = 23
+
+# -------------------------- #
+
+
+@pytest.mark.parametrize("cls", [SList, PList])
+def test_map_is_lazy(cls):
+    # pylint: disable=missing-docstring
+    calls = []
+
+    def record(value):
+        calls.append(value)
+        return value
+
+    res = cls.init(fun.idt, SIZE).lazy().map(record).map(fun.incr)
+    assert isinstance(res, LazyList)
+    assert calls == []
+    assert res.to_seq() == SList.init(fun.incr, SIZE)
+
+
+@pytest.mark.parametrize("cls", [SList, PList])
+def test_force_once(cls):
+    # pylint: disable=missing-docstring
+    calls = []
+
+    def record(value):
+        calls.append(value)
+        return value
+
+    res = cls.init(fun.idt, SIZE).lazy().map(record)
+    assert res.reduce(operator.add, 0) == SIZE * (SIZE - 1) // 2
+    num_calls = len(calls)
+    assert res.reduce(operator.add, 0) == SIZE * (SIZE - 1) // 2
+    assert len(calls) == num_calls
+
+
+@pytest.mark.parametrize("cls", [SList, PList])
+def test_chain(cls):
+    # pylint: disable=missing-docstring
+    def chain(lst):
+        other = lst.map(fun.decr)
+        return lst.map(fun.incr).mapi(operator.mul).map2(operator.add, other) \
+            .zip(lst).map(fun.uncurry(operator.sub))
+
+    exp = chain(SList.init(fun.idt, SIZE))
+    res = chain(cls.init(fun.idt, SIZE).lazy())
+    assert res.to_seq() == exp
+
+
+@pytest.mark.parametrize("cls", [SList, PList])
+def test_filter_mapi(cls):
+    # pylint: disable=missing-docstring
+    def chain(lst):
+        return lst.filter(fun.is_even).mapi(lambda i, x: (i, x))
+
+    exp = chain(SList.init(fun.idt, SIZE))
+    res = chain(cls.init(fun.idt, SIZE).lazy())
+    assert res.length() == len(exp)
+    assert res.to_seq() == exp
+
+
+@pytest.mark.parametrize("cls", [SList, PList])
+def test_map3_filter_reduce(cls):
+    # pylint: disable=missing-docstring
+    def chain(lst, lst2):
+        return lst.map3(lambda x, y, z: x * y + z, lst2, lst).filter(fun.is_odd) \
+            .reduce(operator.add, 0)
+
+    exp = chain(SList.init(fun.idt, SIZE), SList.init(fun.incr, SIZE))
+    res = chain(cls.init(fun.idt, SIZE).lazy(), cls.init(fun.incr, SIZE))
+    assert res == exp
+
+
+def test_scanl_distribution():
+    # pylint: disable=missing-docstring
+    lst = PList.init(fun.idt, SIZE)
+    res = lst.lazy().map(fun.incr).scanl(operator.add, 0)
+    res.invariant()
+    assert res.distribution == lst.distribution
+    assert res.to_seq() == SList.init(fun.incr, SIZE).scanl(operator.add, 0)
+
+
+def test_array_kind():
+    # pylint: disable=missing-docstring
+    pytest.importorskip("numpy")
+    res = AList.init(fun.idt, SIZE).lazy().map(fun.incr).filter(fun.is_even)
+    assert isinstance(res.force(), AList)
+    assert res == SList.init(fun.incr, SIZE).filter(fun.is_even)
+    res = PList.init(fun.idt, SIZE).to_array().lazy().map(fun.incr)
+    assert isinstance(res.force().to_seq(), AList)
+    assert res.to_seq() == SList.init(fun.incr, SIZE)
+    assert isinstance(AList.init(fun.idt, SIZE).lazy().map(str).force(), SList)
+
+
+def test_eq():
+    # pylint: disable=missing-docstring
+    lst = SList.init(fun.idt, SIZE)
+    assert lst.lazy().map(fun.incr) == lst.map(fun.incr)
+    assert lst.lazy().map(fun.incr) == lst.lazy().map(fun.incr)
+    assert lst.lazy() != lst.map(fun.incr)
+
+
+@pytest.mark.parametrize("cls", [SList, PList])
+def test_long_chain(cls):
+    # pylint: disable=missing-docstring
+    res = cls.init(fun.idt, SIZE).lazy()
+    for _ in range(5000):
+        res = res.map(fun.incr)
+    res = res.filter(fun.is_even).map(fun.decr)
+    exp = SList.init(lambda x: x + 5000, SIZE).filter(fun.is_even).map(fun.decr)
+    assert res.to_seq() == exp
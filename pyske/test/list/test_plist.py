@@ -8,7 +8,8 @@ import random
 
 import pytest
 from pyske.test.support import swap
-from pyske.core import PList, SList, Distribution, par, fun
+from pyske.core import PList, SList, AList, Distribution, par, fun
+from pyske.core.support.parallel import PID, COMM
 
 pytestmark = pytest.mark.plist  # pylint: disable=invalid-name
 
@@ -278,6 +279,23 @@ def test_reduce_sum_non_empty():
 
 # -------------------------- #
 
+def test_reduce_max_distributed_empty():
+    # pylint: disable=missing-docstring
+    size = 23
+    data = PList.init(fun.idt, size).gather(0)
+    res = data.reduce(max)
+    exp = size - 1
+    assert res == exp
+
+
+def test_reduce_not_commutative():
+    # pylint: disable=missing-docstring
+    data = generate_str_plist(1)
+    res = data.reduce(lambda left, right: left + right)
+    exp = "".join(data.to_seq())
+    assert res == exp
+
+
 def test_map_reduce_nil():
     # pylint: disable=missing-docstring
     neutral = 0
@@ -347,6 +365,15 @@ def test_scanl_last_non_empty():
     _test_scanl_last(23)
 
 
+def test_scanl_last_not_commutative():
+    # pylint: disable=missing-docstring
+    size = 23
+    data = PList.init(alphabet, size)
+    res_pl, res_scalar = data.scanl_last(operator.add, "")
+    exp = SList.init(alphabet, size).scanl_last(operator.add, "")
+    assert (res_pl.to_seq(), res_scalar) == exp
+
+
 def test_distribute_data():
     # pylint: disable=missing-docstring
     dst = par.randpid()
@@ -379,6 +406,26 @@ def test_balance_data():
     assert res == exp
 
 
+def test_balance_float_data():
+    # pylint: disable=missing-docstring
+    size = 37
+    data = PList.from_seq([float(i) / 3 for i in range(0, size)])
+    res = data.balance().to_seq()
+    exp = SList([float(i) / 3 for i in range(0, size)])
+    assert res == exp
+    assert all(isinstance(val, float) for val in res)
+
+
+def test_balance_mixed_data():
+    # pylint: disable=missing-docstring
+    size = 37
+    data = PList.init(lambda i: i if i % 2 == 0 else float(i), size)
+    res = data.gather(0).balance().to_seq()
+    exp = SList([i if i % 2 == 0 else float(i) for i in range(0, size)])
+    assert res == exp
+    assert [type(val) for val in res] == [type(val) for val in exp]
+
+
 def test_balance_distr():
     # pylint: disable=missing-docstring
     data = generate_str_plist()
@@ -481,3 +528,158 @@ def test_permute_swap():
     exp = input_list.to_seq()
     res = input_list.permute(swap(size)).permute(swap(size)).to_seq()
     assert exp == res
+
+
+def test_permute_rotate():
+    # pylint: disable=missing-docstring
+    input_list = generate_int_plist(1)
+    size = input_list.length()
+    shift = randint(0, size - 1)
+    res = input_list.permute(lambda i: (i + shift) % size)
+    exp = input_list.to_seq()
+    assert res.to_seq() == [exp[(i - shift) % size] for i in range(0, size)]
+    assert res.distribution == input_list.distribution
+    res.invariant()
+
+
+def test_permute_array():
+    # pylint: disable=missing-docstring
+    pytest.importorskip("numpy")
+    input_list = PList.init(float, 23).to_array()
+    res = input_list.permute(lambda i: 22 - i)
+    assert res.to_seq() == [float(22 - i) for i in range(0, 23)]
+    assert isinstance(res.to_seq(), AList)
+    res.invariant()
+
+
+def test_to_array_not_numbers():
+    # pylint: disable=missing-docstring
+    pytest.importorskip("numpy")
+    # Only the last value is not a number: all the processors fail
+    size = 2 * par.procs()[-1] + 2
+    with pytest.raises(TypeError):
+        PList.init(lambda i: 'a' if i == size - 1 else i, size).to_array()
+    with pytest.raises(TypeError):
+        PList.init(lambda i: [i, i], size).to_array()
+
+
+def test_from_iterable():
+    # pylint: disable=missing-docstring
+    size = randint(0, 111)
+    chunk_size = randint(1, 7)
+    root = randint(0, par.procs()[-1])
+    iterable = (alphabet(i) for i in range(0, size)) if PID == root else None
+    res = PList.from_iterable(iterable, size, root, chunk_size)
+    assert res.to_seq() == [alphabet(i) for i in range(0, size)]
+    assert res.distribution == Distribution.balanced(size)
+    res.invariant()
+
+
+def test_from_iterable_sized():
+    # pylint: disable=missing-docstring
+    res = PList.from_iterable(SList.init(alphabet, 17), chunk_size=4)
+    assert res.to_seq() == [alphabet(i) for i in range(0, 17)]
+
+
+def test_from_iterable_unsized():
+    # pylint: disable=missing-docstring
+    size = randint(0, 111)
+    chunk_size = randint(1, 7)
+    root = randint(0, par.procs()[-1])
+    iterable = (alphabet(i) for i in range(0, size)) if PID == root else None
+    res = PList.from_iterable(iterable, root=root, chunk_size=chunk_size)
+    assert res.to_seq() == [alphabet(i) for i in range(0, size)]
+    assert res.distribution == Distribution.balanced(size)
+    res.invariant()
+
+
+def test_from_iterable_short():
+    # pylint: disable=missing-docstring
+    root = par.procs()[-1]
+    iterable = (alphabet(i) for i in range(0, 5)) if PID == root else None
+    with pytest.raises(AssertionError):
+        PList.from_iterable(iterable, 20, root, 2)
+    # The processors are still synchronized
+    assert COMM.allgather(PID) == list(par.procs())
+
+
+def test_collect():
+    # pylint: disable=missing-docstring
+    data = generate_str_plist()
+    root = randint(0, par.procs()[-1])
+    chunk_size = randint(1, 7)
+    seq = data.to_seq()
+    res = data.collect(root, chunk_size)
+    exp = seq if PID == root else None
+    assert res == exp
+
+
+def test_to_sink():
+    # pylint: disable=missing-docstring
+    data = generate_int_plist()
+    seq = data.to_seq()
+    chunks = []
+    data.to_sink(chunks.append, chunk_size=5)
+    if PID == 0:
+        assert all(0 < len(chunk) <= 5 for chunk in chunks)
+        assert [value for chunk in chunks for value in chunk] == seq
+    else:
+        assert chunks == []
+
+
+def shared_file(tmp_path, name):
+    """
+    Returns the name of a file in the temporary directory of processor 0.
+    :param tmp_path: pathlib.Path
+    :param name: str
+    :return: str
+    """
+    return COMM.bcast(str(tmp_path / name), 0)
+
+
+def test_to_file_from_file(tmp_path):
+    # pylint: disable=missing-docstring
+    filename = shared_file(tmp_path, "values.txt")
+    data = generate_int_plist()
+    data.to_file(filename)
+    res = PList.from_file(filename, int)
+    assert res.to_seq() == data.to_seq()
+    res.invariant()
+
+
+def test_from_file_lines(tmp_path):
+    # pylint: disable=missing-docstring
+    filename = shared_file(tmp_path, "lines.txt")
+    lines = ["", "a", "bc", "", "déf", "ghij\r"]
+    if PID == 0:
+        with open(filename, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines))
+    COMM.barrier()
+    res = PList.from_file(filename).to_seq()
+    assert res == ["", "a", "bc", "", "déf", "ghij"]
+
+
+def test_from_csv(tmp_path):
+    # pylint: disable=missing-docstring
+    filename = shared_file(tmp_path, "values.csv")
+    size = randint(0, 111)
+    if PID == 0:
+        with open(filename, "w") as file:
+            file.write("index;letter\n")
+            file.writelines(str(i) + ";" + alphabet(i) + "\n" for i in range(0, size))
+    COMM.barrier()
+    res = PList.from_csv(filename, lambda row: (int(row[0]), row[1]), ";", header=True)
+    assert res.to_seq() == [(i, alphabet(i)) for i in range(0, size)]
+
+
+def test_to_binary_from_binary(tmp_path):
+    # pylint: disable=missing-docstring
+    filename = shared_file(tmp_path, "values.bin")
+    data = generate_int_plist()
+    data.to_binary(filename, "<q")
+    res = PList.from_binary(filename, "<q")
+    assert res.to_seq() == data.to_seq()
+    assert res.distribution == Distribution.balanced(data.length())
+    pairs = data.map(lambda x: (x, x / 2))
+    pairs.to_binary(filename, "<qd")
+    assert PList.from_binary(filename, "<qd").to_seq() == pairs.to_seq()
@@ -54,3 +54,33 @@ def test_slist_with_raw():
     exp = input_list.map(incr).map(incr).reduce(add)
     res = SList.raw(input_list).map(incr).map(incr).reduce(add).run()
     assert res == exp
+
+
+def test_long_chain_opt():
+    # pylint: disable=missing-docstring
+    term = PList.init(idt, 42)
+    for _ in range(0, 2000):
+        term = term.map(incr)
+    res = term.reduce(add).opt()
+    assert res.function == 'map_reduce'
+    assert res.arguments[0].function == 'init'
+
+
+def test_long_chain_run():
+    # pylint: disable=missing-docstring
+    term = SList.init(idt, 42)
+    exp = DSList.init(idt, 42)
+    for _ in range(0, 100):
+        term = term.map(incr)
+        exp = exp.map(incr)
+    res = term.reduce(add).run()
+    assert res == exp.reduce(add)
+
+
+def test_shared_subterm():
+    # pylint: disable=missing-docstring
+    input_list = DPList.init(idt, 42)
+    shared = PList.raw(input_list).map(incr).map(incr)
+    res = shared.map2(add, shared).opt()
+    assert res.arguments[0] is res.arguments[2]
+    assert res.eval().to_seq() == input_list.map(lambda x: 2 * x + 4).to_seq()
@@ -0,0 +1,38 @@
+"""
+Optimization time of long chains of map skeletons
+"""
+
+import argparse
+from operator import add
+
+from pyske.core import Timing, par
+from pyske.core.opt.list import PList
+from pyske.core.util.fun import incr
+
+
+__all__ = []
+
+
+def __main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-l", help="lengths of the chains of maps", type=int, nargs='+',
+                        default=[100, 200, 500, 1000])
+    parser.add_argument("-i", help="number of iterations", type=int, default=10)
+    args = parser.parse_args()
+    for length in args.l:
+        term = PList.init(lambda x: x, 10)
+        for _ in range(0, length):
+            term = term.map(incr)
+        term = term.reduce(add)
+        timer = Timing()
+        timer.start()
+        for _ in range(0, args.i):
+            term.opt()
+        timer.stop()
+        max_t, _, _ = timer.get()
+        par.at_root(lambda: print(f'Length: \t{length}\n'
+                                  f'Time (opt):\t{max_t / args.i}'))
+
+
+if __name__ == '__main__':
+    __main()
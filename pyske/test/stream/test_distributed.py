@@ -0,0 +1,44 @@
+"""
+Tests of parallel streams in distributed mode
+"""
+
+import operator
+from pyske.core import PStream, SStream
+from pyske.core.support import parallel
+from pyske.core.util import fun
+
+
+def _write(path, size):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write("".join(f'{i}\n' for i in range(0, size)))
+
+
+def test_distributed_pstream(tmp_path):
+    # pylint: disable=missing-docstring
+    path = tmp_path / "data.txt"
+    _write(path, 30)
+    stream = PStream(str(path), int, 10, distributed=True)
+    stream.filter(fun.is_even)
+    stream.map(fun.incr)
+    stream.reduce(operator.add)
+    stream.run(3)
+    exp = SStream(str(path), int, 10)
+    for _ in range(0, 3):
+        exp.getvaluefromsource()
+        exp.filter(fun.is_even)
+        exp.map(fun.incr)
+        exp.reduce(operator.add)
+        exp.window()
+    assert stream.getlastwindowvalue() == exp.getlastwindowvalue()
+    data = [value for local in parallel.COMM.allgather(stream.getdata()) for value in local]
+    assert sorted(data) == sorted(exp.getdata())
+
+
+def test_sequential_pstream(tmp_path):
+    # pylint: disable=missing-docstring
+    path = tmp_path / "data.txt"
+    _write(path, 20)
+    stream = PStream(str(path), int, 10)
+    stream.reduce(operator.add)
+    stream.run(2)
+    assert stream.getlastwindowvalue() == sum(range(0, 20))
@@ -0,0 +1,64 @@
+"""
+Tests of the retention policies of streams
+"""
+
+from pyske.core.stream import SStream, PStream, KeepNone, KeepLast, SpillToFile
+from pyske.core.support import parallel
+
+
+def _stream(tmp_path, retention, size=30):
+    path = tmp_path / "data.txt"
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write("".join(f'{i}\n' for i in range(0, size)))
+    stream = SStream(str(path), int, 10, retention=retention)
+    for _ in range(0, size // 10):
+        stream.getvaluefromsource()
+        stream.window()
+    return stream
+
+
+def test_keep_all(tmp_path):
+    # pylint: disable=missing-docstring
+    assert _stream(tmp_path, None).getdata() == list(range(0, 30))
+
+
+def test_keep_none(tmp_path):
+    # pylint: disable=missing-docstring
+    assert _stream(tmp_path, KeepNone()).getdata() == []
+
+
+def test_keep_last(tmp_path):
+    # pylint: disable=missing-docstring
+    assert _stream(tmp_path, KeepLast(2)).getdata() == list(range(10, 30))
+
+
+def test_spill_to_file(tmp_path):
+    # pylint: disable=missing-docstring
+    retention = SpillToFile(str(tmp_path / "history.bin"))
+    data = _stream(tmp_path, retention).getdata()
+    assert list(data) == list(range(0, 30))
+    assert list(data) == list(range(0, 30))
+
+
+def test_pstream_retention(tmp_path):
+    # pylint: disable=missing-docstring
+    path = tmp_path / "data.txt"
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write("".join(f'{i}\n' for i in range(0, 30)))
+    stream = PStream(str(path), int, 10, retention=KeepLast(1))
+    stream.run(3)
+    assert stream.getdata() == list(range(20, 30))
+
+
+def test_spill_per_proc(tmp_path):
+    # pylint: disable=missing-docstring
+    path = tmp_path / "data.txt"
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write("".join(f'{i}\n' for i in range(0, 30)))
+    retention = SpillToFile(str(tmp_path / "history.bin"), per_proc=True)
+    assert retention.path == str(tmp_path / f"history.bin.{parallel.PID}")
+    stream = PStream(str(path), int, 10, distributed=True, retention=retention)
+    stream.run(3)
+    data = [value for local in parallel.COMM.allgather(list(stream.getdata()))
+            for value in local]
+    assert sorted(data) == list(range(0, 30))
@@ -0,0 +1,64 @@
+"""
+Tests of the ingestion of data from a file by sequential streams
+"""
+
+import threading
+import time
+from pyske.core import SStream
+
+
+def _append(path, text):
+    with open(path, 'a', encoding='utf-8') as file:
+        file.write(text)
+
+
+def test_windows(tmp_path):
+    # pylint: disable=missing-docstring
+    path = tmp_path / "data.txt"
+    _append(path, "".join(f'{i}\n' for i in range(0, 25)))
+    stream = SStream(str(path), int, 10)
+    assert stream.getvaluefromsource() == list(range(0, 10))
+    stream.window()
+    assert stream.getvaluefromsource() == list(range(10, 20))
+    stream.window()
+    _append(path, "".join(f'{i}\n' for i in range(25, 30)))
+    assert stream.getvaluefromsource() == list(range(20, 30))
+
+
+def test_partial_line(tmp_path):
+    # pylint: disable=missing-docstring
+    path = tmp_path / "data.txt"
+    _append(path, "1\n2\n3")
+    stream = SStream(str(path), int, 3, maxpollinterval=0.01)
+    writer = threading.Timer(0.05, lambda: _append(path, "4\n"))
+    writer.start()
+    assert stream.getvaluefromsource() == [1, 2, 34]
+    writer.join()
+
+
+def test_wait_for_data(tmp_path):
+    # pylint: disable=missing-docstring
+    path = tmp_path / "data.txt"
+    _append(path, "")
+    stream = SStream(str(path), int, 4, chunksize=3)
+
+    def writer():
+        for i in range(0, 4):
+            time.sleep(0.01)
+            _append(path, f'{i}\n')
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    assert stream.getvaluefromsource() == [0, 1, 2, 3]
+    thread.join()
+
+
+def test_truncated(tmp_path):
+    # pylint: disable=missing-docstring
+    path = tmp_path / "data.txt"
+    _append(path, "10\n20\n30\n")
+    stream = SStream(str(path), int, 3)
+    assert stream.getvaluefromsource() == [10, 20, 30]
+    stream.window()
+    path.write_text("1\n2\n3\n", encoding='utf-8')
+    assert stream.getvaluefromsource() == [1, 2, 3]
@@ -0,0 +1,73 @@
+"""
+Tests of windows with incremental aggregation
+"""
+
+import operator
+import random
+
+import pytest
+from pyske.core import SStream
+from pyske.core.stream.window import TwoStacks, Subtracting, SlidingWindow, TimeWindow
+
+
+@pytest.mark.parametrize("queue", [lambda: TwoStacks(operator.add),
+                                   lambda: Subtracting(operator.add, operator.sub)])
+def test_queue(queue):
+    # pylint: disable=missing-docstring
+    rng = random.Random(42)
+    aggregator = queue()
+    values = []
+    for _ in range(0, 500):
+        if values and rng.random() < 0.4:
+            assert aggregator.pop() == values.pop(0)
+        else:
+            value = rng.randint(0, 9)
+            aggregator.push(value)
+            values.append(value)
+        assert aggregator.query() == (sum(values) if values else None)
+
+
+def test_two_stacks_not_commutative():
+    # pylint: disable=missing-docstring
+    aggregator = TwoStacks(operator.add)
+    for char in "abcde":
+        aggregator.push(char)
+    aggregator.pop()
+    aggregator.push("f")
+    assert aggregator.query() == "bcdef"
+
+
+@pytest.mark.parametrize("size, slide", [(3, 1), (3, 2), (4, 4)])
+def test_sliding_window(size, slide):
+    # pylint: disable=missing-docstring
+    window = SlidingWindow(max, size, slide)
+    res = [window.push(value) for value in range(0, 12)]
+    exp = [value if value >= size - 1 and (value - size + 1) % slide == 0 else None
+           for value in range(0, 12)]
+    assert res == exp
+
+
+def test_time_window():
+    # pylint: disable=missing-docstring
+    window = TimeWindow(operator.add, 2.0, 1.0, operator.sub)
+    res = [window.push(value, value / 2) for value in range(0, 8)]
+    assert res == [None, None, 1, None, 6, None, 14, None]
+
+
+def test_sliding_reduce(tmp_path):
+    # pylint: disable=missing-docstring
+    path = tmp_path / "data.txt"
+    path.write_text("".join(f'{i}\n' for i in range(0, 20)), encoding='utf-8')
+    stream = SStream(str(path), int)
+    res = list(stream.slidingreduce(operator.add, 5, 1, operator.sub, limit=20))
+    exp = [sum(range(i - 4, i + 1)) for i in range(4, 20)]
+    assert res == exp
+
+
+def test_time_reduce(tmp_path):
+    # pylint: disable=missing-docstring
+    path = tmp_path / "data.txt"
+    path.write_text("".join(f'{i}\n' for i in range(0, 10)), encoding='utf-8')
+    stream = SStream(str(path), int)
+    res = list(stream.timereduce(operator.add, 3.0, timestamp=float, limit=10))
+    assert res == [0 + 1 + 2, 3 + 4 + 5, 6 + 7 + 8]
@@ -240,3 +240,60 @@ def test_getchr_node_left():
     assert res == exp
 
 # -------------------------- #
+
+
+# -------------------------- #
+
+DEEP_SIZE = 20001
+
+
+def deep_btree(size):
+    bt = Leaf(1)
+    for _ in range(size // 2):
+        bt = Node(1, Leaf(1), bt)
+    return bt
+
+
+def test_map_deep():
+    bt = deep_btree(DEEP_SIZE)
+    res = bt.map(lambda x: x + 1, lambda x: x * 3)
+    assert res.reduce(lambda l, v, r: l + v + r) == 2 * (DEEP_SIZE // 2 + 1) + 3 * (DEEP_SIZE // 2)
+
+
+def test_reduce_deep():
+    bt = deep_btree(DEEP_SIZE)
+    assert bt.reduce(lambda l, v, r: l + v + r) == DEEP_SIZE
+
+
+def test_uacc_deep():
+    bt = deep_btree(DEEP_SIZE)
+    res = bt.uacc(lambda l, v, r: l + v + r)
+    assert res.get_value() == DEEP_SIZE
+    assert res.get_right().get_value() == DEEP_SIZE - 2
+
+
+def test_dacc_deep():
+    bt = deep_btree(DEEP_SIZE)
+    res = bt.dacc(lambda c, b: c + b, lambda c, b: c + b, 0)
+    assert res.reduce(lambda l, v, r: max(l, v, r)) == DEEP_SIZE // 2
+
+
+def test_map2_zip_deep():
+    bt = deep_btree(DEEP_SIZE)
+    res = bt.map2(lambda x, y: x + y, bt)
+    assert res.reduce(lambda l, v, r: l + v + r) == 2 * DEEP_SIZE
+    assert bt.zip(bt).get_value() == (1, 1)
+    assert res == bt.map(lambda x: 2 * x, lambda x: 2 * x)
+
+
+def test_getch_deep():
+    bt = deep_btree(DEEP_SIZE)
+    assert bt.getchl(0).reduce(lambda l, v, r: l + v + r) == DEEP_SIZE // 2
+    assert bt.getchr(0).reduce(lambda l, v, r: l + v + r) == DEEP_SIZE // 2
+
+
+def test_uacc_tail_recursive():
+    bt = Node(1, Node(2, Leaf(3), Leaf(4)), Leaf(5))
+    exp = Node(15, Node(9, Leaf(3), Leaf(4)), Leaf(5))
+    assert bt.uacc(lambda l, v, r: l + v + r, True, lambda res: res) == exp
+    assert bt.uacc(lambda l, v, r: l + v + r) == exp
@@ -0,0 +1,148 @@
+"""
+Tree contraction test module
+"""
+import math
+import random
+
+import pytest
+
+from pyske.core.support.errors import IllFormedError
+from pyske.core.support.generate import random_btree
+from pyske.core.tree.btree import Node, Leaf
+from pyske.core.tree.contraction import Contraction
+from pyske.core.tree.ltree import LTree, Segment
+
+
+# The values of a tree in prefix order: a partial value (p0, p1, p2) stands for
+# p0 + x + p1 + y + p2, where x and y are the values of the children of the critical node.
+# The functions are also given to the processes of a pool in test_pool: they are picklable.
+
+def k(l, b, r):
+    # pylint: disable=missing-docstring
+    return b + l + r
+
+
+def phi(b):
+    # pylint: disable=missing-docstring
+    return b, "", ""
+
+
+def psi_n(l, b, r):
+    # pylint: disable=missing-docstring
+    return b[0] + l + b[1] + r + b[2]
+
+
+def psi_l(l, b, r):
+    # pylint: disable=missing-docstring
+    return b[0] + l[0], l[1], l[2] + b[1] + r + b[2]
+
+
+def psi_r(l, b, r):
+    # pylint: disable=missing-docstring
+    return b[0] + l + b[1] + r[0], r[1], r[2] + b[2]
+
+
+def gl(c, b):
+    # pylint: disable=missing-docstring
+    return c + b + "l"
+
+
+def gr(c, b):
+    # pylint: disable=missing-docstring
+    return c + b + "r"
+
+
+def random_ltree(size, m):
+    # pylint: disable=missing-docstring
+    bt = random_btree(lambda: random.choice("abcdefgh"), size)
+    return LTree.init_from_bt(bt, m)
+
+
+def reversed_apply(calls):
+    # pylint: disable=missing-docstring
+    # The calls of a step are independent: they may be applied in any order
+    return [function(*args) for (function, args) in reversed(calls)][::-1]
+
+
+def comb(depth):
+    # pylint: disable=missing-docstring
+    bt = Leaf("a")
+    for _ in range(depth):
+        bt = Node("b", bt, Leaf("c"))
+    return bt
+
+
+# -------------------------- #
+
+def test_illformed():
+    # pylint: disable=missing-docstring
+    with pytest.raises(IllFormedError):
+        Contraction([False, True])
+    with pytest.raises(IllFormedError):
+        Contraction([True, True])
+
+
+def test_leaf():
+    # pylint: disable=missing-docstring
+    contraction = Contraction([True])
+    assert contraction.steps() == []
+    assert contraction.reduce(["a"], psi_n, psi_l, psi_r) == "a"
+    assert contraction.dacc([None], None, None, "c") == ["c"]
+
+
+def test_steps_logarithmic():
+    # pylint: disable=missing-docstring
+    # The depth of a comb is linear, the number of steps is logarithmic
+    lt = LTree.init_from_bt(comb(500), 1)
+    leaves = [seg[0].is_leaf() for seg in lt]
+    steps = Contraction(leaves).steps()
+    assert len(steps) <= 2 * math.ceil(math.log2(sum(leaves)))
+    removed = [par for step in steps for (_, par, _, _, _) in step]
+    assert sorted(removed) == [i for (i, leaf) in enumerate(leaves) if not leaf]
+
+
+def test_reduce():
+    # pylint: disable=missing-docstring
+    random.seed(1)
+    for (size, m) in [(1, 1), (20, 1), (101, 2), (301, 4)]:
+        lt = random_ltree(size, m)
+        exp = lt.reduce(k, phi, psi_n, psi_l, psi_r)
+        assert lt.reduce(k, phi, psi_n, psi_l, psi_r, contract=True) == exp
+
+
+def test_uacc():
+    # pylint: disable=missing-docstring
+    random.seed(2)
+    for (size, m) in [(1, 1), (20, 1), (101, 2), (301, 4)]:
+        lt = random_ltree(size, m)
+        exp = lt.uacc(k, phi, psi_n, psi_l, psi_r)
+        assert lt.uacc(k, phi, psi_n, psi_l, psi_r, contract=True) == exp
+
+
+def test_dacc():
+    # pylint: disable=missing-docstring
+    random.seed(3)
+    for (size, m) in [(1, 1), (20, 1), (101, 2), (301, 4)]:
+        lt = random_ltree(size, m)
+        args = (gl, gr, "", lambda b: b + "l", lambda b: b + "r", str.__add__, str.__add__)
+        exp = lt.dacc(*args)
+        assert lt.dacc(*args, contract=True) == exp
+
+
+def test_comb():
+    # pylint: disable=missing-docstring
+    lt = LTree.init_from_bt(comb(300), 2)
+    assert lt.reduce(k, phi, psi_n, psi_l, psi_r, contract=True) == "b" * 300 + "a" + "c" * 300
+    exp = lt.uacc(k, phi, psi_n, psi_l, psi_r)
+    assert lt.uacc(k, phi, psi_n, psi_l, psi_r, contract=True) == exp
+
+
+def test_apply():
+    # pylint: disable=missing-docstring
+    random.seed(4)
+    lt = random_ltree(301, 2)
+    tops = Segment([seg.reduce_local(k, phi, psi_l, psi_r) for seg in lt])
+    contraction = Contraction([top.is_leaf() for top in tops], apply=reversed_apply)
+    assert contraction.reduce(tops.values(), psi_n, psi_l, psi_r) == tops.reduce_global(psi_n)
+    (res, _) = contraction.uacc(tops.values(), psi_n, psi_l, psi_r)
+    assert res == tops.uacc_global(psi_n).values()
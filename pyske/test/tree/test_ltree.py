@@ -1,8 +1,11 @@
 import pytest
 import operator
+import random
 from pyske.core.util import fun
+from pyske.core.support.generate import random_btree
 from pyske.core.support.errors import IllFormedError
 from pyske.core.tree.ltree import LTree, Segment, TaggedValue
+from pyske.core.tree.btree import Node, Leaf
 
 
 def test_map_empty():
@@ -164,3 +167,157 @@ def test_map2():
     seg3_exp = Segment([TaggedValue(3, "N"), TaggedValue(3, "L"), TaggedValue(3, "L")])
     exp = LTree([seg1_exp, seg2_exp, seg3_exp])
     assert res == exp
+
+
+def test_init_from_bt():
+    bt = Node(1, Node(2, Node(4, Leaf(6), Leaf(7)), Node(5, Leaf(8), Leaf(9))), Leaf(3))
+    res = LTree.init_from_bt(bt, 3)
+    seg1_exp = Segment([TaggedValue(1, "N"), TaggedValue(2, "C"), TaggedValue(3, "L")])
+    seg2_exp = Segment([TaggedValue(4, "N"), TaggedValue(6, "L"), TaggedValue(7, "L")])
+    seg3_exp = Segment([TaggedValue(5, "N"), TaggedValue(8, "L"), TaggedValue(9, "L")])
+    exp = LTree([seg1_exp, seg2_exp, seg3_exp])
+    assert res == exp
+    assert res.deserialization() == bt
+
+
+def test_init_from_bt_leaf():
+    res = LTree.init_from_bt(Leaf(1), 3)
+    assert res == LTree([Segment([TaggedValue(1, "L")])])
+
+
+def test_init_from_bt_deep():
+    bt = Leaf(0)
+    for i in range(1, 10001):
+        bt = Node(i, Leaf(-i), bt)
+    res = LTree.init_from_bt(bt, 100)
+    assert res.map(fun.one, fun.one).reduce(fun.add, fun.idt, fun.add, fun.add, fun.add) == 20001
+    assert res[0][0].get_value() == 10000
+
+
+def test_write_file_init_from_file(tmp_path):
+    bt = Node(1, Node(2, Node(4, Leaf(6), Leaf(7)), Node(5, Leaf(8), Leaf(9))), Leaf(3))
+    lt = LTree.init_from_bt(bt, 3)
+    filename = str(tmp_path / "tree")
+    lt.write_file(filename)
+    assert LTree.init_from_file(filename) == lt
+
+
+def test_write_binary_init_from_binary(tmp_path):
+    bt = Node(1, Node(2, Node(4, Leaf(6), Leaf(7)), Node(5, Leaf(8), Leaf(9))), Leaf(3))
+    lt = LTree.init_from_bt(bt, 3)
+    filename = str(tmp_path / "tree")
+    lt.write_binary(filename)
+    assert LTree.init_from_binary(filename) == lt
+
+
+def test_write_binary_values(tmp_path):
+    bt = Node(1, Node(2, Node(4, Leaf(6), Leaf(7)), Node(5, Leaf(8), Leaf(9))), Leaf(3))
+    lt = LTree.init_from_bt(bt, 2)
+    filename = str(tmp_path / "tree")
+    for exp in [lt.map(lambda x: x / 2, lambda x: x / 4),
+                lt.map(str, lambda x: (x, x)),
+                lt.map(lambda x: 2 ** 70, lambda x: x)]:
+        exp.write_binary(filename, 2)
+        assert LTree.init_from_binary(filename) == exp
+
+
+def test_init_from_binary_ill_formed(tmp_path):
+    filename = str(tmp_path / "tree.ltb")
+    with open(filename, "wb") as file:
+        file.write(b"(1^L)" * 20)
+    with pytest.raises(IllFormedError):
+        LTree.init_from_binary(filename)
+
+
+# -------------------------- #
+
+# The values of a tree in prefix order (see test_contraction): the closure functions
+# are not symmetric, so they tell the left and right children, and the critical values
+# and their children, apart
+
+def prefix_k(l, b, r):
+    return b + l + r
+
+
+def prefix_phi(b):
+    return b, "", ""
+
+
+def prefix_psi_n(l, b, r):
+    return b[0] + l + b[1] + r + b[2]
+
+
+def prefix_psi_l(l, b, r):
+    return b[0] + l[0], l[1], l[2] + b[1] + r + b[2]
+
+
+def prefix_psi_r(l, b, r):
+    return b[0] + l + b[1] + r[0], r[1], r[2] + b[2]
+
+
+def path_gl(c, b):
+    return c + b + "l"
+
+
+def path_gr(c, b):
+    return c + b + "r"
+
+
+def path_phi_l(b):
+    return b + "l"
+
+
+def path_phi_r(b):
+    return b + "r"
+
+
+PREFIX = (prefix_k, prefix_phi, prefix_psi_n, prefix_psi_l, prefix_psi_r)
+SIZES = [(1, 1), (21, 1), (101, 2), (301, 4), (301, 30)]
+
+
+def random_bt(size):
+    return random_btree(lambda: random.choice("abcdefgh"), size)
+
+
+def critical_right():
+    # The critical value is on the right of a node whose left child is a complete subtree
+    top = Segment([TaggedValue("a", "N"), TaggedValue("b", "N"), TaggedValue("c", "L"),
+                   TaggedValue("d", "L"), TaggedValue("e", "C")])
+    lt = LTree([top, Segment([TaggedValue("f", "L")]), Segment([TaggedValue("g", "L")])])
+    bt = Node("a", Node("b", Leaf("c"), Leaf("d")), Node("e", Leaf("f"), Leaf("g")))
+    return lt, bt
+
+
+def test_reduce_critical_right():
+    lt, bt = critical_right()
+    assert lt.reduce(*PREFIX) == bt.reduce(prefix_k)
+
+
+def test_uacc_critical_right():
+    lt, bt = critical_right()
+    exp = [val for seg in LTree.init_from_bt(bt.uacc(prefix_k), 1) for val in seg.values()]
+    assert [val for seg in lt.uacc(*PREFIX) for val in seg.values()] == exp
+
+
+def test_reduce_btree():
+    random.seed(21)
+    for (size, m) in SIZES:
+        bt = random_bt(size)
+        assert LTree.init_from_bt(bt, m).reduce(*PREFIX) == bt.reduce(prefix_k)
+
+
+def test_uacc_btree():
+    random.seed(22)
+    for (size, m) in SIZES:
+        bt = random_bt(size)
+        res = LTree.init_from_bt(bt, m).uacc(*PREFIX)
+        assert res == LTree.init_from_bt(bt.uacc(prefix_k), m)
+
+
+def test_dacc_btree():
+    random.seed(23)
+    for (size, m) in SIZES:
+        bt = random_bt(size)
+        res = LTree.init_from_bt(bt, m).dacc(path_gl, path_gr, "", path_phi_l, path_phi_r,
+                                             operator.add, operator.add)
+        assert res == LTree.init_from_bt(bt.dacc(path_gl, path_gr, ""), m)
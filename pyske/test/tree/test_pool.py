@@ -0,0 +1,86 @@
+"""
+SegmentPool test module
+"""
+import operator
+import random
+
+from pyske.core.tree.pool import SegmentPool
+from pyske.test.tree.test_contraction import k, phi, psi_n, psi_l, psi_r, gl, gr, random_ltree
+
+
+# The functions given to the skeletons must be picklable: they are defined at the top level.
+
+def phi_l(b):
+    # pylint: disable=missing-docstring
+    return b + "l"
+
+
+def phi_r(b):
+    # pylint: disable=missing-docstring
+    return b + "r"
+
+
+SIZES = [(1, 1), (21, 1), (101, 2), (301, 4)]
+
+
+# -------------------------- #
+
+def test_map():
+    # pylint: disable=missing-docstring
+    random.seed(1)
+    with SegmentPool(2) as pool:
+        for (size, m) in SIZES:
+            lt = random_ltree(size, m)
+            assert lt.map(str.upper, phi_l, pool=pool) == lt.map(str.upper, phi_l)
+
+
+def test_reduce():
+    # pylint: disable=missing-docstring
+    random.seed(2)
+    with SegmentPool(2, chunk_size=3) as pool:
+        for (size, m) in SIZES:
+            lt = random_ltree(size, m)
+            exp = lt.reduce(k, phi, psi_n, psi_l, psi_r)
+            assert lt.reduce(k, phi, psi_n, psi_l, psi_r, pool=pool) == exp
+            assert lt.reduce(k, phi, psi_n, psi_l, psi_r, contract=True, pool=pool) == exp
+
+
+def test_uacc():
+    # pylint: disable=missing-docstring
+    random.seed(3)
+    with SegmentPool(2, chunk_size=1) as pool:
+        for (size, m) in SIZES:
+            lt = random_ltree(size, m)
+            exp = lt.uacc(k, phi, psi_n, psi_l, psi_r)
+            assert lt.uacc(k, phi, psi_n, psi_l, psi_r, pool=pool) == exp
+            assert lt.uacc(k, phi, psi_n, psi_l, psi_r, contract=True, pool=pool) == exp
+
+
+def test_dacc():
+    # pylint: disable=missing-docstring
+    random.seed(4)
+    args = (gl, gr, "", phi_l, phi_r, operator.add, operator.add)
+    with SegmentPool(2) as pool:
+        for (size, m) in SIZES:
+            lt = random_ltree(size, m)
+            exp = lt.dacc(*args)
+            assert lt.dacc(*args, pool=pool) == exp
+            assert lt.dacc(*args, contract=True, pool=pool) == exp
+
+
+def test_zip_map2():
+    # pylint: disable=missing-docstring
+    random.seed(5)
+    with SegmentPool(2, chunk_size=2) as pool:
+        lt = random_ltree(101, 2)
+        lt2 = lt.map(str.upper, str.upper)
+        assert lt.zip(lt2, pool=pool) == lt.zip(lt2)
+        assert lt.map2(operator.add, lt2, pool=pool) == lt.map2(operator.add, lt2)
+
+
+def test_call():
+    # pylint: disable=missing-docstring
+    calls = [(psi_n, (str(i), ("a", "b", "c"), "d")) for i in range(10)]
+    with SegmentPool(2, chunk_size=3) as pool:
+        assert pool.call(calls) == ["a{}bdc".format(i) for i in range(10)]
+        assert pool.call([]) == []
@@ -0,0 +1,204 @@
+"""
+PRTree test module
+"""
+import operator
+import random
+
+from pyske.core.tree.rtree import RNode, FlatRTree
+from pyske.core.tree.prtree import PRTree
+from pyske.core.tree.ptree import GLOBAL_ALL, GLOBAL_CONTRACT
+from pyske.core.support.parallel import PID
+
+
+def random_rtree(size):
+    # pylint: disable=missing-docstring
+    # The same tree on every processor
+    gen = random.Random(size)
+    nodes = [RNode(gen.randint(1, 9))]
+    for _ in range(1, size):
+        node = RNode(gen.randint(1, 9))
+        gen.choice(nodes).add_children(node)
+        nodes.append(node)
+    return FlatRTree.from_rnode(nodes[0])
+
+
+def paths(a, x):
+    # pylint: disable=missing-docstring
+    # Distributes over the concatenation of tuples, that is not commutative
+    return tuple(p + q for p in a for q in x)
+
+
+def labels(rt):
+    # pylint: disable=missing-docstring
+    return rt.map(lambda v: ((v,),))
+
+
+# The closure functions of reduce(add, add) on the binary encoding, where add does not
+# distribute over itself. A partial value is a pair of forms c + ax * x + ay * y, where
+# x and y are the values of the children of the critical node in the encoding.
+
+def sum_form(pair):
+    # pylint: disable=missing-docstring
+    return (0, 0, 0) if pair is None else (pair[1], 0, 0)
+
+
+def substitute(form, x, y):
+    # pylint: disable=missing-docstring
+    (c, ax, ay) = form
+    return (c + ax * x[0] + ay * y[0], ax * x[1] + ay * y[1], ax * x[2] + ay * y[2])
+
+
+def sum_k(l, b, r):
+    # pylint: disable=missing-docstring
+    own = b + (0 if l is None else l[1])
+    return own, own + (0 if r is None else r[1])
+
+
+def sum_phi(b):
+    # pylint: disable=missing-docstring
+    return (b, 1, 0), (b, 1, 1)
+
+
+def sum_psi_n(l, node, r):
+    # pylint: disable=missing-docstring
+    return tuple(substitute(form, sum_form(l), sum_form(r))[0] for form in node)
+
+
+def sum_psi_l(l, node, r):
+    # pylint: disable=missing-docstring
+    return tuple(substitute(form, l[1], sum_form(r)) for form in node)
+
+
+def sum_psi_r(l, node, r):
+    # pylint: disable=missing-docstring
+    return tuple(substitute(form, sum_form(l), r[1]) for form in node)
+
+
+SUM_CLOSURE = (sum_k, sum_phi, sum_psi_n, sum_psi_l, sum_psi_r)
+
+
+def check(res, exp):
+    # pylint: disable=missing-docstring
+    assert res == (exp if PID == 0 else None)
+
+
+def test_init_to_rt():
+    # pylint: disable=missing-docstring
+    for size in [1, 2, 30]:
+        rt = random_rtree(size)
+        check(PRTree.init_from_rt(rt, 3).to_rt(), rt)
+        check(PRTree.init_from_rt(rt.to_rnode(), 3).to_rt(), rt)
+
+
+def test_map():
+    # pylint: disable=missing-docstring
+    rt = random_rtree(40)
+    check(PRTree.init_from_rt(rt, 4).map(str).to_rt(), rt.map(str))
+
+
+def test_reduce():
+    # pylint: disable=missing-docstring
+    for size in [1, 2, 13, 60]:
+        rt = random_rtree(size)
+        for m in [1, 2, 5]:
+            prt = PRTree.init_from_rt(rt, m)
+            check(prt.reduce(operator.mul, operator.add), rt.reduce(operator.mul, operator.add))
+            check(PRTree.init_from_rt(labels(rt), m).reduce(paths, operator.add),
+                  labels(rt).reduce(paths, operator.add))
+
+
+def test_reduce_uacc_not_distributive():
+    # pylint: disable=missing-docstring
+    # f does not distribute over g: only their associativity is used
+    for size in [1, 2, 13, 60]:
+        rt = random_rtree(size)
+        for m in [1, 2, 3, 5]:
+            prt = PRTree.init_from_rt(rt, m)
+            for (f, g) in [(operator.add, operator.add), (max, operator.add)]:
+                check(prt.reduce(f, g), rt.reduce(f, g))
+                assert prt.reduce(f, g, GLOBAL_CONTRACT) == rt.reduce(f, g)
+                check(prt.uacc(f, g).to_rt(), rt.uacc(f, g))
+                check(prt.uacc(f, g, GLOBAL_CONTRACT).to_rt(), rt.uacc(f, g))
+
+
+def test_reduce_closure():
+    # pylint: disable=missing-docstring
+    for size in [1, 2, 13, 60]:
+        rt = random_rtree(size)
+        for m in [1, 2, 5]:
+            prt = PRTree.init_from_rt(rt, m)
+            exp = rt.reduce(operator.add, operator.add)
+            check(prt.reduce(operator.add, operator.add, closure=SUM_CLOSURE), exp)
+            assert prt.reduce(operator.add, operator.add, GLOBAL_CONTRACT,
+                              closure=SUM_CLOSURE) == exp
+            res = prt.uacc(operator.add, operator.add, closure=SUM_CLOSURE)
+            check(res.to_rt(), rt.uacc(operator.add, operator.add))
+
+
+def test_reduce_all():
+    # pylint: disable=missing-docstring
+    rt = random_rtree(50)
+    res = PRTree.init_from_rt(rt, 3).reduce(operator.add, max, global_phase=GLOBAL_ALL)
+    assert res == rt.reduce(operator.add, max)
+
+
+def test_uacc():
+    # pylint: disable=missing-docstring
+    for size in [1, 2, 13, 60]:
+        rt = labels(random_rtree(size))
+        for m in [1, 2, 5]:
+            res = PRTree.init_from_rt(rt, m).uacc(paths, operator.add)
+            check(res.to_rt(), rt.uacc(paths, operator.add))
+
+
+def test_dacc():
+    # pylint: disable=missing-docstring
+    for size in [1, 2, 13, 60]:
+        rt = labels(random_rtree(size))
+        for m in [1, 2, 5]:
+            res = PRTree.init_from_rt(rt, m).dacc(operator.add, ())
+            check(res.to_rt(), rt.dacc(operator.add, ()))
+
+
+def test_racc_lacc():
+    # pylint: disable=missing-docstring
+    for size in [1, 2, 13, 60]:
+        rt = labels(random_rtree(size))
+        for m in [1, 2, 5]:
+            prt = PRTree.init_from_rt(rt, m)
+            check(prt.racc(operator.add, ()).to_rt(), rt.racc(operator.add, ()))
+            check(prt.lacc(operator.add, ()).to_rt(), rt.lacc(operator.add, ()))
+
+
+def test_zip_map2():
+    # pylint: disable=missing-docstring
+    rt = random_rtree(40)
+    prt = PRTree.init_from_rt(rt, 4)
+    check(prt.zip(prt.map(str)).to_rt(), rt.zip(rt.map(str)))
+    check(prt.map2(prt, operator.mul).to_rt(), rt.map2(rt, operator.mul))
+
+
+def test_skeletons_chained():
+    # pylint: disable=missing-docstring
+    rt = random_rtree(60)
+    prt = PRTree.init_from_rt(rt, 3)
+    res = prt.dacc(operator.add, 0).uacc(operator.add, max)
+    check(res.to_rt(), rt.dacc(operator.add, 0).uacc(operator.add, max))
+
+
+def test_skeletons_contract():
+    # pylint: disable=missing-docstring
+    for size in [1, 13, 80]:
+        rt = labels(random_rtree(size))
+        for m in [1, 3]:
+            prt = PRTree.init_from_rt(rt, m)
+            res = prt.reduce(paths, operator.add, global_phase=GLOBAL_CONTRACT)
+            assert res == rt.reduce(paths, operator.add)
+            res = prt.uacc(paths, operator.add, global_phase=GLOBAL_CONTRACT)
+            check(res.to_rt(), rt.uacc(paths, operator.add))
+            res = prt.dacc(operator.add, (), global_phase=GLOBAL_CONTRACT)
+            check(res.to_rt(), rt.dacc(operator.add, ()))
+            res = prt.racc(operator.add, (), global_phase=GLOBAL_CONTRACT)
+            check(res.to_rt(), rt.racc(operator.add, ()))
+            res = prt.lacc(operator.add, (), global_phase=GLOBAL_CONTRACT)
+            check(res.to_rt(), rt.lacc(operator.add, ()))
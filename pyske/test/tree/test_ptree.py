@@ -1,12 +1,18 @@
 """
 PTree test module
 """
+import operator
+import random
+
 import pytest
 
 from pyske.core.tree.ltree import IllFormedError, LTree
-from pyske.core.tree.ptree import Segment, TaggedValue, PTree
-from pyske.core.support.parallel import PID
+from pyske.core.tree.ptree import Segment, TaggedValue, PTree, GLOBAL_ALL, GLOBAL_CONTRACT
+from pyske.core.support.generate import random_btree
+from pyske.core.support.parallel import PID, NPROCS, COMM
 from pyske.core.util import fun
+from pyske.test.tree.test_ltree import PREFIX, SIZES, critical_right, prefix_k, random_bt, \
+    path_gl, path_gr, path_phi_l, path_phi_r
 
 
 def illformed_ltree():
@@ -30,6 +36,25 @@ def test_to_seq():
     assert res == exp
 
 
+def test_init_from_bt():
+    # pylint: disable=missing-docstring
+    bt = random_btree(lambda: random.randint(0, 99), 301)
+    res = PTree.init_from_bt(bt, 10)
+    exp = PTree(LTree.init_from_bt(bt, 10))
+    assert res == exp
+    assert res.to_seq() == exp.to_seq()
+
+
+def test_init_from_bt_costs():
+    # pylint: disable=missing-docstring
+    bt = random_btree(lambda: random.randint(0, 99), 301)
+    lt = LTree.init_from_bt(bt, 10)
+    costs = [1] * lt.length()
+    res = PTree.init_from_bt(bt, 10, costs)
+    exp = PTree(lt, costs)
+    assert res == exp
+
+
 def test_map_empty():
     # pylint: disable=missing-docstring
     pt = PTree()
@@ -195,3 +220,130 @@ def test_map2():
     seg3_exp = Segment([TaggedValue(3, "N"), TaggedValue(3, "L"), TaggedValue(3, "L")])
     exp = LTree([seg1_exp, seg2_exp, seg3_exp]) if PID == 0 else None
     assert res == exp
+
+
+# -------------------------- #
+
+def test_init_from_binary(tmp_path_factory):
+    # pylint: disable=missing-docstring
+    seg1 = Segment([TaggedValue(13, "C")])
+    seg2 = Segment([TaggedValue(31, "N"), TaggedValue(47, "L"), TaggedValue(32, "L")])
+    seg3 = Segment([TaggedValue(72, "N"), TaggedValue(92, "L"), TaggedValue(42, "L")])
+    lt = LTree([seg1, seg2, seg3])
+    filename = COMM.bcast(str(tmp_path_factory.mktemp("ptree") / "tree") if PID == 0 else None)
+    if PID == 0:
+        lt.write_binary(filename, NPROCS)
+    COMM.barrier()
+    pt = PTree.init_from_binary(filename)
+    exp = PTree(lt)
+    assert pt.content == exp.content
+    assert pt.distribution == exp.distribution
+    assert pt.global_index == exp.global_index
+    pt.map(lambda x: x + 1, lambda x: x - 1).write_binary(filename)
+    res = LTree.init_from_binary(filename)
+    assert res == lt.map(lambda x: x + 1, lambda x: x - 1)
+
+
+# -------------------------- #
+
+def random_ltree():
+    # pylint: disable=missing-docstring
+    bt = random_btree(lambda: random.randint(1, 100), 301)
+    return LTree.init_from_bt(bt, 10)
+
+
+def test_reduce_global_all():
+    # pylint: disable=missing-docstring
+    random.seed(11)
+    lt = random_ltree()
+    res = PTree(lt).reduce(fun.add, fun.idt, fun.add, fun.add, fun.add, global_phase=GLOBAL_ALL)
+    assert res == lt.reduce(fun.add, fun.idt, fun.add, fun.add, fun.add)
+
+
+def test_uacc_global_all():
+    # pylint: disable=missing-docstring
+    random.seed(12)
+    lt = random_ltree()
+    pt = PTree(lt)
+    res = pt.uacc(fun.add, fun.idt, fun.add, fun.add, fun.add, global_phase=GLOBAL_ALL)
+    exp = pt.uacc(fun.add, fun.idt, fun.add, fun.add, fun.add)
+    assert res.content == exp.content
+    seq = exp.to_seq()
+    assert seq == (lt.uacc(fun.add, fun.idt, fun.add, fun.add, fun.add) if PID == 0 else None)
+
+
+def test_dacc_global_all():
+    # pylint: disable=missing-docstring
+    random.seed(13)
+    lt = random_ltree()
+    pt = PTree(lt)
+    res = pt.dacc(fun.add, fun.add, 0, fun.idt, fun.idt, fun.add, fun.add,
+                  global_phase=GLOBAL_ALL)
+    exp = pt.dacc(fun.add, fun.add, 0, fun.idt, fun.idt, fun.add, fun.add)
+    assert res.content == exp.content
+    seq = exp.to_seq()
+    assert seq == (lt.dacc(fun.add, fun.add, 0, fun.idt, fun.idt, fun.add, fun.add)
+                   if PID == 0 else None)
+
+
+def test_reduce_contract():
+    # pylint: disable=missing-docstring
+    random.seed(14)
+    lt = random_ltree()
+    res = PTree(lt).reduce(fun.add, fun.idt, fun.add, fun.add, fun.add,
+                           global_phase=GLOBAL_CONTRACT)
+    assert res == lt.reduce(fun.add, fun.idt, fun.add, fun.add, fun.add)
+
+
+def test_uacc_contract():
+    # pylint: disable=missing-docstring
+    random.seed(15)
+    lt = random_ltree()
+    pt = PTree(lt)
+    res = pt.uacc(fun.add, fun.idt, fun.add, fun.add, fun.add, global_phase=GLOBAL_CONTRACT)
+    exp = pt.uacc(fun.add, fun.idt, fun.add, fun.add, fun.add)
+    assert res.content == exp.content
+
+
+def test_dacc_contract():
+    # pylint: disable=missing-docstring
+    random.seed(16)
+    lt = random_ltree()
+    pt = PTree(lt)
+    res = pt.dacc(fun.add, fun.add, 0, fun.idt, fun.idt, fun.add, fun.add,
+                  global_phase=GLOBAL_CONTRACT)
+    exp = pt.dacc(fun.add, fun.add, 0, fun.idt, fun.idt, fun.add, fun.add)
+    assert res.content == exp.content
+
+
+# -------------------------- #
+
+def test_reduce_btree():
+    # pylint: disable=missing-docstring
+    random.seed(24)
+    for (size, m) in SIZES:
+        bt = random_bt(size)
+        res = PTree.init_from_bt(bt, m).reduce(*PREFIX)
+        assert res == (bt.reduce(prefix_k) if PID == 0 else None)
+    lt, bt = critical_right()
+    assert PTree(lt).reduce(*PREFIX, global_phase=GLOBAL_ALL) == bt.reduce(prefix_k)
+
+
+def test_uacc_btree():
+    # pylint: disable=missing-docstring
+    random.seed(25)
+    for (size, m) in SIZES:
+        bt = random_bt(size)
+        for global_phase in [GLOBAL_ALL, GLOBAL_CONTRACT]:
+            res = PTree.init_from_bt(bt, m).uacc(*PREFIX, global_phase=global_phase)
+            assert res == PTree.init_from_bt(bt.uacc(prefix_k), m)
+
+
+def test_dacc_btree():
+    # pylint: disable=missing-docstring
+    random.seed(26)
+    for (size, m) in SIZES:
+        bt = random_bt(size)
+        res = PTree.init_from_bt(bt, m).dacc(path_gl, path_gr, "", path_phi_l, path_phi_r,
+                                             operator.add, operator.add)
+        assert res == PTree.init_from_bt(bt.dacc(path_gl, path_gr, ""), m)
@@ -1,9 +1,10 @@
 import pytest
 import operator
+import random
 from pyske.core.list.slist import SList
 from pyske.core.support.errors import ConstructorError
 from pyske.core.tree.btree import Node, Leaf
-from pyske.core.tree.rtree import RNode
+from pyske.core.tree.rtree import RNode, FlatRTree
 
 
 # -------------------------- #
@@ -169,3 +170,73 @@ def test_racc():
                            RNode(56)]),
                     RNode(56)])
     assert res == exp
+
+
+# -------------------------- #
+
+def random_rtree(size):
+    nodes = [RNode(random.randint(0, 9))]
+    for _ in range(1, size):
+        node = RNode(random.randint(0, 9))
+        random.choice(nodes).add_children(node)
+        nodes.append(node)
+    return nodes[0]
+
+
+def deep_flat_rtree(depth):
+    # A chain of nodes, each one with a leaf as its first child
+    values = [1] * (2 * depth + 1)
+    sizes = []
+    for i in range(depth):
+        sizes.extend([2 * (depth - i) + 1, 1])
+    sizes.append(1)
+    return FlatRTree(values, sizes)
+
+
+def test_flat_from_to_rnode():
+    for size in [1, 2, 10, 50]:
+        rt = random_rtree(size)
+        frt = FlatRTree.from_rnode(rt)
+        assert frt.length() == size
+        assert frt.to_rnode() == rt
+        assert str(frt) == str(rt)
+
+
+def test_flat_skeletons():
+    for size in [1, 2, 10, 50]:
+        rt = random_rtree(size)
+        frt = FlatRTree.from_rnode(rt)
+        assert frt.map(str).to_rnode() == rt.map(str)
+        assert frt.reduce(operator.add, max) == rt.reduce(operator.add, max)
+        res = frt.uacc(operator.add, operator.mul)
+        assert res.to_rnode() == rt.uacc(operator.add, operator.mul)
+        assert frt.dacc(operator.add, 0).to_rnode() == rt.dacc(operator.add, 0)
+        assert frt.racc(operator.add, 0).to_rnode() == rt.racc(operator.add, 0)
+        assert frt.lacc(operator.sub, 0).to_rnode() == rt.lacc(operator.sub, 0)
+        other = FlatRTree.from_rnode(rt.map(lambda x: -x))
+        assert frt.zip(other).to_rnode() == rt.zip(other.to_rnode())
+        assert frt.map2(other, operator.sub).to_rnode() == rt.map2(other.to_rnode(), operator.sub)
+
+
+def test_flat_r2b_b2r():
+    for size in [1, 2, 10, 50]:
+        rt = random_rtree(size)
+        frt = FlatRTree.from_rnode(rt)
+        assert frt.r2b() == rt.r2b()
+        assert FlatRTree.b2r(rt.r2b()) == frt
+        bt = Node(1, Leaf(2), Leaf(3))
+        assert FlatRTree.b2r(bt) == FlatRTree.from_rnode(RNode(bt))
+    with pytest.raises(ConstructorError):
+        FlatRTree.b2r(Leaf(None))
+
+
+def test_flat_deep():
+    depth = 50000
+    frt = deep_flat_rtree(depth)
+    assert frt.reduce(operator.add, operator.add) == 2 * depth + 1
+    res = frt.uacc(operator.add, operator.add)
+    assert res.get_values()[0] == 2 * depth + 1
+    assert res.get_values()[2] == 2 * depth - 1
+    assert frt.dacc(operator.add, 0).get_values()[-1] == depth
+    assert frt.racc(operator.add, 0).get_values()[-2:] == [0, 1]
+    assert FlatRTree.b2r(frt.r2b()) == frt
@@ -1,7 +1,7 @@
 import pytest
 import operator
 from pyske.core.support.errors import IllFormedError, ApplicationError, NotSameTagError
-from pyske.core.tree.ltree import Segment, TaggedValue
+from pyske.core.tree.ltree import Segment, TaggedValue, TAG_LEAF, TAG_NODE, TAG_CRITICAL, TAG_NONE
 from pyske.core.util import fun
 
 
@@ -215,13 +215,21 @@ def test_uacc_global_prefix():
     assert res == exp
 
 
+def test_uacc_global_children_prefix():
+    gt = Segment([TaggedValue((0, 1, 1, 4), "N"), TaggedValue((1, 3), "L"), TaggedValue((1, 3), "L")])
+    (res, children) = gt.uacc_global_children(psi_n)
+    assert res == gt.uacc_global(psi_n)
+    assert children == [((1, 3), (1, 3)), None, None]
+
+
 def test_uacc_update_prefix():
     seg = Segment([TaggedValue(1, "N"), TaggedValue(2, "C"), TaggedValue((0, 1), "L")])
     seg2 = Segment([None, None, TaggedValue((0, 1), "L")])
     lc = (1, 3)
     rc = (1, 3)
     res = seg.uacc_update(seg2, k, lc, rc)
-    exp = Segment([TaggedValue((5, 9), "N"), TaggedValue((1, 5), "C"), TaggedValue((0, 1), "L")])
+    # The children of the critical value are lc and rc, not the following leaf
+    exp = Segment([TaggedValue((7, 9), "N"), TaggedValue((3, 7), "C"), TaggedValue((0, 1), "L")])
     assert res == exp
 
 
@@ -548,3 +556,73 @@ def test_from_str():
     assert res == exp
 
 # -------------------------- #
+
+
+# -------------------------- #
+
+def test_from_arrays():
+    seg = Segment.from_arrays(bytearray([TAG_NODE, TAG_LEAF, TAG_CRITICAL]), [1, 2, 3])
+    exp = Segment([TaggedValue(1, "N"), TaggedValue(2, "L"), TaggedValue(3, "C")])
+    assert seg == exp
+    assert list(seg) == list(exp)
+    assert seg.tags() == bytearray([TAG_NODE, TAG_LEAF, TAG_CRITICAL])
+    assert seg.values() == [1, 2, 3]
+
+
+def test_storage_with_none():
+    seg = Segment([None, TaggedValue(2, "L")])
+    assert seg[0] is None
+    assert seg.tags() == bytearray([TAG_NONE, TAG_LEAF])
+    seg[0] = TaggedValue(1, "N")
+    assert seg == Segment([TaggedValue(1, "N"), TaggedValue(2, "L")])
+
+
+def test_slice():
+    seg = Segment([TaggedValue(1, "N"), TaggedValue(2, "L"), TaggedValue(3, "L")])
+    exp = Segment([TaggedValue(2, "L"), TaggedValue(3, "L")])
+    assert seg[1:] == exp
+
+
+def test_str_from_str():
+    seg = Segment([TaggedValue(1, "N"), TaggedValue(2, "L"), TaggedValue(3, "C")])
+    assert Segment.from_str(str(seg)) == seg
+
+
+def test_get_right_left_subtree():
+    seg = Segment([TaggedValue(1, "N"), TaggedValue(2, "N"), TaggedValue(3, "L"),
+                   TaggedValue(4, "N"), TaggedValue(5, "L"), TaggedValue(6, "L"),
+                   TaggedValue(7, "L")])
+    assert seg.get_right(0) == TaggedValue(7, "L")
+    assert seg.get_right(1) == TaggedValue(4, "N")
+
+
+def test_view():
+    seg = Segment([TaggedValue(1, "N"), TaggedValue(2, "L"), TaggedValue(3, "L"),
+                   TaggedValue(4, "L")])
+    view = seg.view(1, 3)
+    assert view == Segment([TaggedValue(2, "L"), TaggedValue(3, "L")])
+    assert list(view) == [TaggedValue(2, "L"), TaggedValue(3, "L")]
+    view[0] = TaggedValue(5, "L")
+    assert seg[1] == TaggedValue(5, "L")
+
+
+def test_view_skeletons():
+    seg = Segment([TaggedValue(0, "L"),
+                   TaggedValue(1, "N"), TaggedValue(2, "L"), TaggedValue(3, "C"),
+                   TaggedValue(0, "L")])
+    view = seg.view(1, 4)
+    exp = Segment([TaggedValue(1, "N"), TaggedValue(2, "L"), TaggedValue(3, "C")])
+    assert view.has_critical()
+    assert view.reduce_local(fun.add, fun.idt, fun.add, fun.add) == \
+        exp.reduce_local(fun.add, fun.idt, fun.add, fun.add)
+    assert view.dacc_local(fun.add, fun.add, 0) == exp.dacc_local(fun.add, fun.add, 0)
+
+
+def test_out():
+    seg = Segment([TaggedValue(1, "N"), TaggedValue(2, "L"), TaggedValue(3, "L")])
+    content = Segment.from_arrays(bytearray(5), [None] * 5)
+    out = content.view(1, 4)
+    res = seg.map_local(lambda x: x + 1, lambda x: x - 1, out)
+    assert res is out
+    assert content == Segment([None, TaggedValue(0, "N"), TaggedValue(3, "L"),
+                               TaggedValue(4, "L"), None])
@@ -0,0 +1,85 @@
+"""
+Tree partitioning test module
+"""
+import random
+
+from pyske.core.support import separate
+from pyske.core.support.generate import random_btree
+from pyske.core.tree.ltree import LTree
+
+
+def __loads(costs, distribution):
+    loads = []
+    start = 0
+    for nb_segs in distribution:
+        loads.append(sum(costs[start:start + nb_segs]))
+        start += nb_segs
+    return loads
+
+
+def test_linear_partition_optimal():
+    # pylint: disable=missing-docstring
+    costs = [1, 1, 1, 1, 1, 1, 10]
+    distribution = separate.linear_partition(costs, 2)
+    assert distribution == [6, 1]
+    assert max(__loads(costs, distribution)) == 10
+
+
+def test_linear_partition_not_empty():
+    # pylint: disable=missing-docstring
+    costs = [10, 1, 1, 1]
+    distribution = separate.linear_partition(costs, 4)
+    assert distribution == [1, 1, 1, 1]
+
+
+def test_linear_partition_few_segments():
+    # pylint: disable=missing-docstring
+    distribution = separate.linear_partition([3, 2], 4)
+    assert sum(distribution) == 2
+    assert len(distribution) == 4
+    assert separate.linear_partition([], 3) == [0, 0, 0]
+
+
+def test_linear_partition_float():
+    # pylint: disable=missing-docstring
+    costs = [0.5, 0.25, 0.25, 1.0]
+    distribution = separate.linear_partition(costs, 2)
+    assert distribution == [3, 1]
+
+
+def test_imbalance():
+    # pylint: disable=missing-docstring
+    assert separate.imbalance([1, 1, 1, 1], [2, 2]) == 1.0
+    assert separate.imbalance([1, 1, 1, 1], [3, 1]) == 1.5
+    assert separate.imbalance([], [0, 0]) == 1.0
+
+
+def test_distribute_tree():
+    # pylint: disable=missing-docstring
+    bt = random_btree(lambda: random.randint(0, 9), 501)
+    lt = LTree.init_from_bt(bt, 20)
+    for nprocs in [1, 2, 3, 5]:
+        (distribution, global_index) = separate.distribute_tree(lt, nprocs)
+        assert len(distribution) == nprocs
+        assert sum(distribution) == lt.length()
+        assert [offset for (_, offset) in global_index] == [seg.length() for seg in lt]
+        i_seg = 0
+        for nb_segs in distribution:
+            starts = [start for (start, _) in global_index[i_seg:i_seg + nb_segs]]
+            offsets = [offset for (_, offset) in global_index[i_seg:i_seg + nb_segs]]
+            assert starts == [sum(offsets[:i]) for i in range(nb_segs)]
+            i_seg += nb_segs
+
+
+def test_distribute_tree_costs():
+    # pylint: disable=missing-docstring
+    bt = random_btree(lambda: random.randint(0, 9), 101)
+    lt = LTree.init_from_bt(bt, 10)
+    costs = [1] * lt.length()
+    costs[0] = lt.length()
+    (distribution, _) = separate.distribute_tree(lt, 2, costs)
+    assert distribution[0] == 1
+    (distribution, _) = separate.distribute_tree(lt, 2, lambda seg: 1)
+    assert abs(distribution[0] - distribution[1]) <= 1
+    measured = separate.segment_costs(lt, separate.measure(lambda seg: seg.length(), 2))
+    assert len(measured) == lt.length() and min(measured) >= 0
@@ -0,0 +1,141 @@
+"""
+Tests for the shared-memory backend
+
+The programs run on local processes launched by ``backend.run``: they are defined
+at the top level of the module, to be given to the processes.
+"""
+
+__all__ = []
+
+import operator
+import os
+
+import pytest
+
+from pyske.core.list.plist import PList
+from pyske.core.list.slist import SList
+from pyske.core.support import backend, parallel
+from pyske.core.util import par
+
+NPROCS = 3
+
+
+def collectives():
+    # pylint: disable=missing-docstring
+    comm = parallel.COMM
+    pid = comm.Get_rank()
+    res = {
+        'backend': parallel.BACKEND.name,
+        'nprocs': comm.Get_size(),
+        'bcast': comm.bcast(pid * 10 if pid == 1 else None, root=1),
+        'scatter': comm.scatter([(pid, dest) for dest in range(NPROCS)], root=0),
+        'gather': comm.gather(pid, root=2),
+        'allgather': comm.allgather(str(pid)),
+        'alltoall': comm.alltoall([(pid, dest) for dest in range(NPROCS)]),
+        'scan': parallel.scan(operator.add, pid + 1),
+        'reduce': parallel.reduce(max, pid),
+    }
+    if pid == 0:
+        # The process 2 receives the messages in the reverse order: ssend returns
+        # once the second message is received, the first one being kept
+        comm.send('to 2', dest=2, tag=7)
+        comm.ssend('again to 2', dest=2, tag=8)
+    if pid == 2:
+        res['recv'] = (comm.recv(source=0, tag=8), comm.recv(source=0, tag=7))
+    start = par.wtime()
+    par.barrier()
+    res['wtime'] = par.wtime() >= start
+    return res
+
+
+def numeric():
+    # pylint: disable=missing-docstring
+    pid = parallel.PID
+    local = list(range(pid * 10, pid * 10 + pid + 1))
+    gathered = parallel.allgatherv(local)
+    exchanged = parallel.alltoallv([[float(pid)] * dest for dest in range(NPROCS)])
+    empty = parallel.alltoallv([[] for _ in range(NPROCS)])
+    return gathered, exchanged, empty
+
+
+def skeletons(filename):
+    # pylint: disable=missing-docstring
+    p_list = PList.init(lambda i: i, 23)
+    res = {
+        'map_reduce': p_list.map(lambda x: x * x).reduce(operator.add, 0),
+        'scanl': p_list.scanl(operator.add, 0).to_seq(),
+        'permute': p_list.permute(lambda i: 22 - i).to_seq(),
+        'strings': p_list.map(str).to_seq(),
+        'balance': PList.from_seq(list(range(9))).balance().distribution,
+        'iterable': PList.from_iterable(iter(range(23)), chunk_size=4).collect(chunk_size=5),
+    }
+    p_list.to_file(filename)
+    return res
+
+
+def failing():
+    # pylint: disable=missing-docstring
+    if parallel.PID == 1:
+        raise ValueError("failure on process 1")
+    parallel.COMM.barrier()
+
+
+def test_collectives():
+    # pylint: disable=missing-docstring
+    results = backend.run(collectives, NPROCS)
+    for (pid, res) in enumerate(results):
+        assert res['backend'] == backend.SHARED_BACKEND
+        assert res['nprocs'] == NPROCS
+        assert res['bcast'] == 10
+        assert res['scatter'] == (0, pid)
+        assert res['gather'] == (list(range(NPROCS)) if pid == 2 else None)
+        assert res['allgather'] == ['0', '1', '2']
+        assert res['alltoall'] == [(src, pid) for src in range(NPROCS)]
+        assert res['scan'] == (sum(range(1, pid + 1)) if pid > 0 else 1, 6)
+        assert res['reduce'] == NPROCS - 1
+        assert res['wtime']
+    assert results[2]['recv'] == ('again to 2', 'to 2')
+
+
+def test_numeric():
+    # pylint: disable=missing-docstring
+    for (pid, (gathered, exchanged, empty)) in enumerate(backend.run(numeric, NPROCS)):
+        assert gathered == [0, 10, 11, 20, 21, 22]
+        assert exchanged == [float(src) for src in range(NPROCS) for _ in range(pid)]
+        assert empty == []
+
+
+def test_skeletons(tmp_path):
+    # pylint: disable=missing-docstring
+    filename = os.path.join(tmp_path, "values.txt")
+    s_list = SList(range(23))
+    results = backend.run(skeletons, NPROCS, filename)
+    for res in results:
+        assert res['map_reduce'] == sum(x * x for x in s_list)
+        assert res['scanl'] == s_list.scanl(operator.add, 0)
+        assert res['permute'] == SList(reversed(s_list))
+        assert res['strings'] == s_list.map(str)
+        assert list(res['balance']) == [3, 3, 3]
+    assert results[0]['iterable'] == s_list
+    with open(filename, encoding='utf-8') as file:
+        assert file.read() == "".join(f"{i}\n" for i in range(23))
+
+
+def test_failure():
+    # pylint: disable=missing-docstring
+    with pytest.raises(ValueError) as info:
+        backend.run(failing, NPROCS)
+    # The exception is caused by its traceback in the failing process
+    cause = str(info.value.__cause__)
+    assert "Traceback of process 1" in cause
+    assert "in failing" in cause and "failure on process 1" in cause
+
+
+def test_single_process():
+    # pylint: disable=missing-docstring
+    comm = backend.SharedComm()
+    assert (comm.Get_rank(), comm.Get_size()) == (0, 1)
+    assert comm.allgather(1) == [1]
+    assert comm.exscan(1) is None
+    comm.send('a', dest=0, tag=3)
+    assert comm.recv(source=0, tag=3) == 'a'
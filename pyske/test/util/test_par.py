@@ -4,6 +4,7 @@ Tests for parallel util functions and class
 
 __all__ = []
 
+import pytest
 from pyske.core.support import parallel
 from pyske.core.util import par
 
@@ -12,3 +13,11 @@ def test_rand_pid():
     # pylint: disable=missing-docstring
     val = par.randpid()
     assert val in range(0, parallel.NPROCS)
+
+
+def test_allgatherv_uint64():
+    # pylint: disable=missing-docstring
+    numpy = pytest.importorskip("numpy")
+    for values in [[2 ** 64 - 1, 5], [2 ** 63 - 1, 5]]:
+        res = parallel.allgatherv(numpy.array(values, dtype=numpy.uint64))
+        assert list(res) == values * parallel.NPROCS
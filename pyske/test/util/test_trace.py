@@ -0,0 +1,64 @@
+"""
+Tests for the tracing of the phases of parallel programs
+"""
+
+__all__ = []
+
+from pyske.core.support import parallel
+from pyske.core.util import trace
+from pyske.core.util import fun
+from pyske.core.tree.ltree import LTree
+from pyske.core.tree.ptree import PTree
+from pyske.core.tree.btree import Leaf, Node
+
+
+def __tree():
+    bt = Node(1, Node(2, Leaf(3), Leaf(4)), Node(5, Leaf(6), Node(7, Leaf(8), Leaf(9))))
+    return PTree(LTree.init_from_bt(bt, 3))
+
+
+def test_disabled():
+    # pylint: disable=missing-docstring
+    trace.enable()
+    trace.disable()
+    with trace.span("phase"):
+        pass
+    assert not trace.is_enabled()
+    assert trace.events() == []
+
+
+def test_span():
+    # pylint: disable=missing-docstring
+    trace.enable()
+    with trace.span("phase", "test", size=3):
+        pass
+    trace.disable()
+    [(name, category, start, duration, args)] = trace.events()
+    assert (name, category, args) == ("phase", "test", {"size": 3})
+    assert start >= 0 and duration >= 0
+
+
+def test_ptree_phases():
+    # pylint: disable=missing-docstring
+    pt = __tree()
+    trace.enable()
+    pt.uacc(fun.add, fun.idt, fun.add, fun.add, fun.add)
+    trace.disable()
+    phases = ["uacc.local", "uacc.gather", "uacc.global", "uacc.distribute", "uacc.update"]
+    assert [event[0] for event in trace.events()] == phases
+    assert sorted(trace.summary()) == sorted(phases)
+
+
+def test_dump():
+    # pylint: disable=missing-docstring
+    trace.enable()
+    with trace.span("phase"):
+        pass
+    trace.disable()
+    timeline = trace.dump()
+    if parallel.PID == 0:
+        events = [event for event in timeline["traceEvents"] if event["ph"] == "X"]
+        assert len(events) == parallel.NPROCS
+        assert sorted(event["pid"] for event in events) == list(range(parallel.NPROCS))
+    else:
+        assert timeline is None